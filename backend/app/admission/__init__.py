@@ -0,0 +1,7 @@
+from . import limiter
+from . import middleware
+
+__all__: list[str] = [
+    "limiter",
+    "middleware",
+]
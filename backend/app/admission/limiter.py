@@ -0,0 +1,210 @@
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+from config import settings
+from metrics.registry import callback, counter
+
+# Доля лимита, которую могут занять запросы каждого приоритета: при
+# перегрузке первыми отклоняются пакетные операции, затем запись, и
+# только потом чтение
+PRIORITY_SHARES: Dict[str, float] = {
+    "read": 1.0,
+    "write": 0.8,
+    "auth": 0.8,
+    "bulk": 0.3,
+}
+
+# Приоритеты, задержка которых управляет лимитом; длительность пакетных
+# операций зависит от объёма данных, а входа — от bcrypt, а не от нагрузки
+SAMPLED_PRIORITIES: Tuple[str, ...] = ("read", "write")
+
+# Пути, не проходящие через ограничитель: проверки состояния, метрики,
+# статика и долгоживущий поток событий
+EXEMPT_PREFIXES: Tuple[str, ...] = ("/health/", "/metrics", "/static/", "/events/")
+
+# Пакетные операции: импорт, экспорт, выгрузка потоком, пакетные
+# изменения и пересчёт статистики
+BULK_PATHS: frozenset = frozenset({
+    "/carsdb/stream_cars/",
+    "/carsdb/import_cars/",
+    "/carsdb/export_cars/",
+    "/carsdb/update_cars/",
+    "/carsdb/delete_cars/",
+    "/regdb/stream_registrations/",
+    "/regdb/import_registrations/",
+    "/regdb/export_registrations/",
+    "/regdb/update_registrations/",
+    "/regdb/delete_registrations/",
+    "/analytics/recompute",
+})
+
+# Списки, которые без параметра limit возвращают всю коллекцию: их
+# длительность растёт с размером коллекции, поэтому полный список —
+# пакетная операция, а страница — обычное чтение
+LISTING_PATHS: frozenset = frozenset({
+    "/carsdb/get_cars/",
+    "/regdb/get_registrations/",
+})
+
+CONCURRENCY_SHED = counter(
+    "concurrency_shed_total",
+    "Requests rejected with 503 by the adaptive concurrency limiter by priority",
+    ("priority",),
+)
+
+
+def request_priority(method: str, path: str, query: str = "") -> Optional[str]:
+    """
+    Приоритет запроса по методу, пути и параметрам.
+
+    Args:
+        method (str): HTTP-метод.
+        path (str): Путь запроса.
+        query (str): Строка параметров запроса.
+
+    Returns:
+        Optional[str]: "read", "write", "auth", "bulk" или None, если запрос
+                       не ограничивается.
+    """
+    if path == "/" or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if path in BULK_PATHS:
+        return "bulk"
+    if path in LISTING_PATHS and "limit" not in parse_qs(query):
+        return "bulk"
+    if path.startswith("/auth/"):
+        return "auth"
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return "read"
+    return "write"
+
+
+class AdaptiveLimiter:
+    """
+    Адаптивный лимит одновременно обрабатываемых запросов (AIMD).
+
+    Пока задержка запросов не превышает целевую, лимит растёт примерно на
+    единицу за каждые limit завершённых запросов (если он используется
+    хотя бы наполовину); при превышении — умножается на backoff, не чаще
+    одного раза за время, равное наблюдаемой задержке. Запрос, для
+    которого нет места в доле лимита его приоритета, отклоняется сразу,
+    а не ждёт в очереди.
+
+    Attributes:
+        limit (float): Текущий лимит.
+        in_flight (int): Запросы в обработке.
+        min_limit (int): Нижняя граница лимита.
+        max_limit (int): Верхняя граница лимита.
+        target_latency (float): Целевая задержка (с).
+        backoff (float): Множитель уменьшения лимита.
+    """
+
+    def __init__(
+            self,
+            initial_limit: int,
+            min_limit: int,
+            max_limit: int,
+            target_latency: float,
+            backoff: float,
+    ) -> None:
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self._decreased_at = 0.0
+        self.increases = 0
+        self.decreases = 0
+
+    def try_acquire(self, priority: str) -> bool:
+        """
+        Попытка занять место для запроса.
+
+        Args:
+            priority (str): Приоритет запроса.
+
+        Returns:
+            bool: True, если запрос принят; его нужно завершить вызовом release.
+        """
+        if self.in_flight >= max(1.0, self.limit * PRIORITY_SHARES[priority]):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: Optional[float], failed: bool = False) -> None:
+        """
+        Освобождение места и корректировка лимита по задержке запроса.
+
+        Ошибка сервера (5xx или исключение) считается признаком перегрузки
+        независимо от задержки: быстрый отказ базы не должен выглядеть как
+        быстрый успешный ответ и увеличивать лимит.
+
+        Args:
+            latency (Optional[float]): Задержка запроса (с) или None, если
+                                       она не должна влиять на лимит.
+            failed (bool): Запрос завершился ошибкой сервера.
+        """
+        self.in_flight -= 1
+        if failed:
+            self._decrease(max(latency or 0.0, self.target_latency))
+        elif latency is None:
+            return
+        elif latency > self.target_latency:
+            self._decrease(latency)
+        elif self.in_flight + 1 >= self.limit / 2 and self.limit < self.max_limit:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self.increases += 1
+
+    def _decrease(self, interval: float) -> None:
+        """
+        Уменьшение лимита не чаще одного раза за interval секунд.
+
+        Args:
+            interval (float): Минимальный промежуток между уменьшениями (с).
+        """
+        now = time.monotonic()
+        if now - self._decreased_at >= interval:
+            self.limit = max(float(self.min_limit), self.limit * self.backoff)
+            self._decreased_at = now
+            self.decreases += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Состояние ограничителя.
+
+        Returns:
+            Dict[str, Any]: Лимит, запросы в обработке и число изменений лимита.
+        """
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "target_latency_seconds": self.target_latency,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "shares": dict(PRIORITY_SHARES),
+        }
+
+
+concurrency_limiter = AdaptiveLimiter(
+    settings.concurrency_initial_limit,
+    settings.concurrency_min_limit,
+    settings.concurrency_max_limit,
+    settings.concurrency_target_latency_seconds,
+    settings.concurrency_backoff,
+)
+
+callback(
+    "concurrency_limit",
+    "Current adaptive limit of concurrently processed requests",
+    "gauge",
+    lambda: concurrency_limiter.limit,
+)
+callback(
+    "concurrency_in_flight",
+    "Requests currently admitted by the adaptive concurrency limiter",
+    "gauge",
+    lambda: concurrency_limiter.in_flight,
+)
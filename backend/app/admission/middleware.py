@@ -0,0 +1,72 @@
+import time
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from admission.limiter import (
+    CONCURRENCY_SHED,
+    SAMPLED_PRIORITIES,
+    AdaptiveLimiter,
+    concurrency_limiter,
+    request_priority,
+)
+from config import settings
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    ASGI-промежуточный слой, ограничивающий число одновременно
+    обрабатываемых запросов адаптивным лимитом.
+
+    Запрос сверх доли лимита своего приоритета сразу получает 503 с
+    Retry-After, поэтому при замедлении базы очередь в процессе не растёт.
+    Задержка измеряется до отправки последнего фрагмента ответа. Ответы
+    5xx и исключения передаются ограничителю как признак перегрузки, а не
+    как быстрые успешные запросы.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: AdaptiveLimiter = concurrency_limiter) -> None:
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.concurrency_limit_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        priority = request_priority(
+            scope["method"], scope["path"], scope.get("query_string", b"").decode("latin-1")
+        )
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not self.limiter.try_acquire(priority):
+            CONCURRENCY_SHED.inc(priority=priority)
+            response = JSONResponse(
+                {"detail": "Server is overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        status = 0
+        failed = False
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            latency = time.perf_counter() - started
+            self.limiter.release(
+                latency if priority in SAMPLED_PRIORITIES else None,
+                failed=failed or status >= 500,
+            )
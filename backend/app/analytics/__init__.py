@@ -0,0 +1,7 @@
+from . import aggregates
+from . import recompute
+
+__all__: list[str] = [
+    "aggregates",
+    "recompute",
+]
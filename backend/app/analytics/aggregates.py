@@ -0,0 +1,364 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from config import settings
+from metrics.registry import callback
+
+# Группировки каждой коллекции: имя группировки -> поля, по сочетанию
+# значений которых считаются документы
+GROUPINGS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "cars": {
+        "make": ("make",),
+        "model": ("make", "model"),
+    },
+    "registrations": {
+        "year": ("year_of_manufacture",),
+    },
+}
+
+# Поля документов, от которых зависят счётчики коллекции
+TRACKED_FIELDS: Dict[str, Tuple[str, ...]] = {
+    collection: tuple(dict.fromkeys(
+        field for fields in groupings.values() for field in fields
+    ))
+    for collection, groupings in GROUPINGS.items()
+}
+
+# Сочетание значений полей группировки
+GroupKey = Tuple[Any, ...]
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def growth_days() -> List[date]:
+    """
+    Дни, за которые хранится статистика прироста.
+
+    Returns:
+        List[date]: Последние settings.analytics_growth_days дней (UTC),
+                    начиная с текущего.
+    """
+    today = _today()
+    return [today - timedelta(days=offset) for offset in range(settings.analytics_growth_days)]
+
+
+class CollectionAggregates:
+    """
+    Счётчики одной коллекции: общее количество документов, количество по
+    группировкам и добавления/удаления по дням.
+
+    Attributes:
+        collection (str): Имя коллекции.
+        total (int): Количество документов.
+        groups (Dict[str, Dict[GroupKey, int]]): Количество документов по
+            значениям полей каждой группировки.
+        days (Dict[date, List[int]]): Добавленные и удалённые документы по
+            дням (UTC), не старше settings.analytics_growth_days: сохранённые
+            в хранилище на момент пересчёта и учтённые этим процессом после него.
+        pending (Dict[date, List[int]]): Добавления и удаления, учтённые
+            этим процессом и ещё не сохранённые в хранилище.
+    """
+
+    def __init__(self, collection: str) -> None:
+        self.collection = collection
+        self.total = 0
+        self.groups: Dict[str, Dict[GroupKey, int]] = {
+            name: {} for name in GROUPINGS[collection]
+        }
+        self.days: Dict[date, List[int]] = {}
+        self.pending: Dict[date, List[int]] = {}
+
+    def count(self, document: Mapping[str, Any], amount: int) -> None:
+        """
+        Изменение счётчиков группировок на amount для значений документа.
+
+        Args:
+            document (Mapping[str, Any]): Документ (достаточно TRACKED_FIELDS).
+            amount (int): 1 для добавленного документа, -1 для удалённого.
+        """
+        for name, fields in GROUPINGS[self.collection].items():
+            counts = self.groups[name]
+            key = tuple(document.get(field) for field in fields)
+            value = counts.get(key, 0) + amount
+            # Нулевые и (при расхождении с хранилищем) отрицательные
+            # счётчики не хранятся
+            if value > 0:
+                counts[key] = value
+            else:
+                counts.pop(key, None)
+
+    def record_day(self, added: int, removed: int) -> None:
+        """
+        Учёт добавлений и удалений за текущий день.
+
+        Args:
+            added (int): Добавлено документов.
+            removed (int): Удалено документов.
+        """
+        today = _today()
+        for days in (self.days, self.pending):
+            day = days.setdefault(today, [0, 0])
+            day[0] += added
+            day[1] += removed
+        self.prune()
+
+    def prune(self) -> None:
+        """
+        Удаление дневной статистики старше settings.analytics_growth_days.
+        """
+        oldest = _today() - timedelta(days=settings.analytics_growth_days - 1)
+        for stale in [day for day in self.days if day < oldest]:
+            del self.days[stale]
+
+
+class Aggregates:
+    """
+    Предварительно агрегированная статистика коллекций.
+
+    Счётчики поддерживаются операциями CRUD этого процесса при каждой
+    записи, поэтому запросы статистики не читают документы. Периодический
+    полный пересчёт (analytics.recompute) заменяет счётчики группировок
+    значениями из хранилища и устраняет расхождения: записи других рабочих
+    процессов и гонки между чтением старых значений и записью. Дневную
+    статистику пересчёт сохраняет в хранилище и загружает обратно вместе
+    с записями остальных процессов, поэтому она переживает перезапуск.
+
+    Attributes:
+        recomputed_at (Optional[str]): Время последнего полного пересчёта (UTC).
+        last_drift (int): Количество счётчиков, исправленных последним пересчётом.
+    """
+
+    def __init__(self) -> None:
+        self._collections: Dict[str, CollectionAggregates] = {
+            collection: CollectionAggregates(collection) for collection in GROUPINGS
+        }
+        self.recomputed_at: Optional[str] = None
+        self.last_drift = 0
+
+    def tracks(self, collection: str, changes: Mapping[str, Any]) -> bool:
+        """
+        Проверка, влияет ли изменение на счётчики коллекции.
+
+        Args:
+            collection (str): Имя коллекции.
+            changes (Mapping[str, Any]): Данные обновления.
+
+        Returns:
+            bool: True, если изменяется хотя бы одно из TRACKED_FIELDS.
+        """
+        return any(field in changes for field in TRACKED_FIELDS[collection])
+
+    def record_insert(self, collection: str, documents: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Учёт добавленных документов.
+
+        Args:
+            collection (str): Имя коллекции.
+            documents (Iterable[Mapping[str, Any]]): Добавленные документы.
+        """
+        aggregates = self._collections[collection]
+        added = 0
+        for document in documents:
+            aggregates.count(document, 1)
+            added += 1
+        if added:
+            aggregates.total += added
+            aggregates.record_day(added, 0)
+
+    def record_delete(self, collection: str, documents: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Учёт удалённых документов.
+
+        Args:
+            collection (str): Имя коллекции.
+            documents (Iterable[Mapping[str, Any]]): Документы до удаления.
+        """
+        aggregates = self._collections[collection]
+        removed = 0
+        for document in documents:
+            aggregates.count(document, -1)
+            removed += 1
+        if removed:
+            aggregates.total = max(aggregates.total - removed, 0)
+            aggregates.record_day(0, removed)
+
+    def record_update(
+            self,
+            collection: str,
+            documents: Iterable[Mapping[str, Any]],
+            changes: Mapping[str, Any],
+    ) -> None:
+        """
+        Учёт изменения документов.
+
+        Args:
+            collection (str): Имя коллекции.
+            documents (Iterable[Mapping[str, Any]]): Документы до изменения.
+            changes (Mapping[str, Any]): Данные обновления.
+        """
+        if not self.tracks(collection, changes):
+            return
+        aggregates = self._collections[collection]
+        for document in documents:
+            aggregates.count(document, -1)
+            aggregates.count({**document, **changes}, 1)
+
+    def replace(self, collection: str, counts: Mapping[GroupKey, int]) -> int:
+        """
+        Замена счётчиков результатом полного пересчёта.
+
+        Args:
+            collection (str): Имя коллекции.
+            counts (Mapping[GroupKey, int]): Количество документов по
+                                             сочетаниям TRACKED_FIELDS.
+
+        Returns:
+            int: Количество счётчиков (включая total), значения которых
+                 разошлись с хранилищем.
+        """
+        fresh = CollectionAggregates(collection)
+        for values, amount in counts.items():
+            fresh.count(dict(zip(TRACKED_FIELDS[collection], values)), amount)
+            fresh.total += amount
+        current = self._collections[collection]
+        drift = int(fresh.total != current.total)
+        for name, groups in fresh.groups.items():
+            previous = current.groups[name]
+            drift += sum(1 for key in groups.keys() | previous.keys()
+                         if groups.get(key) != previous.get(key))
+        # Дневная статистика заменяется отдельно (replace_days)
+        fresh.days = current.days
+        fresh.pending = current.pending
+        self._collections[collection] = fresh
+        return drift
+
+    def take_pending(self, collection: str) -> Dict[date, List[int]]:
+        """
+        Извлечение несохранённой дневной статистики для записи в хранилище.
+
+        Args:
+            collection (str): Имя коллекции.
+
+        Returns:
+            Dict[date, List[int]]: Добавления и удаления по дням; в
+                                   счётчиках процесса они больше не ожидают.
+        """
+        aggregates = self._collections[collection]
+        pending, aggregates.pending = aggregates.pending, {}
+        return pending
+
+    def restore_pending(self, collection: str, pending: Mapping[date, List[int]]) -> None:
+        """
+        Возврат дневной статистики, которую не удалось сохранить.
+
+        Args:
+            collection (str): Имя коллекции.
+            pending (Mapping[date, List[int]]): Несохранённые добавления и
+                                                удаления по дням.
+        """
+        current = self._collections[collection].pending
+        for day, (added, removed) in pending.items():
+            counts = current.setdefault(day, [0, 0])
+            counts[0] += added
+            counts[1] += removed
+
+    def replace_days(self, collection: str, stored: Mapping[date, List[int]]) -> None:
+        """
+        Замена дневной статистики сохранённой в хранилище.
+
+        Ещё не сохранённые значения этого процесса добавляются к ней.
+
+        Args:
+            collection (str): Имя коллекции.
+            stored (Mapping[date, List[int]]): Добавления и удаления по дням
+                                               из хранилища.
+        """
+        aggregates = self._collections[collection]
+        days = {day: list(counts) for day, counts in stored.items()}
+        for day, (added, removed) in aggregates.pending.items():
+            counts = days.setdefault(day, [0, 0])
+            counts[0] += added
+            counts[1] += removed
+        aggregates.days = days
+        aggregates.prune()
+
+    def total(self, collection: str) -> int:
+        """
+        Количество документов коллекции.
+
+        Args:
+            collection (str): Имя коллекции.
+
+        Returns:
+            int: Количество документов.
+        """
+        return self._collections[collection].total
+
+    def groups(
+            self,
+            collection: str,
+            grouping: str,
+            where: Optional[Mapping[str, Any]] = None,
+            limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Количество документов по значениям полей группировки.
+
+        Args:
+            collection (str): Имя коллекции.
+            grouping (str): Имя группировки из GROUPINGS.
+            where (Optional[Mapping[str, Any]]): Значения полей группировки,
+                                                 которым должны соответствовать строки.
+            limit (Optional[int]): Максимальное количество строк.
+
+        Returns:
+            List[Dict[str, Any]]: Значения полей и count по убыванию count.
+        """
+        fields = GROUPINGS[collection][grouping]
+        rows = [
+            {**dict(zip(fields, key)), "count": count}
+            for key, count in self._collections[collection].groups[grouping].items()
+        ]
+        if where:
+            rows = [row for row in rows if all(row.get(f) == v for f, v in where.items())]
+        rows.sort(key=lambda row: (-row["count"], tuple(str(row[f]) for f in fields)))
+        return rows[:limit] if limit is not None else rows
+
+    def growth(self, collection: str, days: int) -> Dict[str, Any]:
+        """
+        Прирост коллекции за последние дни.
+
+        Args:
+            collection (str): Имя коллекции.
+            days (int): Количество дней, включая текущий.
+
+        Returns:
+            Dict[str, Any]: Добавления и удаления по дням, чистый прирост
+                            и его доля от количества документов в начале
+                            периода (None, если коллекция была пуста).
+        """
+        aggregates = self._collections[collection]
+        today = _today()
+        series = []
+        for offset in range(days - 1, -1, -1):
+            day = today - timedelta(days=offset)
+            added, removed = aggregates.days.get(day, (0, 0))
+            series.append({"date": day.isoformat(), "added": added, "removed": removed})
+        net = sum(day["added"] - day["removed"] for day in series)
+        start = aggregates.total - net
+        return {
+            "days": series,
+            "net": net,
+            "rate": round(net / start, 4) if start > 0 else None,
+        }
+
+
+aggregates = Aggregates()
+
+callback(
+    "analytics_recompute_drift",
+    "Aggregate counters corrected by the last full recompute",
+    "gauge",
+    lambda: aggregates.last_drift,
+)
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from datetime import date, datetime, timezone
+from config import settings
+from analytics.aggregates import GROUPINGS, TRACKED_FIELDS, aggregates, growth_days
+from metrics.registry import counter
+from storage.base import StorageError
+from storage.engines import get_repository
+
+logger = logging.getLogger(__name__)
+
+RECOMPUTES = counter(
+    "analytics_recomputes_total",
+    "Full recomputes of analytics aggregates by outcome",
+    ("status",),
+)
+
+# Коллекция хранилища с добавлениями и удалениями по дням: документ на
+# коллекцию и день, общий для всех рабочих процессов
+DAYS_COLLECTION: str = "analytics_days"
+
+
+def _day_key(collection: str, day: date) -> str:
+    return f"{collection}:{day.isoformat()}"
+
+
+async def flush_days() -> None:
+    """
+    Сохранение учтённых этим процессом добавлений и удалений по дням.
+
+    Значения прибавляются к сохранённым атомарно, поэтому процессы не
+    перезаписывают данные друг друга. Несохранённые из-за ошибки значения
+    возвращаются в счётчики процесса и сохраняются следующей попыткой.
+
+    Raises:
+        StorageError: При ошибке хранилища.
+    """
+    repository = get_repository(DAYS_COLLECTION)
+    for collection in GROUPINGS:
+        pending = aggregates.take_pending(collection)
+        try:
+            for day in list(pending):
+                added, removed = pending[day]
+                await repository.increment(
+                    _day_key(collection, day),
+                    {"added": added, "removed": removed},
+                    {"collection": collection, "date": day.isoformat()},
+                )
+                del pending[day]
+        finally:
+            aggregates.restore_pending(collection, pending)
+
+
+async def load_days() -> None:
+    """
+    Загрузка дневной статистики всех процессов из хранилища и удаление
+    устаревших дней.
+
+    Raises:
+        StorageError: При ошибке хранилища.
+    """
+    repository = get_repository(DAYS_COLLECTION)
+    days = growth_days()
+    await repository.delete({"date": {"$lt": days[-1].isoformat()}}, many=True)
+    for collection in GROUPINGS:
+        documents = await repository.find(
+            {"key": {"$in": [_day_key(collection, day) for day in days]}},
+            ["date", "added", "removed"],
+        )
+        aggregates.replace_days(collection, {
+            date.fromisoformat(document["date"]): [document["added"], document["removed"]]
+            for document in documents
+        })
+
+
+async def recompute() -> int:
+    """
+    Полный пересчёт счётчиков всех коллекций по данным хранилища.
+
+    Для каждой коллекции выполняется один запрос группировки по
+    TRACKED_FIELDS; счётчики группировок выводятся из его результата.
+    Дневная статистика этого процесса сохраняется в хранилище, после чего
+    загружается общая для всех процессов.
+
+    Returns:
+        int: Количество исправленных счётчиков.
+
+    Raises:
+        StorageError: При ошибке хранилища.
+    """
+    drift = 0
+    for collection in GROUPINGS:
+        counts = await get_repository(collection).count_by(TRACKED_FIELDS[collection])
+        drift += aggregates.replace(collection, counts)
+    await flush_days()
+    await load_days()
+    aggregates.recomputed_at = datetime.now(timezone.utc).isoformat()
+    aggregates.last_drift = drift
+    return drift
+
+
+async def run_recompute(interval_seconds: float = settings.analytics_recompute_seconds) -> None:
+    """
+    Фоновая задача: пересчёт при старте и затем каждые interval_seconds.
+
+    Ошибка хранилища не останавливает задачу: пересчёт повторяется в
+    следующий раз, а до тех пор статистика поддерживается операциями CRUD.
+
+    Args:
+        interval_seconds (float): Интервал между пересчётами (с).
+    """
+    while True:
+        try:
+            drift = await recompute()
+            RECOMPUTES.inc(status="ok")
+            if drift:
+                logger.info("Analytics recompute corrected %d counters", drift)
+        except StorageError as se:
+            RECOMPUTES.inc(status="error")
+            logger.warning("Analytics recompute failed: %s", se)
+        await asyncio.sleep(interval_seconds)
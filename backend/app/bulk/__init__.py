@@ -0,0 +1,7 @@
+from . import exporter
+from . import importer
+
+__all__: list[str] = [
+    "exporter",
+    "importer",
+]
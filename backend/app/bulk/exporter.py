@@ -0,0 +1,180 @@
+import csv
+import io
+import re
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+import orjson
+
+SUPPORTED_FORMATS: Tuple[str, ...] = ("csv", "ndjson")
+MEDIA_TYPES: Dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Поля, доступные для выгрузки
+EXPORT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "cars": ("make", "model", "license_plate"),
+    "registrations": ("license_plate", "owner_name", "owner_address", "year_of_manufacture"),
+}
+
+# Примерный размер фрагмента ответа в байтах
+CHUNK_SIZE: int = 64 * 1024
+
+
+def select_fields(requested: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """
+    Разбор списка выгружаемых полей.
+
+    Args:
+        requested (Optional[str]): Поля через запятую; None — все доступные поля.
+        allowed (Sequence[str]): Доступные для выгрузки поля.
+
+    Returns:
+        List[str]: Поля выгрузки в запрошенном порядке.
+
+    Raises:
+        ValueError: Если запрошено неизвестное поле.
+    """
+    if not requested:
+        return list(allowed)
+    fields = [field.strip() for field in requested.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown export fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(fields))
+
+
+def build_filter(
+        equals: Dict[str, Any],
+        plate_prefix: Optional[str] = None,
+        ranges: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+) -> Dict[str, Any]:
+    """
+    Построение фильтра MongoDB из параметров выгрузки.
+
+    Args:
+        equals (Dict[str, Any]): Точные значения полей (None — без фильтра).
+        plate_prefix (Optional[str]): Префикс номерного знака.
+        ranges (Optional[Dict[str, Tuple[Optional[int], Optional[int]]]]):
+            Границы диапазонов по полям (включительно).
+
+    Returns:
+        Dict[str, Any]: Фильтр для find.
+    """
+    query: Dict[str, Any] = {
+        field: value for field, value in equals.items() if value is not None
+    }
+    if plate_prefix:
+        query["license_plate"] = {"$regex": f"^{re.escape(plate_prefix.upper())}"}
+    for field, (low, high) in (ranges or {}).items():
+        bounds: Dict[str, int] = {}
+        if low is not None:
+            bounds["$gte"] = low
+        if high is not None:
+            bounds["$lte"] = high
+        if bounds:
+            query[field] = bounds
+    return query
+
+
+async def _encode(
+        documents: AsyncIterator[Dict[str, Any]], fields: List[str], fmt: str
+) -> AsyncIterator[bytes]:
+    """
+    Кодирование документов в CSV или NDJSON фрагментами около CHUNK_SIZE.
+
+    Args:
+        documents (AsyncIterator[Dict[str, Any]]): Документы из курсора.
+        fields (List[str]): Выгружаемые поля.
+        fmt (str): Формат выгрузки.
+
+    Yields:
+        bytes: Очередной фрагмент ответа.
+    """
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        async for document in documents:
+            writer.writerow([document.get(field, "") for field in fields])
+            if buffer.tell() >= CHUNK_SIZE:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+    else:
+        chunk = bytearray()
+        async for document in documents:
+            chunk += orjson.dumps({field: document.get(field) for field in fields})
+            chunk += b"\n"
+            if len(chunk) >= CHUNK_SIZE:
+                yield bytes(chunk)
+                chunk.clear()
+        yield bytes(chunk)
+
+
+async def export_stream(
+        documents: AsyncIterator[Dict[str, Any]],
+        fields: List[str],
+        fmt: str,
+        compress: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Потоковая выгрузка документов с необязательным сжатием gzip.
+
+    В памяти находится не более одного фрагмента ответа, независимо
+    от объёма выгружаемых данных.
+
+    Args:
+        documents (AsyncIterator[Dict[str, Any]]): Документы из курсора.
+        fields (List[str]): Выгружаемые поля.
+        fmt (str): Формат выгрузки (csv или ndjson).
+        compress (bool): Сжимать ли поток в gzip.
+
+    Yields:
+        bytes: Очередной фрагмент ответа.
+    """
+    if not compress:
+        async for chunk in _encode(documents, fields, fmt):
+            yield chunk
+        return
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in _encode(documents, fields, fmt):
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def json_list_stream(
+        name: str, documents: AsyncIterator[Dict[str, Any]], extra: Dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """
+    Потоковая запись JSON-объекта {name: [документы], **extra} фрагментами
+    около CHUNK_SIZE.
+
+    Ответ совпадает с обычным JSON-ответом списка, но в памяти находится
+    не более одного фрагмента, независимо от размера коллекции.
+
+    Args:
+        name (str): Имя поля со списком документов.
+        documents (AsyncIterator[Dict[str, Any]]): Документы из курсора.
+        extra (Dict[str, Any]): Остальные поля объекта (после списка).
+
+    Yields:
+        bytes: Очередной фрагмент ответа.
+    """
+    chunk = bytearray(b"{" + orjson.dumps(name) + b":[")
+    separator = b""
+    async for document in documents:
+        chunk += separator
+        chunk += orjson.dumps(document)
+        separator = b","
+        if len(chunk) >= CHUNK_SIZE:
+            yield bytes(chunk)
+            chunk.clear()
+    chunk += b"]"
+    for key, value in extra.items():
+        chunk += b"," + orjson.dumps(key) + b":" + orjson.dumps(value)
+    yield bytes(chunk + b"}")
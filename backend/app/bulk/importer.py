@@ -0,0 +1,196 @@
+import csv
+import io
+from typing import (
+    Any,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+import orjson
+from pydantic import BaseModel
+from starlette.concurrency import iterate_in_threadpool
+from models.validation import validate_batch
+
+# Количество строк, валидируемых и записываемых за один запрос к MongoDB
+BATCH_SIZE: int = 1000
+# Максимальное число ошибок, возвращаемых в отчёте
+MAX_REPORTED_ERRORS: int = 1000
+SUPPORTED_FORMATS: Tuple[str, ...] = ("csv", "ndjson")
+
+# Строка файла: номер строки и данные (или ошибка разбора)
+Row = Tuple[int, Any]
+# Функция записи пакета: принимает (номер строки, модель), возвращает ошибки записи
+BatchWriter = Callable[[List[Tuple[int, Any]]], Awaitable[List[Dict[str, Any]]]]
+
+
+def detect_format(
+        filename: Optional[str], content_type: Optional[str], explicit: Optional[str] = None
+) -> str:
+    """
+    Определение формата загружаемого файла.
+
+    Args:
+        filename (Optional[str]): Имя файла.
+        content_type (Optional[str]): MIME-тип файла.
+        explicit (Optional[str]): Явно указанный формат (csv или ndjson).
+
+    Returns:
+        str: Формат файла.
+
+    Raises:
+        ValueError: Если формат не поддерживается или не может быть определён.
+    """
+    if explicit:
+        fmt = explicit.lower()
+    elif filename and filename.lower().endswith((".ndjson", ".jsonl")):
+        fmt = "ndjson"
+    elif filename and filename.lower().endswith(".csv"):
+        fmt = "csv"
+    elif content_type in ("application/x-ndjson", "application/jsonl"):
+        fmt = "ndjson"
+    elif content_type == "text/csv":
+        fmt = "csv"
+    else:
+        raise ValueError("Unable to detect file format, use format=csv or format=ndjson")
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported file format: {fmt}")
+    return fmt
+
+
+def _iter_csv(file: BinaryIO) -> Iterator[Row]:
+    """
+    Построчный разбор CSV-файла с заголовком.
+
+    Args:
+        file (BinaryIO): Загруженный файл.
+
+    Yields:
+        Row: Номер строки и словарь значений.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+    finally:
+        text.detach()
+
+
+def _iter_ndjson(file: BinaryIO) -> Iterator[Row]:
+    """
+    Построчный разбор NDJSON-файла; пустые строки пропускаются.
+
+    Args:
+        file (BinaryIO): Загруженный файл.
+
+    Yields:
+        Row: Номер строки и разобранный объект (или ValueError при ошибке JSON).
+    """
+    for number, line in enumerate(file, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield number, orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield number, ValueError(f"Invalid JSON: {e}")
+
+
+def _iter_batches(rows: Iterator[Row], size: int) -> Iterator[List[Row]]:
+    """
+    Группировка строк файла в пакеты.
+
+    Args:
+        rows (Iterator[Row]): Строки файла.
+        size (int): Размер пакета.
+
+    Yields:
+        List[Row]: Очередной пакет строк.
+    """
+    batch: List[Row] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def import_file(
+        file: BinaryIO,
+        fmt: str,
+        model: Type[BaseModel],
+        writer: BatchWriter,
+        batch_size: int = BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Потоковый импорт файла: разбор, пакетная валидация и запись.
+
+    Файл читается в пуле потоков пакетами, поэтому в памяти находится
+    не более одного пакета строк. Пакет валидируется целиком одним
+    вызовом validate_batch. Ошибки разбора, валидации и записи
+    собираются в отчёт с номерами строк.
+
+    Args:
+        file (BinaryIO): Загруженный файл.
+        fmt (str): Формат файла (csv или ndjson).
+        model (Type[BaseModel]): Модель для валидации строк.
+        writer (BatchWriter): Функция записи пакета валидных моделей.
+        batch_size (int): Размер пакета.
+
+    Returns:
+        Dict[str, Any]: Отчёт: total, inserted, failed, errors, errors_truncated.
+
+    Raises:
+        ValueError: Если файл не удаётся разобрать как CSV.
+        RuntimeError: При ошибке взаимодействия с базой данных.
+    """
+    rows = _iter_csv(file) if fmt == "csv" else _iter_ndjson(file)
+    total = 0
+    inserted = 0
+    failed = 0
+    errors: List[Dict[str, Any]] = []
+
+    def report_error(error: Dict[str, Any]) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(error)
+
+    try:
+        async for batch in iterate_in_threadpool(_iter_batches(rows, batch_size)):
+            total += len(batch)
+            candidates: List[Row] = []
+            batch_errors: List[Dict[str, Any]] = []
+            for number, data in batch:
+                if isinstance(data, Exception):
+                    batch_errors.append({"row": number, "error": str(data)})
+                elif not isinstance(data, dict):
+                    batch_errors.append({"row": number, "error": "Row must be a JSON object"})
+                else:
+                    candidates.append((number, data))
+            valid, validation_errors = validate_batch(model, candidates)
+            for error in sorted(batch_errors + validation_errors, key=lambda item: item["row"]):
+                report_error(error)
+            if valid:
+                write_errors = await writer(valid)
+                inserted += len(valid) - len(write_errors)
+                for error in write_errors:
+                    report_error(error)
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed {fmt} file: {e}") from e
+
+    return {
+        "total": total,
+        "inserted": inserted,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
@@ -0,0 +1,9 @@
+from . import backends
+from . import read_through
+from . import single_flight
+
+__all__: list[str] = [
+    "backends",
+    "read_through",
+    "single_flight",
+]
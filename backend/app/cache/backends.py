@@ -0,0 +1,203 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import orjson
+from config import settings
+from metrics.registry import callback
+
+
+class CacheBackend(ABC):
+    """
+    Интерфейс хранилища кэша.
+
+    Методы асинхронные, чтобы общее для нескольких процессов хранилище
+    (например, Redis) можно было подключить без изменения кода CRUD.
+    Значения должны быть сериализуемыми в JSON (словари, списки, строки,
+    числа) и хранятся в сериализованном виде: get возвращает новый объект,
+    и его изменение вызывающим кодом не портит запись для остальных.
+
+    Attributes:
+        shared (bool): Хранилище общее для всех рабочих процессов, и
+                       инвалидация в одном процессе видна остальным.
+    """
+
+    shared: bool = False
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Получение значения по ключу.
+
+        Args:
+            key (str): Ключ.
+
+        Returns:
+            Optional[Any]: Значение или None, если записи нет или она устарела.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Сохранение значения.
+
+        Args:
+            key (str): Ключ.
+            value (Any): Значение.
+            ttl (float): Время жизни записи в секундах.
+        """
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """
+        Удаление записей.
+
+        Args:
+            *keys (str): Ключи удаляемых записей.
+        """
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """
+        Атомарное увеличение счётчика.
+
+        Счётчики хранятся бессрочно и не вытесняются.
+
+        Args:
+            key (str): Ключ счётчика.
+
+        Returns:
+            int: Новое значение счётчика.
+        """
+
+    @abstractmethod
+    async def get_counter(self, key: str) -> int:
+        """
+        Чтение счётчика (не учитывается в статистике попаданий).
+
+        Args:
+            key (str): Ключ счётчика.
+
+        Returns:
+            int: Значение счётчика (0, если его нет).
+        """
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """
+        Статистика хранилища.
+
+        Returns:
+            Dict[str, Any]: Значения метрик.
+        """
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Внутрипроцессное LRU-хранилище с временем жизни записей.
+
+    Значения хранятся байтами orjson, как в общем хранилище, поэтому
+    результат get можно изменять.
+
+    Attributes:
+        max_entries (int): Максимальное количество записей.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return orjson.loads(value)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, orjson.dumps(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_backend: CacheBackend = MemoryCacheBackend(settings.cache_max_entries)
+
+
+def get_cache_backend() -> CacheBackend:
+    """
+    Получение текущего хранилища кэша.
+
+    Returns:
+        CacheBackend: Хранилище кэша.
+    """
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """
+    Подключение другого хранилища кэша (например, общего для процессов).
+
+    Args:
+        backend (CacheBackend): Новое хранилище.
+    """
+    global _backend
+    _backend = backend
+
+
+callback(
+    "data_cache_hits_total",
+    "Read-through cache hits",
+    "counter",
+    lambda: get_cache_backend().stats().get("hits", 0),
+)
+callback(
+    "data_cache_misses_total",
+    "Read-through cache misses",
+    "counter",
+    lambda: get_cache_backend().stats().get("misses", 0),
+)
+callback(
+    "data_cache_evictions_total",
+    "Read-through cache LRU evictions",
+    "counter",
+    lambda: get_cache_backend().stats().get("evictions", 0),
+)
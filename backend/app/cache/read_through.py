@@ -0,0 +1,163 @@
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from cache.backends import get_cache_backend
+from cache.single_flight import single_flight
+from config import settings
+
+# Обёртка значения, позволяющая кэшировать и отсутствие записи
+_VALUE_KEY = "value"
+
+
+def cache_enabled() -> bool:
+    """
+    Используется ли кэш чтения.
+
+    Внутрипроцессное хранилище не видит инвалидаций других рабочих
+    процессов, поэтому при нескольких процессах кэш используется только
+    с общим хранилищем.
+
+    Returns:
+        bool: True, если хранилище общее или рабочий процесс один.
+    """
+    return get_cache_backend().shared or settings.workers <= 1
+
+
+class ReadThroughCache:
+    """
+    Кэш чтения для одной коллекции: поиск по номерному знаку и результаты поиска.
+
+    Записи по номерному знаку удаляются точечно при изменении этого номера.
+    Ключи результатов поиска включают номер поколения коллекции, который
+    увеличивается при любой записи, поэтому устаревшие результаты поиска
+    становятся недоступными сразу и вытесняются по LRU/TTL. Значение,
+    загруженное во время конкурентной записи (поколение сменилось),
+    в кэш не сохраняется. Одинаковые одновременные промахи выполняют одну
+    загрузку (single_flight) в пределах поколения.
+
+    Инвалидация видна только процессам, разделяющим хранилище кэша. Если
+    хранилище внутрипроцессное, а рабочих процессов несколько, записи
+    других процессов оставляли бы в кэше устаревшие данные до истечения
+    ttl, поэтому в таком режиме кэш не используется и остаётся только
+    объединение одновременных чтений.
+
+    Каждый вызов получает собственную копию результата (хранилище и
+    single_flight держат сериализованные значения), поэтому её можно
+    изменять, не затрагивая кэш и других ожидающих.
+
+    Attributes:
+        namespace (str): Префикс ключей (имя коллекции).
+        ttl (float): Время жизни записей в секундах.
+    """
+
+    def __init__(self, namespace: str, ttl: float = settings.cache_ttl_seconds) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def _plate_key(self, license_plate: str) -> str:
+        return f"{self.namespace}:plate:{license_plate}"
+
+    def _generation_key(self) -> str:
+        return f"{self.namespace}:generation"
+
+    async def get_by_plate(
+            self, license_plate: str, loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Получение документа по номерному знаку через кэш.
+
+        Args:
+            license_plate (str): Номерной знак.
+            loader (Callable[[], Awaitable[Optional[Dict[str, Any]]]]):
+                Загрузка документа из базы при промахе.
+
+        Returns:
+            Optional[Dict[str, Any]]: Документ или None, если его нет.
+        """
+        backend = get_cache_backend()
+        cacheable = cache_enabled()
+        key = self._plate_key(license_plate)
+        cached = await backend.get(key) if cacheable else None
+        if cached is not None:
+            return cached[_VALUE_KEY]
+        generation = await backend.get_counter(self._generation_key())
+
+        async def load() -> Optional[Dict[str, Any]]:
+            value = await loader()
+            if cacheable and await backend.get_counter(self._generation_key()) == generation:
+                await backend.set(key, {_VALUE_KEY: value}, self.ttl)
+            return value
+
+        return await single_flight.do(f"{key}:{generation}", f"{self.namespace}.plate", load)
+
+    async def get_search(
+            self, query: str, limit: int, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Получение результатов поиска через кэш.
+
+        Args:
+            query (str): Поисковый запрос.
+            limit (int): Ограничение количества результатов.
+            loader (Callable[[], Awaitable[Any]]): Выполнение поиска при промахе.
+
+        Returns:
+            Any: Результаты поиска.
+        """
+        backend = get_cache_backend()
+        cacheable = cache_enabled()
+        generation = await backend.get_counter(self._generation_key())
+        key = f"{self.namespace}:search:{generation}:{limit}:{query}"
+        cached = await backend.get(key) if cacheable else None
+        if cached is not None:
+            return cached[_VALUE_KEY]
+
+        async def load() -> Any:
+            value = await loader()
+            if cacheable:
+                await backend.set(key, {_VALUE_KEY: value}, self.ttl)
+            return value
+
+        return await single_flight.do(key, f"{self.namespace}.search", load)
+
+    async def get_shared(
+            self,
+            operation: str,
+            params: str,
+            loader: Callable[[], Awaitable[Any]],
+            *related: "ReadThroughCache",
+    ) -> Any:
+        """
+        Некэшируемое чтение, объединяемое с одинаковыми одновременными
+        чтениями.
+
+        Args:
+            operation (str): Имя операции (например, "page").
+            params (str): Параметры запроса, определяющие результат.
+            loader (Callable[[], Awaitable[Any]]): Чтение из хранилища.
+            *related (ReadThroughCache): Кэши других коллекций, данные
+                                         которых входят в результат.
+
+        Returns:
+            Any: Результат чтения.
+        """
+        backend = get_cache_backend()
+        generations = [
+            str(await backend.get_counter(cache._generation_key()))
+            for cache in (self, *related)
+        ]
+        key = f"{self.namespace}:{operation}:{':'.join(generations)}:{params}"
+        return await single_flight.do(key, f"{self.namespace}.{operation}", loader)
+
+    async def invalidate(self, license_plates: Iterable[str]) -> None:
+        """
+        Инвалидация записей после изменения данных.
+
+        Args:
+            license_plates (Iterable[str]): Изменённые номерные знаки.
+        """
+        backend = get_cache_backend()
+        await backend.delete(*(self._plate_key(plate) for plate in license_plates))
+        await backend.incr(self._generation_key())
+
+
+car_cache = ReadThroughCache("cars")
+registration_cache = ReadThroughCache("registrations")
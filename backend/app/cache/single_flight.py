@@ -0,0 +1,94 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+import orjson
+from metrics.registry import counter
+
+SINGLE_FLIGHT_LOADS = counter(
+    "single_flight_loads_total",
+    "Reads executed against the storage by the single-flight layer by operation",
+    ("operation",),
+)
+SINGLE_FLIGHT_COALESCED = counter(
+    "single_flight_coalesced_total",
+    "Reads served by an identical in-flight read instead of a new storage call by operation",
+    ("operation",),
+)
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых одновременных чтений.
+
+    Пока загрузка по ключу выполняется, остальные запросы с тем же ключом
+    не обращаются к хранилищу, а ждут её результата (или исключения).
+    Загрузка выполняется отдельной задачей: отмена запроса, который её
+    начал (например, клиент отключился), не прерывает ожидание остальных.
+    Ключ должен включать всё, от чего зависит результат, в том числе
+    поколение коллекции, чтобы чтение после записи не получило результат
+    загрузки, начатой до неё.
+
+    Результат загрузки сериализуется один раз (orjson), и каждый ожидающий
+    получает собственную копию: изменение результата одним запросом не
+    видно остальным. Поэтому результат должен быть сериализуемым в JSON.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[str, asyncio.Task] = {}
+        self.loads = 0
+        self.coalesced = 0
+
+    async def do(
+            self, key: str, operation: str, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Выполнение загрузки или присоединение к уже выполняемой.
+
+        Args:
+            key (str): Ключ загрузки.
+            operation (str): Имя операции для метрик.
+            loader (Callable[[], Awaitable[Any]]): Загрузка из хранилища.
+
+        Returns:
+            Any: Копия результата загрузки.
+        """
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(loader))
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.loads += 1
+            SINGLE_FLIGHT_LOADS.inc(operation=operation)
+        else:
+            self.coalesced += 1
+            SINGLE_FLIGHT_COALESCED.inc(operation=operation)
+        return orjson.loads(await asyncio.shield(task))
+
+    @staticmethod
+    async def _load(loader: Callable[[], Awaitable[Any]]) -> bytes:
+        return orjson.dumps(await loader())
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Исключение могло остаться без ожидающих, если все они отменены
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Статистика объединения чтений.
+
+        Returns:
+            Dict[str, Any]: Выполненные загрузки, объединённые запросы и
+                            загрузки в процессе.
+        """
+        requests = self.loads + self.coalesced
+        return {
+            "in_flight": len(self._flights),
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / requests, 4) if requests else 0.0,
+        }
+
+
+single_flight = SingleFlight()
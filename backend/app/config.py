@@ -0,0 +1,140 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Настройки приложения, считываемые из переменных окружения (префикс APP_).
+
+    Attributes:
+        storage_engine (str): Движок хранилища: "mongo" или "memory"
+            (данные в памяти процесса, для тестов и прогонов).
+        mongo_uri (str): Строка подключения к MongoDB.
+        mongo_db_name (str): Имя базы данных.
+        mongo_max_pool_size (int): Максимальный размер пула соединений.
+        mongo_min_pool_size (int): Минимальный размер пула соединений.
+        mongo_connect_timeout_ms (int): Таймаут установки соединения (мс).
+        mongo_server_selection_timeout_ms (int): Таймаут выбора сервера (мс).
+        mongo_socket_timeout_ms (int): Таймаут операций на сокете (мс).
+        hashing_workers (int): Количество потоков для хэширования паролей.
+        hashing_queue_size (int): Сколько операций хэширования может ждать
+            свободного потока, прежде чем новые запросы будут отклонены.
+        token_cache_size (int): Максимум проверенных JWT-токенов в кэше.
+        token_cache_ttl_seconds (int): Время жизни записи кэша токенов (с).
+        cache_max_entries (int): Максимум записей во внутрипроцессном кэше данных.
+        cache_ttl_seconds (int): Время жизни записи кэша данных (с).
+        log_level (str): Уровень журналирования по умолчанию.
+        log_levels (str): Уровни отдельных логгеров, например
+            "crud=WARNING,uvicorn.access=ERROR".
+        log_queue_size (int): Ёмкость очереди записей журнала; при
+            переполнении записи отбрасываются, а не блокируют обработку запросов.
+        log_sample_burst (int): Сколько одинаковых записей за окно
+            пишется полностью.
+        log_sample_rate (int): После превышения burst пишется каждая
+            log_sample_rate-я одинаковая запись.
+        log_sample_window_seconds (float): Длина окна выборки (с).
+        server_host (str): Адрес, на котором слушает сервер.
+        server_port (int): Порт сервера.
+        workers (int): Количество рабочих процессов сервера.
+        shutdown_timeout_seconds (int): Сколько ждать завершения запросов
+            в обработке при остановке, прежде чем закрыть соединения (с).
+        shutdown_drain_delay_seconds (float): Сколько после SIGTERM процесс
+            продолжает принимать запросы, отвечая 503 на /health/ready,
+            прежде чем закрыть сокеты (с).
+        health_check_timeout_seconds (float): Таймаут проверки базы данных
+            в /health/ready (с).
+        static_dir (str): Каталог фронтенда, загружаемый в память при старте.
+        events_queue_size (int): Ёмкость очереди событий одного клиента; при
+            переполнении клиенту отправляется resync.
+        events_max_deltas (int): Максимум событий от одной записи; пакет
+            больше заменяется одним resync.
+        events_heartbeat_seconds (float): Интервал пустых сообщений в потоке
+            событий, поддерживающих соединение (с).
+        events_retry_seconds (float): Пауза перед повторным подключением
+            к change stream (с).
+        events_ticket_seconds (int): Время жизни билета для подключения
+            к потоку событий (с).
+        events_max_streams_per_user (int): Максимум одновременно открытых
+            потоков событий одного пользователя в процессе.
+        analytics_recompute_seconds (float): Интервал полного пересчёта
+            статистики по данным хранилища (с).
+        analytics_growth_days (int): За сколько последних дней хранится
+            статистика добавлений и удалений.
+        rate_limit_enabled (bool): Ограничивать частоту запросов.
+        rate_limits (str): Лимиты классов маршрутов в запросах за секунды,
+            например "search=60/10,bulk=5/60": ёмкость корзины токенов и
+            период её полного пополнения. auth считается по адресу клиента,
+            остальные классы — по пользователю.
+        rate_limit_max_buckets (int): Максимум корзин токенов в памяти процесса.
+        concurrency_limit_enabled (bool): Ограничивать число одновременно
+            обрабатываемых запросов адаптивным лимитом.
+        concurrency_initial_limit (int): Начальный лимит.
+        concurrency_min_limit (int): Нижняя граница лимита.
+        concurrency_max_limit (int): Верхняя граница лимита.
+        concurrency_target_latency_seconds (float): Задержка чтения и записи,
+            при превышении которой лимит уменьшается (с).
+        concurrency_backoff (float): Множитель уменьшения лимита.
+        admin_users (str): Пользователи (e-mail через запятую), которым
+            доступны /admin и пересчёт статистики; пусто — никому.
+    """
+    model_config = SettingsConfigDict(env_prefix="APP_")
+
+    storage_engine: str = "mongo"
+
+    mongo_uri: str = "mongodb://mongo:27017"
+    mongo_db_name: str = "car_database"
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 0
+    mongo_connect_timeout_ms: int = 5000
+    mongo_server_selection_timeout_ms: int = 5000
+    mongo_socket_timeout_ms: int = 10000
+
+    hashing_workers: int = 4
+    hashing_queue_size: int = 64
+
+    token_cache_size: int = 10000
+    token_cache_ttl_seconds: int = 60
+
+    cache_max_entries: int = 10000
+    cache_ttl_seconds: int = 30
+
+    log_level: str = "INFO"
+    log_levels: str = ""
+    log_queue_size: int = 10000
+    log_sample_burst: int = 20
+    log_sample_rate: int = 100
+    log_sample_window_seconds: float = 10.0
+
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    workers: int = 1
+    shutdown_timeout_seconds: int = 30
+    shutdown_drain_delay_seconds: float = 5.0
+    health_check_timeout_seconds: float = 2.0
+
+    static_dir: str = "frontend"
+
+    events_queue_size: int = 1000
+    events_max_deltas: int = 100
+    events_heartbeat_seconds: float = 15.0
+    events_retry_seconds: float = 30.0
+    events_ticket_seconds: int = 60
+    events_max_streams_per_user: int = 5
+
+    analytics_recompute_seconds: float = 300.0
+    analytics_growth_days: int = 30
+
+    rate_limit_enabled: bool = True
+    rate_limits: str = "auth=20/60,read=300/60,search=60/10,write=120/60,bulk=10/60"
+    rate_limit_max_buckets: int = 100000
+
+    concurrency_limit_enabled: bool = True
+    concurrency_initial_limit: int = 64
+    concurrency_min_limit: int = 8
+    concurrency_max_limit: int = 512
+    concurrency_target_latency_seconds: float = 0.5
+    concurrency_backoff: float = 0.8
+
+    admin_users: str = ""
+
+
+settings: Settings = Settings()
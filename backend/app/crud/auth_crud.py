@@ -1,16 +1,26 @@
-from pymongo.errors import PyMongoError
-from database import users_collection
+import logging
+from metrics.instrumentation import timed_operation
 from models.user import UserCreate, UserLogin
-from security.hashing import hash_password, verify_password
+from security.hashing import (
+    HashingPoolSaturated,
+    hash_password_async,
+    verify_password_async,
+)
 from security.jwt import create_access_token
+from storage.base import DuplicateKeyError, StorageError
+from storage.engines import get_repository
 from typing import Dict
 
+logger = logging.getLogger(__name__)
 
+
+@timed_operation("auth_crud.register_user_crud")
 async def register_user_crud(user: UserCreate) -> Dict[str, str]:
     """
     Регистрация нового пользователя.
 
-    E-mail должен быть уникальным в базе данных.
+    E-mail должен быть уникальным в базе данных; уникальность обеспечивается
+    уникальным ключом коллекции users, поэтому вставка выполняется за один запрос.
 
     Args:
         user (UserCreate): Данные нового пользователя.
@@ -20,39 +30,42 @@ async def register_user_crud(user: UserCreate) -> Dict[str, str]:
 
     Raises:
         ValueError: Если e-mail уже зарегистрирован.
+        HashingPoolSaturated: Если пул хэширования паролей перегружен.
         RuntimeError: Если произошла ошибка базы данных или иная ошибка.
     """
     try:
-        # Проверка существования пользователя с указанным e-mail
-        existing_user = users_collection.find_one({"email": user.email})
-        if existing_user:
-            raise ValueError("Email already registered")
-
         # Хэширование пароля и сохранение данных пользователя
-        hashed_password = hash_password(user.password)
+        hashed_password = await hash_password_async(user.password)
         user_data = {
             "first_name": user.first_name,
             "last_name": user.last_name,
             "email": user.email,
             "hashed_password": hashed_password,
         }
-        users_collection.insert_one(user_data)
+        await get_repository("users").insert_one(user_data)
         return {"msg": "User registered successfully"}
+    except DuplicateKeyError:
+        logger.warning("Validation error during registration: Email already registered")
+        raise ValueError("Email already registered")
     except ValueError as ve:
-        print(f"Validation error during registration: {ve}")
+        logger.warning("Validation error during registration: %s", ve)
         raise ve
-    except PyMongoError as pe:
-        print(f"Database error during registration: {pe}")
+    except HashingPoolSaturated as hs:
+        logger.warning("Hashing pool saturated during registration: %s", hs)
+        raise hs
+    except StorageError as se:
+        logger.error("Database error during registration: %s", se)
         raise RuntimeError(
             "Database error occurred while registering a user"
-        ) from pe
+        ) from se
     except Exception as e:
-        print(f"Unexpected error during registration: {e}")
+        logger.exception("Unexpected error during registration: %s", e)
         raise RuntimeError(
             "Unexpected error occurred during registration"
         ) from e
 
 
+@timed_operation("auth_crud.login_user_crud")
 async def login_user_crud(user: UserLogin) -> Dict[str, str]:
     """
     Аутентификация пользователя.
@@ -67,12 +80,13 @@ async def login_user_crud(user: UserLogin) -> Dict[str, str]:
 
     Raises:
         ValueError: При неверных учетных данных.
+        HashingPoolSaturated: Если пул хэширования паролей перегружен.
         RuntimeError: При ошибке взаимодействия с базой данных.
     """
     try:
         # Поиск пользователя в базе данных по e-mail
-        db_user = users_collection.find_one({"email": user.email})
-        if not db_user or not verify_password(
+        db_user = await get_repository("users").find_one({"email": user.email})
+        if not db_user or not await verify_password_async(
                 user.password, db_user["hashed_password"]
         ):
             raise ValueError("Invalid credentials")
@@ -81,15 +95,18 @@ async def login_user_crud(user: UserLogin) -> Dict[str, str]:
         token = create_access_token({"sub": user.email})
         return {"access_token": token, "token_type": "bearer"}
     except ValueError as ve:
-        print(f"Validation error during login: {ve}")
+        logger.warning("Validation error during login: %s", ve)
         raise ve
-    except PyMongoError as pe:
-        print(f"Database error during login: {pe}")
+    except HashingPoolSaturated as hs:
+        logger.warning("Hashing pool saturated during login: %s", hs)
+        raise hs
+    except StorageError as se:
+        logger.error("Database error during login: %s", se)
         raise RuntimeError(
             "Database error occurred while logging in"
-        ) from pe
+        ) from se
     except Exception as e:
-        print(f"Unexpected error during login: {e}")
+        logger.exception("Unexpected error during login: %s", e)
         raise RuntimeError(
             "Unexpected error occurred during login"
         ) from e
@@ -0,0 +1,156 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from cache.read_through import ReadThroughCache
+from models.batch import MAX_BATCH_PLATES
+from storage.base import Repository, UpdateResult
+
+# Количество номерных знаков в одной операции изменения или удаления
+BATCH_CHUNK_SIZE: int = 1000
+
+# Статус номера, который изменён другим запросом между чтением и записью
+# так, что результат операции для него установить нельзя
+CONFLICT_STATUS: str = "conflict"
+
+# Операция над частью пакета: принимает фильтр по номерам и возвращает
+# количество затронутых документов
+ChunkOperation = Callable[[Dict[str, Any]], Awaitable[int]]
+
+# Обработчик документов части, к которым операция успешно применена
+ChunkApplied = Callable[[List[Dict[str, Any]]], None]
+
+
+async def resolve_plates(
+        repository: Repository,
+        license_plates: Optional[List[str]],
+        query: Optional[Dict[str, Any]],
+) -> List[str]:
+    """
+    Список номерных знаков, к которым применяется пакетная операция.
+
+    Args:
+        repository (Repository): Коллекция.
+        license_plates (Optional[List[str]]): Явно заданные номера.
+        query (Optional[Dict[str, Any]]): Фильтр, если номера не заданы.
+
+    Returns:
+        List[str]: Номера без повторов, в порядке запроса (или по возрастанию
+                   для фильтра).
+
+    Raises:
+        ValueError: Если фильтр выбирает больше MAX_BATCH_PLATES записей.
+    """
+    if license_plates is not None:
+        return list(dict.fromkeys(license_plates))
+    # Фильтр ограничен тем же числом записей, что и список номеров
+    documents = await repository.find(query, ["license_plate"], limit=MAX_BATCH_PLATES + 1)
+    if len(documents) > MAX_BATCH_PLATES:
+        raise ValueError(
+            f"Filter matches more than {MAX_BATCH_PLATES} records; narrow it down"
+        )
+    return [document["license_plate"] for document in documents]
+
+
+async def matched_count(result: Awaitable[UpdateResult]) -> int:
+    """
+    Количество подошедших документов изменения, для ChunkOperation.
+
+    Args:
+        result (Awaitable[UpdateResult]): Изменение.
+
+    Returns:
+        int: Количество подошедших документов.
+    """
+    return (await result).matched
+
+
+async def apply_by_plates(
+        repository: Repository,
+        cache: ReadThroughCache,
+        license_plates: List[str],
+        operation: ChunkOperation,
+        status: str,
+        fields: Sequence[str] = (),
+        on_applied: Optional[ChunkApplied] = None,
+        removes: bool = False,
+) -> List[Dict[str, str]]:
+    """
+    Применение операции к номерам частями по BATCH_CHUNK_SIZE.
+
+    Для каждой части одним запросом определяются существующие номера,
+    затем операция выполняется одним запросом по фильтру $in, и записи
+    кэша этих номеров инвалидируются. Значения fields читаются тем же
+    запросом, что и существующие номера, то есть до применения операции.
+
+    Статус номера подтверждается результатом записи: если операция
+    затронула меньше документов, чем было прочитано (часть удалена другим
+    запросом между чтением и записью), при изменении номера части
+    читаются ещё раз, и номер, которого больше нет, получает "not_found";
+    при удалении отличить свои удаления от чужих нельзя, и номера части
+    получают CONFLICT_STATUS. В on_applied передаются только документы
+    с подтверждённым статусом; неучтённые удаления статистика получит при
+    следующем полном пересчёте.
+
+    Args:
+        repository (Repository): Коллекция.
+        cache (ReadThroughCache): Кэш чтения коллекции.
+        license_plates (List[str]): Номера без повторов.
+        operation (ChunkOperation): Изменение или удаление всех документов по фильтру.
+        status (str): Статус успешно обработанного номера.
+        fields (Sequence[str]): Дополнительные поля документов для on_applied.
+        on_applied (Optional[ChunkApplied]): Вызывается с документами части
+                                             после успешной операции.
+        removes (bool): Операция удаляет документы.
+
+    Returns:
+        List[Dict[str, str]]: Результат по каждому номеру: status, "not_found"
+                              или CONFLICT_STATUS.
+    """
+    results: List[Dict[str, str]] = []
+    for start in range(0, len(license_plates), BATCH_CHUNK_SIZE):
+        chunk = license_plates[start:start + BATCH_CHUNK_SIZE]
+        documents = await repository.find(
+            {"license_plate": {"$in": chunk}}, ["license_plate", *fields]
+        )
+        statuses = {document["license_plate"]: status for document in documents}
+        if statuses:
+            try:
+                affected = await operation({"license_plate": {"$in": sorted(statuses)}})
+            finally:
+                await cache.invalidate(statuses)
+            if affected < len(statuses):
+                if removes:
+                    statuses = dict.fromkeys(statuses, CONFLICT_STATUS)
+                else:
+                    remaining = await repository.find(
+                        {"license_plate": {"$in": sorted(statuses)}}, ["license_plate"]
+                    )
+                    present = {document["license_plate"] for document in remaining}
+                    statuses = {
+                        plate: status if plate in present else "not_found" for plate in statuses
+                    }
+                documents = [
+                    document for document in documents
+                    if statuses[document["license_plate"]] == status
+                ]
+            if on_applied is not None and documents:
+                on_applied(documents)
+        results.extend(
+            {"license_plate": plate, "status": statuses.get(plate, "not_found")}
+            for plate in chunk
+        )
+    return results
+
+
+def summarize_results(results: List[Dict[str, str]]) -> Dict[str, int]:
+    """
+    Количество номеров по статусам.
+
+    Args:
+        results (List[Dict[str, str]]): Результаты по номерам.
+
+    Returns:
+        Dict[str, int]: Статус -> количество.
+    """
+    summary: Dict[str, int] = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return summary
@@ -1,9 +1,51 @@
-from typing import List, Dict
-from pymongo.errors import PyMongoError
-from database import car_collection
+import logging
+from typing import Any, AsyncIterator, List, Dict, Optional, Tuple
+from analytics.aggregates import TRACKED_FIELDS, aggregates
+from metrics.instrumentation import timed_operation
+from cache.read_through import car_cache, registration_cache
+from crud.batch import CONFLICT_STATUS, apply_by_plates, matched_count, resolve_plates
+from events.bus import Event, resync_event
+from events.publisher import (
+    PUBLIC_FIELDS,
+    delete_event,
+    insert_event,
+    public_fields,
+    publish_local,
+    update_event,
+)
 from models.car import Car
+from models.validation import validate_update
+from search.engine import DEFAULT_LIMIT, search_documents
+from search.tokens import SEARCH_FIELDS, build_search_fields
+from storage.base import DuplicateKeyError, StorageError
+from storage.engines import get_repository
 
+logger = logging.getLogger(__name__)
 
+# Поля автомобиля, участвующие в поиске по словам
+CAR_SEARCH_FIELDS = SEARCH_FIELDS["cars"]
+
+# Публичные поля автомобиля: документы проверены моделью Car при записи,
+# поэтому при чтении они отдаются без повторной валидации
+CAR_FIELDS: Tuple[str, ...] = tuple(Car.model_fields)
+
+
+def car_to_document(car: Car) -> Dict[str, Any]:
+    """
+    Преобразование автомобиля в документ хранилища с поисковыми полями.
+
+    Args:
+        car (Car): Объект автомобиля.
+
+    Returns:
+        Dict[str, Any]: Документ для вставки.
+    """
+    document = car.dict()
+    document.update(build_search_fields(document, CAR_SEARCH_FIELDS))
+    return document
+
+
+@timed_operation("car_crud.update_car_by_license_plate")
 async def update_car_by_license_plate(license_plate: str, update_data: Dict) -> bool:
     """
     Обновление автомобиля по номерному знаку (license_plate).
@@ -18,67 +60,82 @@ async def update_car_by_license_plate(license_plate: str, update_data: Dict) ->
         bool: True, если обновление завершено успешно, иначе False.
 
     Raises:
-        ValueError: Если 'license_plate' в update_data или автомобиль отсутствует.
+        ValueError: Если 'license_plate' в update_data, данные не проходят проверку
+            или автомобиль отсутствует.
         RuntimeError: При ошибке взаимодействия с базой данных.
     """
     try:
         if "license_plate" in update_data:
             raise ValueError("Updating license plate is not allowed")
+        update_data = validate_update(Car, update_data)
 
-        result = car_collection.update_one(
-            {"license_plate": license_plate},
-            {"$set": update_data}
-        )
+        repository = get_repository("cars")
+        # Прежние значения нужны статистике, только если они меняются
+        previous = None
+        if aggregates.tracks("cars", update_data):
+            previous = await repository.find_one(
+                {"license_plate": license_plate}, TRACKED_FIELDS["cars"]
+            )
+        result = await repository.update({"license_plate": license_plate}, update_data)
 
-        if result.matched_count == 0:
+        if result.matched == 0:
             raise ValueError("Car not found")
-        return result.modified_count > 0
+        await car_cache.invalidate([license_plate])
+        if previous is not None:
+            aggregates.record_update("cars", [previous], update_data)
+        fields = public_fields(update_data, PUBLIC_FIELDS["cars"])
+        if fields:
+            publish_local("cars", [update_event("cars", license_plate, fields)])
+        return result.modified > 0
     except ValueError as ve:
-        print(f"Validation error during update: {ve}")
+        logger.warning("Validation error during update: %s", ve)
         raise ve
-    except PyMongoError as pe:
-        print(f"Database error during update: {pe}")
-        raise RuntimeError("Database error occurred while updating the car") from pe
+    except StorageError as se:
+        logger.error("Database error during update: %s", se)
+        raise RuntimeError("Database error occurred while updating the car") from se
     except Exception as e:
-        print(f"Unexpected error during update: {e}")
+        logger.exception("Unexpected error during update: %s", e)
         raise RuntimeError("Unexpected error occurred while updating the car") from e
 
 
-async def search_cars(query: str) -> List[Car]:
+@timed_operation("car_crud.search_cars")
+async def search_cars(query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
     """
     Поиск автомобилей по запросу.
 
+    Номерной знак ищется по префиксу, марка и модель — по префиксам слов.
+    Результаты упорядочены по релевантности.
+
     Args:
         query (str): Запрос для поиска (марка, модель или номерной знак).
+        limit (int): Максимальное количество результатов.
 
     Returns:
-        List[Car]: Список объектов Car, соответствующих запросу.
+        List[Dict[str, Any]]: Публичные поля найденных автомобилей.
 
     Raises:
         RuntimeError: При ошибке взаимодействия с базой данных.
     """
+    async def load() -> List[Dict[str, Any]]:
+        return await search_documents(get_repository("cars"), query, limit, CAR_FIELDS)
+
     try:
-        cars = car_collection.find({
-            "$or": [
-                {"make": {"$regex": query, "$options": "i"}},
-                {"model": {"$regex": query, "$options": "i"}},
-                {"license_plate": {"$regex": query, "$options": "i"}}
-            ]
-        })
-        return [Car(**{**car, "id": str(car["_id"])}) for car in cars]
-    except PyMongoError as pe:
-        print(f"Database error during search: {pe}")
-        raise RuntimeError("Database error occurred while searching cars") from pe
+        return await car_cache.get_search(query, limit, load)
+    except StorageError as se:
+        logger.error("Database error during search: %s", se)
+        raise RuntimeError("Database error occurred while searching cars") from se
     except Exception as e:
-        print(f"Unexpected error during search: {e}")
+        logger.exception("Unexpected error during search: %s", e)
         raise RuntimeError("Unexpected error occurred while searching cars") from e
 
 
+@timed_operation("car_crud.add_car")
 async def add_car(car: Car) -> None:
     """
     Добавление нового автомобиля.
 
-    Номерной знак (license_plate) должен быть уникальным.
+    Номерной знак (license_plate) должен быть уникальным; уникальность
+    обеспечивается индексом, поэтому вставка выполняется за один запрос.
 
     Args:
         car (Car): Объект нового автомобиля.
@@ -88,21 +145,25 @@ async def add_car(car: Car) -> None:
         RuntimeError: При ошибке взаимодействия с базой данных.
     """
     try:
-        if car_collection.find_one({"license_plate": car.license_plate}):
-            raise ValueError("Car with given license plate already exists")
-
-        car_collection.insert_one(car.dict())
+        await get_repository("cars").insert_one(car_to_document(car))
+        await car_cache.invalidate([car.license_plate])
+        aggregates.record_insert("cars", [car.model_dump()])
+        publish_local("cars", [insert_event("cars", car.model_dump())])
+    except DuplicateKeyError:
+        logger.warning("Validation error during addition: duplicate license plate")
+        raise ValueError("Car with given license plate already exists")
     except ValueError as ve:
-        print(f"Validation error during addition: {ve}")
+        logger.warning("Validation error during addition: %s", ve)
         raise ve
-    except PyMongoError as pe:
-        print(f"Database error during addition: {pe}")
-        raise RuntimeError("Database error occurred while adding a car") from pe
+    except StorageError as se:
+        logger.error("Database error during addition: %s", se)
+        raise RuntimeError("Database error occurred while adding a car") from se
     except Exception as e:
-        print(f"Unexpected error during addition: {e}")
+        logger.exception("Unexpected error during addition: %s", e)
         raise RuntimeError("Unexpected error occurred while adding a car") from e
 
 
+@timed_operation("car_crud.delete_car_by_license_plate")
 async def delete_car_by_license_plate(license_plate: str) -> bool:
     """
     Удаление автомобиля по номерному знаку (license_plate).
@@ -118,37 +179,377 @@ async def delete_car_by_license_plate(license_plate: str) -> bool:
         RuntimeError: При ошибке взаимодействия с базой данных.
     """
     try:
-        result = car_collection.delete_one({"license_plate": license_plate})
-        if result.deleted_count == 0:
+        repository = get_repository("cars")
+        # Удалённый документ возвращается той же операцией: статистика
+        # учитывает ровно то, что удалил этот запрос
+        previous = await repository.find_one_and_delete(
+            {"license_plate": license_plate}, TRACKED_FIELDS["cars"]
+        )
+        if previous is None:
             raise ValueError("Car with given license plate not found")
-        return result.deleted_count > 0
+        await car_cache.invalidate([license_plate])
+        aggregates.record_delete("cars", [previous])
+        publish_local("cars", [delete_event("cars", license_plate)])
+        return True
     except ValueError as ve:
-        print(f"Validation error during deletion: {ve}")
+        logger.warning("Validation error during deletion: %s", ve)
         raise ve
-    except PyMongoError as pe:
-        print(f"Database error during deletion: {pe}")
-        raise RuntimeError("Database error occurred while deleting the car") from pe
+    except StorageError as se:
+        logger.error("Database error during deletion: %s", se)
+        raise RuntimeError("Database error occurred while deleting the car") from se
     except Exception as e:
-        print(f"Unexpected error during deletion: {e}")
+        logger.exception("Unexpected error during deletion: %s", e)
         raise RuntimeError("Unexpected error occurred while deleting the car") from e
 
 
-async def get_all_cars() -> List[Car]:
+@timed_operation("car_crud.update_cars_batch")
+async def update_cars_batch(
+        license_plates: Optional[List[str]],
+        query: Optional[Dict[str, Any]],
+        update_data: Dict[str, Any],
+) -> List[Dict[str, str]]:
+    """
+    Пакетное обновление автомобилей: по списку номерных знаков или по фильтру.
+
+    Номера обрабатываются частями: каждая часть обновляется одной
+    операцией хранилища с теми же изменениями, что и одиночное обновление.
+
+    Args:
+        license_plates (Optional[List[str]]): Номерные знаки.
+        query (Optional[Dict[str, Any]]): Фильтр, если номера не заданы.
+        update_data (Dict[str, Any]): Данные для обновления.
+
+    Returns:
+        List[Dict[str, str]]: Результат по каждому номеру ("updated" или "not_found").
+
+    Raises:
+        ValueError: Если update_data пуст, изменяет 'license_plate', не проходит
+                    проверку или фильтр выбирает больше MAX_BATCH_PLATES записей.
+        RuntimeError: При ошибке взаимодействия с базой данных.
+    """
+    try:
+        if not update_data:
+            raise ValueError("No fields to update")
+        if "license_plate" in update_data:
+            raise ValueError("Updating license plate is not allowed")
+        update_data = validate_update(Car, update_data)
+
+        repository = get_repository("cars")
+        plates = await resolve_plates(repository, license_plates, query)
+        results = await apply_by_plates(
+            repository,
+            car_cache,
+            plates,
+            lambda plate_filter: matched_count(
+                repository.update(plate_filter, update_data, many=True)
+            ),
+            "updated",
+            TRACKED_FIELDS["cars"],
+            lambda documents: aggregates.record_update("cars", documents, update_data),
+        )
+        fields = public_fields(update_data, PUBLIC_FIELDS["cars"])
+        if fields:
+            publish_local("cars", [
+                update_event("cars", result["license_plate"], fields)
+                for result in results if result["status"] == "updated"
+            ])
+        return results
+    except ValueError as ve:
+        logger.warning("Validation error during batch update: %s", ve)
+        raise ve
+    except StorageError as se:
+        logger.error("Database error during batch update: %s", se)
+        raise RuntimeError("Database error occurred while updating cars") from se
+    except Exception as e:
+        logger.exception("Unexpected error during batch update: %s", e)
+        raise RuntimeError("Unexpected error occurred while updating cars") from e
+
+
+@timed_operation("car_crud.delete_cars_batch")
+async def delete_cars_batch(
+        license_plates: Optional[List[str]], query: Optional[Dict[str, Any]]
+) -> List[Dict[str, str]]:
+    """
+    Пакетное удаление автомобилей: по списку номерных знаков или по фильтру.
+
+    Args:
+        license_plates (Optional[List[str]]): Номерные знаки.
+        query (Optional[Dict[str, Any]]): Фильтр, если номера не заданы.
+
+    Returns:
+        List[Dict[str, str]]: Результат по каждому номеру ("deleted", "not_found"
+                              или "conflict", если номер одновременно удалён
+                              другим запросом).
+
+    Raises:
+        ValueError: Если фильтр выбирает больше MAX_BATCH_PLATES записей.
+        RuntimeError: При ошибке взаимодействия с базой данных.
+    """
+    try:
+        repository = get_repository("cars")
+        plates = await resolve_plates(repository, license_plates, query)
+        results = await apply_by_plates(
+            repository,
+            car_cache,
+            plates,
+            lambda plate_filter: repository.delete(plate_filter, many=True),
+            "deleted",
+            TRACKED_FIELDS["cars"],
+            lambda documents: aggregates.record_delete("cars", documents),
+            removes=True,
+        )
+        publish_local("cars", [
+            delete_event("cars", result["license_plate"])
+            for result in results if result["status"] in ("deleted", CONFLICT_STATUS)
+        ])
+        return results
+    except ValueError as ve:
+        logger.warning("Validation error during batch deletion: %s", ve)
+        raise ve
+    except StorageError as se:
+        logger.error("Database error during batch deletion: %s", se)
+        raise RuntimeError("Database error occurred while deleting cars") from se
+    except Exception as e:
+        logger.exception("Unexpected error during batch deletion: %s", e)
+        raise RuntimeError("Unexpected error occurred while deleting cars") from e
+
+
+@timed_operation("car_crud.get_cars_page")
+async def get_cars_page(
+        limit: int, after: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Получение страницы автомобилей с курсорной (keyset) пагинацией.
+
+    Автомобили упорядочены по номерному знаку; следующая страница
+    запрашивается по последнему номерному знаку предыдущей. Одновременные
+    запросы одной страницы выполняют одно чтение из хранилища.
+
+    Args:
+        limit (int): Максимальное количество автомобилей на странице.
+        after (Optional[str]): Номерной знак, после которого начинается страница.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Optional[str]]: Автомобили страницы и курсор
+                                                    следующей страницы (None, если
+                                                    страница последняя).
+
+    Raises:
+        RuntimeError: При ошибке взаимодействия с базой данных.
+    """
+    try:
+        query = {"license_plate": {"$gt": after}} if after else {}
+        cars = await car_cache.get_shared(
+            "page",
+            f"{limit}:{after or ''}",
+            lambda: get_repository("cars").find(query, CAR_FIELDS, limit=limit + 1),
+        )
+        if len(cars) > limit:
+            cars = cars[:limit]
+            return cars, cars[-1]["license_plate"]
+        return cars, None
+    except StorageError as se:
+        logger.error("Database error during fetching cars page: %s", se)
+        raise RuntimeError("Database error occurred while fetching cars page") from se
+    except Exception as e:
+        logger.exception("Unexpected error during fetching cars page: %s", e)
+        raise RuntimeError("Unexpected error occurred while fetching cars page") from e
+
+
+@timed_operation("car_crud.iter_cars")
+async def iter_cars(batch_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Потоковое получение всех автомобилей по мере чтения курсора.
+
+    В памяти одновременно находится не более одного пакета документов.
+
+    Args:
+        batch_size (int): Размер пакета, запрашиваемого у хранилища.
+
+    Yields:
+        Dict[str, Any]: Публичные поля очередного автомобиля.
+
+    Raises:
+        RuntimeError: При ошибке взаимодействия с базой данных.
+    """
+    try:
+        async for car in get_repository("cars").iterate({}, CAR_FIELDS, batch_size):
+            yield car
+    except StorageError as se:
+        logger.error("Database error during streaming cars: %s", se)
+        raise RuntimeError("Database error occurred while streaming cars") from se
+
+
+@timed_operation("car_crud.add_cars_bulk")
+async def add_cars_bulk(cars: List[Tuple[int, Car]]) -> List[Dict[str, Any]]:
     """
-    Получение списка всех автомобилей.
+    Пакетное добавление автомобилей одной неупорядоченной вставкой.
+
+    Дубликаты номерных знаков отклоняются уникальным индексом и не
+    мешают вставке остальных автомобилей пакета.
+
+    Args:
+        cars (List[Tuple[int, Car]]): Номера строк исходного файла и автомобили.
 
     Returns:
-        List[Car]: Список всех объектов Car.
+        List[Dict[str, Any]]: Ошибки записи с номерами строк.
 
     Raises:
         RuntimeError: При ошибке взаимодействия с базой данных.
     """
+    # Если результат записи неизвестен, клиентам отправляется resync
+    events: List[Event] = [resync_event("cars")]
+    try:
+        write_errors = await get_repository("cars").insert_many(
+            [car_to_document(car) for _, car in cars]
+        )
+        failed = {write_error["index"] for write_error in write_errors}
+        events = [
+            insert_event("cars", car.model_dump())
+            for index, (_, car) in enumerate(cars) if index not in failed
+        ]
+        aggregates.record_insert("cars", [event["document"] for event in events])
+        errors = []
+        for write_error in write_errors:
+            number, car = cars[write_error["index"]]
+            if write_error["duplicate"]:
+                message = "Car with given license plate already exists"
+            else:
+                message = write_error["message"]
+            errors.append({"row": number, "license_plate": car.license_plate, "error": message})
+        return errors
+    except StorageError as se:
+        logger.error("Database error during bulk addition: %s", se)
+        raise RuntimeError("Database error occurred while adding cars") from se
+    finally:
+        # Пакет мог быть записан частично, поэтому инвалидируются все его номера
+        await car_cache.invalidate(car.license_plate for _, car in cars)
+        publish_local("cars", events)
+
+
+@timed_operation("car_crud.iter_car_documents")
+async def iter_car_documents(
+        query: Dict[str, Any], fields: List[str], batch_size: int = 1000
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Потоковое чтение документов автомобилей с проекцией полей.
+
+    Документы не проходят повторную валидацию моделью Car.
+
+    Args:
+        query (Dict[str, Any]): Фильтр в синтаксисе MongoDB.
+        fields (List[str]): Поля, возвращаемые в документах.
+        batch_size (int): Размер пакета, запрашиваемого у хранилища.
+
+    Yields:
+        Dict[str, Any]: Очередной документ.
+
+    Raises:
+        RuntimeError: При ошибке взаимодействия с базой данных.
+    """
+    try:
+        async for document in get_repository("cars").iterate(query, fields, batch_size):
+            yield document
+    except StorageError as se:
+        logger.error("Database error during exporting cars: %s", se)
+        raise RuntimeError("Database error occurred while exporting cars") from se
+
+
+@timed_operation("car_crud.get_cars_with_registrations_page")
+async def get_cars_with_registrations_page(
+        limit: int, after: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Получение страницы автомобилей вместе с их регистрациями одним запросом.
+
+    Args:
+        limit (int): Максимальное количество автомобилей на странице.
+        after (Optional[str]): Номерной знак, после которого начинается страница.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Optional[str]]: Автомобили с полем registration
+                                                    (None, если регистрации нет) и
+                                                    курсор следующей страницы.
+
+    Raises:
+        RuntimeError: При ошибке взаимодействия с базой данных.
+    """
+    try:
+        match = {"license_plate": {"$gt": after}} if after else {}
+        cars = await car_cache.get_shared(
+            "joined_page",
+            f"{limit}:{after or ''}",
+            lambda: get_repository("cars").join(match, "registrations", "registration", limit + 1),
+            registration_cache,
+        )
+        if len(cars) > limit:
+            cars = cars[:limit]
+            return cars, cars[-1]["license_plate"]
+        return cars, None
+    except StorageError as se:
+        logger.error("Database error during fetching joined cars: %s", se)
+        raise RuntimeError("Database error occurred while fetching cars with registrations") from se
+    except Exception as e:
+        logger.exception("Unexpected error during fetching joined cars: %s", e)
+        raise RuntimeError("Unexpected error occurred while fetching cars with registrations") from e
+
+
+@timed_operation("car_crud.lookup_cars_with_registrations")
+async def lookup_cars_with_registrations(license_plates: List[str]) -> List[Dict[str, Any]]:
+    """
+    Пакетный поиск автомобилей с регистрациями по списку номерных знаков.
+
+    Args:
+        license_plates (List[str]): Номерные знаки.
+
+    Returns:
+        List[Dict[str, Any]]: Найденные автомобили с полем registration.
+
+    Raises:
+        RuntimeError: При ошибке взаимодействия с базой данных.
+    """
+    try:
+        plates = sorted(set(license_plates))
+        match = {"license_plate": {"$in": plates}}
+        return await car_cache.get_shared(
+            "lookup",
+            ",".join(plates),
+            lambda: get_repository("cars").join(match, "registrations", "registration"),
+            registration_cache,
+        )
+    except StorageError as se:
+        logger.error("Database error during cars lookup: %s", se)
+        raise RuntimeError("Database error occurred while looking up cars") from se
+    except Exception as e:
+        logger.exception("Unexpected error during cars lookup: %s", e)
+        raise RuntimeError("Unexpected error occurred while looking up cars") from e
+
+
+@timed_operation("car_crud.get_car_by_license_plate")
+async def get_car_by_license_plate(license_plate: str) -> Optional[Car]:
+    """
+    Получение автомобиля по номерному знаку (через кэш чтения).
+
+    Args:
+        license_plate (str): Номерной знак автомобиля.
+
+    Returns:
+        Optional[Car]: Автомобиль или None, если его нет.
+
+    Raises:
+        RuntimeError: При ошибке взаимодействия с базой данных.
+    """
+    async def load() -> Optional[Dict[str, Any]]:
+        return await get_repository("cars").find_one(
+            {"license_plate": license_plate}, CAR_FIELDS
+        )
+
     try:
-        cars = car_collection.find()
-        return [Car(**{**car, "id": str(car["_id"])}) for car in cars]
-    except PyMongoError as pe:
-        print(f"Database error during fetching all cars: {pe}")
-        raise RuntimeError("Database error occurred while fetching all cars") from pe
+        car = await car_cache.get_by_plate(license_plate, load)
+        return Car.model_construct(**car) if car else None
+    except StorageError as se:
+        logger.error("Database error during fetching car: %s", se)
+        raise RuntimeError("Database error occurred while fetching the car") from se
     except Exception as e:
-        print(f"Unexpected error during fetching all cars: {e}")
-        raise RuntimeError("Unexpected error occurred while fetching all cars") from e
+        logger.exception("Unexpected error during fetching car: %s", e)
+        raise RuntimeError("Unexpected error occurred while fetching the car") from e
@@ -1,9 +1,51 @@
-from database import registration_collection
+import logging
+from cache.read_through import registration_cache
+from crud.batch import CONFLICT_STATUS, apply_by_plates, matched_count, resolve_plates
+from events.bus import Event, resync_event
+from events.publisher import (
+    PUBLIC_FIELDS,
+    delete_event,
+    insert_event,
+    public_fields,
+    publish_local,
+    update_event,
+)
+from analytics.aggregates import TRACKED_FIELDS, aggregates
+from metrics.instrumentation import timed_operation
 from models.registration import Registration
-from typing import List, Dict, Union
-from pymongo.errors import PyMongoError
+from models.validation import validate_update
+from typing import Any, AsyncIterator, List, Dict, Optional, Tuple, Union
+from search.engine import DEFAULT_LIMIT, search_documents
+from search.tokens import SEARCH_FIELDS, build_search_fields
+from storage.base import DuplicateKeyError, StorageError
+from storage.engines import get_repository
 
+logger = logging.getLogger(__name__)
 
+# Поля регистрации, участвующие в поиске по словам
+REGISTRATION_SEARCH_FIELDS = SEARCH_FIELDS["registrations"]
+
+# Публичные поля регистрации: документы проверены моделью Registration
+# при записи, поэтому при чтении они отдаются без повторной валидации
+REGISTRATION_FIELDS: Tuple[str, ...] = tuple(Registration.model_fields)
+
+
+def registration_to_document(registration: Registration) -> Dict[str, Any]:
+    """
+    Преобразование регистрации в документ хранилища с поисковыми полями.
+
+    Args:
+        registration (Registration): Объект регистрации.
+
+    Returns:
+        Dict[str, Any]: Документ для вставки.
+    """
+    document = registration.dict()
+    document.update(build_search_fields(document, REGISTRATION_SEARCH_FIELDS))
+    return document
+
+
+@timed_operation("registration_crud.update_registration_by_license_plate")
 async def update_registration_by_license_plate(
         license_plate: str, update_data: Dict[str, Union[str, int]]
 ) -> bool:
@@ -19,73 +61,91 @@ async def update_registration_by_license_plate(
         bool: Статус успешности изменения.
 
     Raises:
-        ValueError: Если попытка изменить license_plate или запись не найдена.
+        ValueError: Если попытка изменить license_plate, данные не проходят проверку
+                    или запись не найдена.
         RuntimeError: Если произошла ошибка базы данных или иная ошибка.
     """
     try:
         if "license_plate" in update_data:
             raise ValueError("Updating license plate is not allowed")
+        update_data = validate_update(Registration, update_data)
 
-        result = registration_collection.update_one(
-            {"license_plate": license_plate},
-            {"$set": update_data}
-        )
-        if result.matched_count == 0:
+        repository = get_repository("registrations")
+        # Прежние значения нужны статистике, только если они меняются
+        previous = None
+        if aggregates.tracks("registrations", update_data):
+            previous = await repository.find_one(
+                {"license_plate": license_plate}, TRACKED_FIELDS["registrations"]
+            )
+        result = await repository.update({"license_plate": license_plate}, update_data)
+        if result.matched == 0:
             raise ValueError("Registration not found")
+        await registration_cache.invalidate([license_plate])
+        if previous is not None:
+            aggregates.record_update("registrations", [previous], update_data)
+        fields = public_fields(update_data, PUBLIC_FIELDS["registrations"])
+        if fields:
+            publish_local("registrations", [update_event("registrations", license_plate, fields)])
 
-        return result.modified_count > 0
+        return result.modified > 0
     except ValueError as ve:
-        print(f"Validation error during update: {ve}")
+        logger.warning("Validation error during update: %s", ve)
         raise ve
-    except PyMongoError as pe:
-        print(f"Database error during update: {pe}")
-        raise RuntimeError("Database error occurred during update") from pe
+    except StorageError as se:
+        logger.error("Database error during update: %s", se)
+        raise RuntimeError("Database error occurred during update") from se
     except Exception as e:
-        print(f"Unexpected error during update: {e}")
+        logger.exception("Unexpected error during update: %s", e)
         raise RuntimeError("Unexpected error occurred during update") from e
 
 
-async def search_registrations(query: str) -> List[Registration]:
+@timed_operation("registration_crud.search_registrations")
+async def search_registrations(
+        query: str, limit: int = DEFAULT_LIMIT
+) -> List[Dict[str, Any]]:
     """
     Поиск регистраций в базе данных по заданному запросу.
 
+    Номерной знак ищется по префиксу, имя и адрес владельца — по
+    префиксам слов. Результаты упорядочены по релевантности.
+
     Args:
         query (str): Поисковый запрос.
+        limit (int): Максимальное количество результатов.
 
     Returns:
-        List[Registration]: Список найденных регистраций.
+        List[Dict[str, Any]]: Публичные поля найденных регистраций.
 
     Raises:
         RuntimeError: Если произошла ошибка базы данных или иная ошибка.
     """
+    async def load() -> List[Dict[str, Any]]:
+        return await search_documents(
+            get_repository("registrations"), query, limit, REGISTRATION_FIELDS
+        )
+
     try:
-        registrations = registration_collection.find({
-            "$or": [
-                {"license_plate": {"$regex": query, "$options": "i"}},
-                {"owner_name": {"$regex": query, "$options": "i"}},
-                {"owner_address": {"$regex": query, "$options": "i"}}
-            ]
-        })
-        return [
-            Registration(**{**registration, "id": str(registration["_id"])})
-            for registration in registrations
-        ]
-    except PyMongoError as pe:
-        print(f"Database error during search: {pe}")
+        return await registration_cache.get_search(query, limit, load)
+    except StorageError as se:
+        logger.error("Database error during search: %s", se)
         raise RuntimeError(
             "Database error occurred while searching registrations"
-        ) from pe
+        ) from se
     except Exception as e:
-        print(f"Unexpected error during search: {e}")
+        logger.exception("Unexpected error during search: %s", e)
         raise RuntimeError(
             "Unexpected error occurred while searching registrations"
         ) from e
 
 
+@timed_operation("registration_crud.add_registration")
 async def add_registration(registration: Registration) -> None:
     """
     Добавление новой регистрации.
 
+    Уникальность license_plate обеспечивается индексом, поэтому вставка
+    выполняется за один запрос.
+
     Args:
         registration (Registration): Объект регистрации.
 
@@ -94,85 +154,381 @@ async def add_registration(registration: Registration) -> None:
         RuntimeError: Если произошла ошибка базы данных или иная ошибка.
     """
     try:
-        if registration_collection.find_one(
-                {"license_plate": registration.license_plate}
-        ):
-            raise ValueError("Registration with given license plate already exists")
-
-        registration_collection.insert_one(registration.dict())
+        await get_repository("registrations").insert_one(
+            registration_to_document(registration)
+        )
+        await registration_cache.invalidate([registration.license_plate])
+        aggregates.record_insert("registrations", [registration.model_dump()])
+        publish_local("registrations", [insert_event("registrations", registration.model_dump())])
+    except DuplicateKeyError:
+        logger.warning("Validation error during addition: duplicate license plate")
+        raise ValueError("Registration with given license plate already exists")
     except ValueError as ve:
-        print(f"Validation error during addition: {ve}")
+        logger.warning("Validation error during addition: %s", ve)
         raise ve
-    except PyMongoError as pe:
-        print(f"Database error during addition: {pe}")
+    except StorageError as se:
+        logger.error("Database error during addition: %s", se)
         raise RuntimeError(
             "Database error occurred while adding registration"
-        ) from pe
+        ) from se
     except Exception as e:
-        print(f"Unexpected error during addition: {e}")
+        logger.exception("Unexpected error during addition: %s", e)
         raise RuntimeError(
             "Unexpected error occurred while adding registration"
         ) from e
 
 
-async def get_all_registrations() -> List[Registration]:
+@timed_operation("registration_crud.delete_registration_by_license_plate")
+async def delete_registration_by_license_plate(license_plate: str) -> bool:
     """
-    Получение всех регистраций.
+    Удаление регистрации по номеру.
+
+    Args:
+        license_plate (str): Номерной знак для удаления.
 
     Returns:
-        List[Registration]: Список всех регистраций.
+        bool: Статус успешности удаления.
 
     Raises:
+        ValueError: Если запись с указанным номером не найдена.
         RuntimeError: Если произошла ошибка базы данных или иная ошибка.
     """
     try:
-        registrations = registration_collection.find()
-        return [
-            Registration(**{**registration, "id": str(registration["_id"])})
-            for registration in registrations
-        ]
-    except PyMongoError as pe:
-        print(f"Database error during fetching registrations: {pe}")
+        repository = get_repository("registrations")
+        # Удалённый документ возвращается той же операцией: статистика
+        # учитывает ровно то, что удалил этот запрос
+        previous = await repository.find_one_and_delete(
+            {"license_plate": license_plate}, TRACKED_FIELDS["registrations"]
+        )
+        if previous is None:
+            raise ValueError("Registration not found")
+        await registration_cache.invalidate([license_plate])
+        aggregates.record_delete("registrations", [previous])
+        publish_local("registrations", [delete_event("registrations", license_plate)])
+
+        return True
+    except ValueError as ve:
+        logger.warning("Validation error during deletion: %s", ve)
+        raise ve
+    except StorageError as se:
+        logger.error("Database error during deletion: %s", se)
         raise RuntimeError(
-            "Database error occurred while fetching registrations"
-        ) from pe
+            "Database error occurred while deleting registration"
+        ) from se
     except Exception as e:
-        print(f"Unexpected error during fetching registrations: {e}")
+        logger.exception("Unexpected error during deletion: %s", e)
         raise RuntimeError(
-            "Unexpected error occurred while fetching registrations"
+            "Unexpected error occurred while deleting registration"
         ) from e
 
 
-async def delete_registration_by_license_plate(license_plate: str) -> bool:
+@timed_operation("registration_crud.update_registrations_batch")
+async def update_registrations_batch(
+        license_plates: Optional[List[str]],
+        query: Optional[Dict[str, Any]],
+        update_data: Dict[str, Any],
+) -> List[Dict[str, str]]:
     """
-    Удаление регистрации по номеру.
+    Пакетное обновление регистраций: по списку номерных знаков или по фильтру.
+
+    Номера обрабатываются частями: каждая часть обновляется одной
+    операцией хранилища с теми же изменениями, что и одиночное обновление.
 
     Args:
-        license_plate (str): Номерной знак для удаления.
+        license_plates (Optional[List[str]]): Номерные знаки.
+        query (Optional[Dict[str, Any]]): Фильтр, если номера не заданы.
+        update_data (Dict[str, Any]): Данные для обновления.
 
     Returns:
-        bool: Статус успешности удаления.
+        List[Dict[str, str]]: Результат по каждому номеру ("updated" или "not_found").
 
     Raises:
-        ValueError: Если запись с указанным номером не найдена.
-        RuntimeError: Если произошла ошибка базы данных или иная ошибка.
+        ValueError: Если update_data пуст, изменяет 'license_plate', не проходит
+                    проверку или фильтр выбирает больше MAX_BATCH_PLATES записей.
+        RuntimeError: При ошибке взаимодействия с базой данных.
     """
     try:
-        result = registration_collection.delete_one({"license_plate": license_plate})
-        if result.deleted_count == 0:
-            raise ValueError("Registration not found")
+        if not update_data:
+            raise ValueError("No fields to update")
+        if "license_plate" in update_data:
+            raise ValueError("Updating license plate is not allowed")
+        update_data = validate_update(Registration, update_data)
+
+        repository = get_repository("registrations")
+        plates = await resolve_plates(repository, license_plates, query)
+        results = await apply_by_plates(
+            repository,
+            registration_cache,
+            plates,
+            lambda plate_filter: matched_count(
+                repository.update(plate_filter, update_data, many=True)
+            ),
+            "updated",
+            TRACKED_FIELDS["registrations"],
+            lambda documents: aggregates.record_update("registrations", documents, update_data),
+        )
+        fields = public_fields(update_data, PUBLIC_FIELDS["registrations"])
+        if fields:
+            publish_local("registrations", [
+                update_event("registrations", result["license_plate"], fields)
+                for result in results if result["status"] == "updated"
+            ])
+        return results
+    except ValueError as ve:
+        logger.warning("Validation error during batch update: %s", ve)
+        raise ve
+    except StorageError as se:
+        logger.error("Database error during batch update: %s", se)
+        raise RuntimeError("Database error occurred while updating registrations") from se
+    except Exception as e:
+        logger.exception("Unexpected error during batch update: %s", e)
+        raise RuntimeError("Unexpected error occurred while updating registrations") from e
+
+
+@timed_operation("registration_crud.delete_registrations_batch")
+async def delete_registrations_batch(
+        license_plates: Optional[List[str]], query: Optional[Dict[str, Any]]
+) -> List[Dict[str, str]]:
+    """
+    Пакетное удаление регистраций: по списку номерных знаков или по фильтру.
+
+    Args:
+        license_plates (Optional[List[str]]): Номерные знаки.
+        query (Optional[Dict[str, Any]]): Фильтр, если номера не заданы.
+
+    Returns:
+        List[Dict[str, str]]: Результат по каждому номеру ("deleted", "not_found"
+                              или "conflict", если номер одновременно удалён
+                              другим запросом).
 
-        return result.deleted_count > 0
+    Raises:
+        ValueError: Если фильтр выбирает больше MAX_BATCH_PLATES записей.
+        RuntimeError: При ошибке взаимодействия с базой данных.
+    """
+    try:
+        repository = get_repository("registrations")
+        plates = await resolve_plates(repository, license_plates, query)
+        results = await apply_by_plates(
+            repository,
+            registration_cache,
+            plates,
+            lambda plate_filter: repository.delete(plate_filter, many=True),
+            "deleted",
+            TRACKED_FIELDS["registrations"],
+            lambda documents: aggregates.record_delete("registrations", documents),
+            removes=True,
+        )
+        publish_local("registrations", [
+            delete_event("registrations", result["license_plate"])
+            for result in results if result["status"] in ("deleted", CONFLICT_STATUS)
+        ])
+        return results
     except ValueError as ve:
-        print(f"Validation error during deletion: {ve}")
+        logger.warning("Validation error during batch deletion: %s", ve)
         raise ve
-    except PyMongoError as pe:
-        print(f"Database error during deletion: {pe}")
+    except StorageError as se:
+        logger.error("Database error during batch deletion: %s", se)
+        raise RuntimeError("Database error occurred while deleting registrations") from se
+    except Exception as e:
+        logger.exception("Unexpected error during batch deletion: %s", e)
+        raise RuntimeError("Unexpected error occurred while deleting registrations") from e
+
+
+@timed_operation("registration_crud.get_registrations_page")
+async def get_registrations_page(
+        limit: int, after: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Получение страницы регистраций с курсорной (keyset) пагинацией.
+
+    Регистрации упорядочены по номерному знаку; следующая страница
+    запрашивается по последнему номерному знаку предыдущей. Одновременные
+    запросы одной страницы выполняют одно чтение из хранилища.
+
+    Args:
+        limit (int): Максимальное количество регистраций на странице.
+        after (Optional[str]): Номерной знак, после которого начинается страница.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Optional[str]]: Регистрации страницы и курсор
+                                                    следующей страницы (None, если
+                                                    страница последняя).
+
+    Raises:
+        RuntimeError: Если произошла ошибка базы данных или иная ошибка.
+    """
+    try:
+        query = {"license_plate": {"$gt": after}} if after else {}
+        registrations = await registration_cache.get_shared(
+            "page",
+            f"{limit}:{after or ''}",
+            lambda: get_repository("registrations").find(
+                query, REGISTRATION_FIELDS, limit=limit + 1
+            ),
+        )
+        if len(registrations) > limit:
+            registrations = registrations[:limit]
+            return registrations, registrations[-1]["license_plate"]
+        return registrations, None
+    except StorageError as se:
+        logger.error("Database error during fetching registrations page: %s", se)
         raise RuntimeError(
-            "Database error occurred while deleting registration"
-        ) from pe
+            "Database error occurred while fetching registrations page"
+        ) from se
     except Exception as e:
-        print(f"Unexpected error during deletion: {e}")
+        logger.exception("Unexpected error during fetching registrations page: %s", e)
         raise RuntimeError(
-            "Unexpected error occurred while deleting registration"
+            "Unexpected error occurred while fetching registrations page"
+        ) from e
+
+
+@timed_operation("registration_crud.iter_registrations")
+async def iter_registrations(batch_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Потоковое получение всех регистраций по мере чтения курсора.
+
+    В памяти одновременно находится не более одного пакета документов.
+
+    Args:
+        batch_size (int): Размер пакета, запрашиваемого у хранилища.
+
+    Yields:
+        Dict[str, Any]: Публичные поля очередной регистрации.
+
+    Raises:
+        RuntimeError: Если произошла ошибка базы данных.
+    """
+    try:
+        registrations = get_repository("registrations").iterate(
+            {}, REGISTRATION_FIELDS, batch_size
+        )
+        async for registration in registrations:
+            yield registration
+    except StorageError as se:
+        logger.error("Database error during streaming registrations: %s", se)
+        raise RuntimeError(
+            "Database error occurred while streaming registrations"
+        ) from se
+
+
+@timed_operation("registration_crud.add_registrations_bulk")
+async def add_registrations_bulk(
+        registrations: List[Tuple[int, Registration]]
+) -> List[Dict[str, Any]]:
+    """
+    Пакетное добавление регистраций одной неупорядоченной вставкой.
+
+    Дубликаты номерных знаков отклоняются уникальным индексом и не
+    мешают вставке остальных регистраций пакета.
+
+    Args:
+        registrations (List[Tuple[int, Registration]]): Номера строк исходного
+                                                        файла и регистрации.
+
+    Returns:
+        List[Dict[str, Any]]: Ошибки записи с номерами строк.
+
+    Raises:
+        RuntimeError: Если произошла ошибка базы данных.
+    """
+    # Если результат записи неизвестен, клиентам отправляется resync
+    events: List[Event] = [resync_event("registrations")]
+    try:
+        write_errors = await get_repository("registrations").insert_many(
+            [registration_to_document(registration) for _, registration in registrations]
+        )
+        failed = {write_error["index"] for write_error in write_errors}
+        events = [
+            insert_event("registrations", registration.model_dump())
+            for index, (_, registration) in enumerate(registrations) if index not in failed
+        ]
+        aggregates.record_insert("registrations", [event["document"] for event in events])
+        errors = []
+        for write_error in write_errors:
+            number, registration = registrations[write_error["index"]]
+            if write_error["duplicate"]:
+                message = "Registration with given license plate already exists"
+            else:
+                message = write_error["message"]
+            errors.append({
+                "row": number,
+                "license_plate": registration.license_plate,
+                "error": message,
+            })
+        return errors
+    except StorageError as se:
+        logger.error("Database error during bulk addition: %s", se)
+        raise RuntimeError(
+            "Database error occurred while adding registrations"
+        ) from se
+    finally:
+        # Пакет мог быть записан частично, поэтому инвалидируются все его номера
+        await registration_cache.invalidate(
+            registration.license_plate for _, registration in registrations
+        )
+        publish_local("registrations", events)
+
+
+@timed_operation("registration_crud.iter_registration_documents")
+async def iter_registration_documents(
+        query: Dict[str, Any], fields: List[str], batch_size: int = 1000
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Потоковое чтение документов регистраций с проекцией полей.
+
+    Документы не проходят повторную валидацию моделью Registration.
+
+    Args:
+        query (Dict[str, Any]): Фильтр в синтаксисе MongoDB.
+        fields (List[str]): Поля, возвращаемые в документах.
+        batch_size (int): Размер пакета, запрашиваемого у хранилища.
+
+    Yields:
+        Dict[str, Any]: Очередной документ.
+
+    Raises:
+        RuntimeError: Если произошла ошибка базы данных.
+    """
+    try:
+        documents = get_repository("registrations").iterate(query, fields, batch_size)
+        async for document in documents:
+            yield document
+    except StorageError as se:
+        logger.error("Database error during exporting registrations: %s", se)
+        raise RuntimeError(
+            "Database error occurred while exporting registrations"
+        ) from se
+
+
+@timed_operation("registration_crud.get_registration_by_license_plate")
+async def get_registration_by_license_plate(license_plate: str) -> Optional[Registration]:
+    """
+    Получение регистрации по номерному знаку (через кэш чтения).
+
+    Args:
+        license_plate (str): Номерной знак.
+
+    Returns:
+        Optional[Registration]: Регистрация или None, если её нет.
+
+    Raises:
+        RuntimeError: Если произошла ошибка базы данных или иная ошибка.
+    """
+    async def load() -> Optional[Dict[str, Any]]:
+        return await get_repository("registrations").find_one(
+            {"license_plate": license_plate}, REGISTRATION_FIELDS
+        )
+
+    try:
+        registration = await registration_cache.get_by_plate(license_plate, load)
+        return Registration.model_construct(**registration) if registration else None
+    except StorageError as se:
+        logger.error("Database error during fetching registration: %s", se)
+        raise RuntimeError(
+            "Database error occurred while fetching registration"
+        ) from se
+    except Exception as e:
+        logger.exception("Unexpected error during fetching registration: %s", e)
+        raise RuntimeError(
+            "Unexpected error occurred while fetching registration"
         ) from e
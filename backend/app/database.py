@@ -1,10 +1,107 @@
-from pymongo import MongoClient
+import asyncio
+from typing import Optional
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorCollection,
+    AsyncIOMotorDatabase,
+)
+from pymongo.errors import PyMongoError
+from config import settings
 
-# Создание клиента MongoDB
-client: MongoClient = MongoClient("mongodb://mongo:27017")
+# Асинхронный клиент MongoDB, создаётся при старте приложения (lifespan)
+client: Optional[AsyncIOMotorClient] = None
 
-# Инициализация базы данных и коллекций
-db = client.car_database
-car_collection = db.cars
-registration_collection = db.registrations
-users_collection = db.users
+
+def connect_to_mongo() -> AsyncIOMotorClient:
+    """
+    Создание асинхронного клиента MongoDB с настройками пула и таймаутов.
+
+    Повторный вызов возвращает уже созданный клиент.
+
+    Returns:
+        AsyncIOMotorClient: Клиент MongoDB.
+    """
+    global client
+    if client is None:
+        client = AsyncIOMotorClient(
+            settings.mongo_uri,
+            maxPoolSize=settings.mongo_max_pool_size,
+            minPoolSize=settings.mongo_min_pool_size,
+            connectTimeoutMS=settings.mongo_connect_timeout_ms,
+            serverSelectionTimeoutMS=settings.mongo_server_selection_timeout_ms,
+            socketTimeoutMS=settings.mongo_socket_timeout_ms,
+        )
+    return client
+
+
+def close_mongo_connection() -> None:
+    """
+    Закрытие клиента MongoDB и освобождение пула соединений.
+    """
+    global client
+    if client is not None:
+        client.close()
+        client = None
+
+
+def get_database() -> AsyncIOMotorDatabase:
+    """
+    Получение базы данных приложения.
+
+    Returns:
+        AsyncIOMotorDatabase: База данных.
+
+    Raises:
+        RuntimeError: Если клиент MongoDB ещё не инициализирован.
+    """
+    if client is None:
+        raise RuntimeError("MongoDB client is not initialized")
+    return client[settings.mongo_db_name]
+
+
+async def ping_mongo(timeout: float = settings.health_check_timeout_seconds) -> None:
+    """
+    Проверка доступности MongoDB командой ping.
+
+    Args:
+        timeout (float): Максимальное время ожидания ответа (с).
+
+    Raises:
+        RuntimeError: Если клиент не создан или база не ответила вовремя.
+    """
+    try:
+        await asyncio.wait_for(get_database().command("ping"), timeout)
+    except asyncio.TimeoutError as te:
+        raise RuntimeError("MongoDB did not respond to ping in time") from te
+    except PyMongoError as pe:
+        raise RuntimeError(f"MongoDB ping failed: {pe}") from pe
+
+
+def get_car_collection() -> AsyncIOMotorCollection:
+    """
+    Получение коллекции автомобилей.
+
+    Returns:
+        AsyncIOMotorCollection: Коллекция cars.
+    """
+    return get_database().cars
+
+
+def get_registration_collection() -> AsyncIOMotorCollection:
+    """
+    Получение коллекции регистраций.
+
+    Returns:
+        AsyncIOMotorCollection: Коллекция registrations.
+    """
+    return get_database().registrations
+
+
+def get_users_collection() -> AsyncIOMotorCollection:
+    """
+    Получение коллекции пользователей.
+
+    Returns:
+        AsyncIOMotorCollection: Коллекция users.
+    """
+    return get_database().users
@@ -0,0 +1,9 @@
+from . import bus
+from . import change_streams
+from . import publisher
+
+__all__: list[str] = [
+    "bus",
+    "change_streams",
+    "publisher",
+]
@@ -0,0 +1,202 @@
+import asyncio
+from typing import Any, Dict, Iterable, Optional, Set
+from config import settings
+from metrics.registry import callback, counter
+
+EVENTS_PUBLISHED = counter(
+    "live_events_published_total",
+    "Live update events published to subscribers by collection and operation",
+    ("collection", "op"),
+)
+EVENTS_OVERFLOWS = counter(
+    "live_events_overflows_total",
+    "Subscriber queues that overflowed and were replaced by a resync event",
+)
+
+# Событие изменения: collection, op и данные операции
+Event = Dict[str, Any]
+
+
+def resync_event(collection: str) -> Event:
+    """
+    Событие, после которого клиент должен заново загрузить коллекцию.
+
+    Args:
+        collection (str): Имя коллекции.
+
+    Returns:
+        Event: Событие resync.
+    """
+    return {"collection": collection, "op": "resync"}
+
+
+class Subscription:
+    """
+    Подписка клиента на события выбранных коллекций.
+
+    Очередь ограничена: если клиент не успевает читать события, очередь
+    очищается и в неё кладётся resync — клиент перезагрузит данные вместо
+    того, чтобы сервер копил для него память.
+
+    Attributes:
+        collections (Set[str]): Коллекции, на которые оформлена подписка.
+        owner (str): Пользователь, открывший подписку.
+        closed (bool): Подписка закрыта сервером, поток нужно завершить.
+    """
+
+    def __init__(self, collections: Iterable[str], queue_size: int, owner: str = "") -> None:
+        self.collections: Set[str] = set(collections)
+        self.owner = owner
+        self.closed = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def put(self, event: Event) -> None:
+        """
+        Добавление события в очередь без ожидания.
+
+        Args:
+            event (Event): Событие.
+        """
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            EVENTS_OVERFLOWS.inc()
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            for collection in sorted(self.collections):
+                self._queue.put_nowait(resync_event(collection))
+
+    def close(self) -> None:
+        """
+        Закрытие подписки: ожидающий get сразу возвращает None.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self, timeout: float) -> Optional[Event]:
+        """
+        Ожидание следующего события.
+
+        Args:
+            timeout (float): Максимальное время ожидания (с).
+
+        Returns:
+            Optional[Event]: Событие или None, если за timeout событий не было
+                             или подписка закрыта.
+        """
+        if self.closed:
+            return None
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """
+    Внутрипроцессная шина событий изменения данных.
+
+    Публикация не блокирует: событие раскладывается по очередям
+    подписчиков соответствующей коллекции. При остановке сервера шина
+    закрывается, и потоки событий завершаются, не задерживая остановку.
+
+    Attributes:
+        closed (bool): Шина закрыта, новые подписки сразу закрываются.
+    """
+
+    def __init__(self, queue_size: int = settings.events_queue_size) -> None:
+        self.queue_size = queue_size
+        self.closed = False
+        self._subscriptions: Set[Subscription] = set()
+
+    def subscribe(self, collections: Iterable[str], owner: str = "") -> Subscription:
+        """
+        Оформление подписки.
+
+        Args:
+            collections (Iterable[str]): Коллекции.
+            owner (str): Пользователь, открывающий подписку.
+
+        Returns:
+            Subscription: Подписка.
+        """
+        subscription = Subscription(collections, self.queue_size, owner)
+        if self.closed:
+            subscription.close()
+        else:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Отмена подписки.
+
+        Args:
+            subscription (Subscription): Подписка.
+        """
+        self._subscriptions.discard(subscription)
+
+    def publish(self, event: Event) -> None:
+        """
+        Рассылка события подписчикам его коллекции.
+
+        Args:
+            event (Event): Событие.
+        """
+        EVENTS_PUBLISHED.inc(collection=event["collection"], op=event["op"])
+        for subscription in list(self._subscriptions):
+            if event["collection"] in subscription.collections:
+                subscription.put(event)
+
+    def close(self) -> None:
+        """
+        Закрытие шины и всех подписок.
+        """
+        self.closed = True
+        for subscription in list(self._subscriptions):
+            subscription.close()
+
+    def open(self) -> None:
+        """
+        Открытие шины при запуске приложения, в том числе повторном после
+        close в том же процессе.
+        """
+        self.closed = False
+
+    def subscriptions_of(self, owner: str) -> int:
+        """
+        Количество активных подписок пользователя.
+
+        Args:
+            owner (str): Пользователь.
+
+        Returns:
+            int: Число подписок.
+        """
+        return sum(1 for subscription in self._subscriptions if subscription.owner == owner)
+
+    @property
+    def subscribers(self) -> int:
+        """
+        Количество активных подписок.
+
+        Returns:
+            int: Число подписок.
+        """
+        return len(self._subscriptions)
+
+
+event_bus = EventBus()
+
+callback(
+    "live_events_subscribers",
+    "Clients currently subscribed to live update events",
+    "gauge",
+    lambda: event_bus.subscribers,
+)
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Mapping
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure, PyMongoError
+from config import settings
+from events.bus import Event, event_bus, resync_event
+from events.publisher import (
+    PUBLIC_FIELDS,
+    delete_event,
+    insert_event,
+    public_fields,
+    set_source,
+    update_event,
+)
+
+logger = logging.getLogger(__name__)
+
+# Код ошибки MongoDB: change stream недоступен (сервер без набора реплик)
+CHANGE_STREAMS_NOT_SUPPORTED_CODE = 40573
+
+
+async def enable_pre_images(database: AsyncIOMotorDatabase) -> None:
+    """
+    Включение сохранения прежней версии документов (MongoDB 6.0+).
+
+    Без неё событие удаления содержит только _id, и вместо точечного
+    удаления клиенту отправляется resync. Ошибки (старый сервер, нет прав)
+    не мешают работе.
+
+    Args:
+        database (AsyncIOMotorDatabase): База данных приложения.
+    """
+    for name in PUBLIC_FIELDS:
+        try:
+            await database.command("collMod", name, changeStreamPreAndPostImages={"enabled": True})
+        except PyMongoError as pe:
+            logger.debug("Pre-images are not enabled for %s: %s", name, pe)
+
+
+def change_to_events(change: Mapping[str, Any]) -> List[Event]:
+    """
+    Преобразование события change stream в события для клиентов.
+
+    Args:
+        change (Mapping[str, Any]): Событие change stream.
+
+    Returns:
+        List[Event]: События (пусто, если изменение не касается клиентов).
+    """
+    operation = change["operationType"]
+    collection = change.get("ns", {}).get("coll")
+    if operation in ("drop", "rename", "dropDatabase", "invalidate"):
+        return [resync_event(name) for name in PUBLIC_FIELDS]
+    if collection not in PUBLIC_FIELDS:
+        return []
+    fields = PUBLIC_FIELDS[collection]
+
+    if operation == "insert":
+        return [insert_event(collection, public_fields(change["fullDocument"], fields))]
+    if operation in ("update", "replace"):
+        document = change.get("fullDocument")
+        if document is None:
+            return []
+        return [update_event(collection, document["license_plate"], public_fields(document, fields))]
+    if operation == "delete":
+        before: Dict[str, Any] = change.get("fullDocumentBeforeChange") or {}
+        if "license_plate" in before:
+            return [delete_event(collection, before["license_plate"])]
+        return [resync_event(collection)]
+    return []
+
+
+async def watch_changes(
+        database: AsyncIOMotorDatabase, retry_seconds: float = settings.events_retry_seconds
+) -> None:
+    """
+    Трансляция изменений коллекций из change stream MongoDB в шину событий.
+
+    Пока change stream недоступен, события публикуют операции CRUD
+    этого процесса. Если сервер не поддерживает change stream (нет набора
+    реплик), задача завершается и остаётся внутрипроцессный режим; при
+    других ошибках подключение повторяется через retry_seconds.
+
+    Args:
+        database (AsyncIOMotorDatabase): База данных приложения.
+        retry_seconds (float): Пауза перед повторным подключением (с).
+    """
+    pipeline = [{"$match": {"ns.coll": {"$in": list(PUBLIC_FIELDS)}}}]
+    while True:
+        try:
+            await enable_pre_images(database)
+            async with database.watch(
+                pipeline,
+                full_document="updateLookup",
+                full_document_before_change="whenAvailable",
+            ) as stream:
+                set_source("change_stream")
+                logger.info("Live updates are fed by MongoDB change streams")
+                # Изменения, пришедшие до подключения, могли быть пропущены
+                for name in PUBLIC_FIELDS:
+                    event_bus.publish(resync_event(name))
+                async for change in stream:
+                    for event in change_to_events(change):
+                        event_bus.publish(event)
+        except OperationFailure as of:
+            if of.code == CHANGE_STREAMS_NOT_SUPPORTED_CODE:
+                logger.info("Change streams are not supported, using in-process events: %s", of)
+                set_source("local")
+                return
+            logger.warning("Change stream failed, using in-process events: %s", of)
+        except PyMongoError as pe:
+            logger.warning("Change stream unavailable, using in-process events: %s", pe)
+        set_source("local")
+        await asyncio.sleep(retry_seconds)
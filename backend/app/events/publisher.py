@@ -0,0 +1,114 @@
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+from config import settings
+from events.bus import Event, event_bus, resync_event
+from models.car import Car
+from models.registration import Registration
+
+# Коллекции с живыми обновлениями и их публичные поля
+PUBLIC_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "cars": tuple(Car.model_fields),
+    "registrations": tuple(Registration.model_fields),
+}
+
+# Источник событий: "local" — публикуют операции CRUD этого процесса,
+# "change_stream" — события приходят из change stream MongoDB
+source: str = "local"
+
+
+def set_source(value: str) -> None:
+    """
+    Переключение источника событий.
+
+    Args:
+        value (str): "local" или "change_stream".
+    """
+    global source
+    source = value
+
+
+def insert_event(collection: str, document: Mapping[str, Any]) -> Event:
+    """
+    Событие добавления документа.
+
+    Args:
+        collection (str): Имя коллекции.
+        document (Mapping[str, Any]): Публичные поля документа.
+
+    Returns:
+        Event: Событие insert.
+    """
+    return {
+        "collection": collection,
+        "op": "insert",
+        "license_plate": document["license_plate"],
+        "document": dict(document),
+    }
+
+
+def update_event(collection: str, license_plate: str, fields: Mapping[str, Any]) -> Event:
+    """
+    Событие изменения полей документа.
+
+    Args:
+        collection (str): Имя коллекции.
+        license_plate (str): Номерной знак документа.
+        fields (Mapping[str, Any]): Изменённые публичные поля.
+
+    Returns:
+        Event: Событие update.
+    """
+    return {
+        "collection": collection,
+        "op": "update",
+        "license_plate": license_plate,
+        "fields": dict(fields),
+    }
+
+
+def delete_event(collection: str, license_plate: str) -> Event:
+    """
+    Событие удаления документа.
+
+    Args:
+        collection (str): Имя коллекции.
+        license_plate (str): Номерной знак удалённого документа.
+
+    Returns:
+        Event: Событие delete.
+    """
+    return {"collection": collection, "op": "delete", "license_plate": license_plate}
+
+
+def public_fields(data: Mapping[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Отбор публичных полей документа или обновления.
+
+    Args:
+        data (Mapping[str, Any]): Документ или данные обновления.
+        fields (Iterable[str]): Публичные поля модели.
+
+    Returns:
+        Dict[str, Any]: Только публичные поля.
+    """
+    return {field: data[field] for field in fields if field in data}
+
+
+def publish_local(collection: str, events: List[Event]) -> None:
+    """
+    Публикация событий, вызванных записью в этом процессе.
+
+    Если события поставляет change stream, локальная публикация не нужна:
+    те же изменения придут из MongoDB. Слишком большой пакет событий
+    заменяется одним resync.
+
+    Args:
+        collection (str): Имя коллекции.
+        events (List[Event]): События.
+    """
+    if source != "local" or not events:
+        return
+    if len(events) > settings.events_max_deltas:
+        event_bus.publish(resync_event(collection))
+        return
+    for event in events:
+        event_bus.publish(event)
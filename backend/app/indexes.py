@@ -0,0 +1,125 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import ConnectionFailure, PyMongoError
+from database import get_database
+from search.tokens import TOKENS_KEY
+
+logger = logging.getLogger(__name__)
+
+# Описание индексов: коллекция -> список индексов
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    "cars": [
+        IndexModel([("license_plate", ASCENDING)], name="license_plate_unique", unique=True),
+        IndexModel([(TOKENS_KEY, ASCENDING)], name="search_tokens"),
+    ],
+    "registrations": [
+        IndexModel([("license_plate", ASCENDING)], name="license_plate_unique", unique=True),
+        IndexModel([(TOKENS_KEY, ASCENDING)], name="search_tokens"),
+    ],
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "analytics_days": [
+        IndexModel([("key", ASCENDING)], name="key_unique", unique=True),
+    ],
+}
+
+# Состояние построения индексов: "<коллекция>.<индекс>" -> описание
+index_status: Dict[str, Dict[str, Any]] = {}
+
+
+def _describe(collection: str, index: IndexModel) -> Dict[str, Any]:
+    """
+    Формирование начального описания индекса для отчёта о состоянии.
+
+    Args:
+        collection (str): Имя коллекции.
+        index (IndexModel): Описание индекса.
+
+    Returns:
+        Dict[str, Any]: Описание индекса со статусом "pending".
+    """
+    document = index.document
+    return {
+        "collection": collection,
+        "name": document["name"],
+        "keys": dict(document["key"]),
+        "unique": document.get("unique", False),
+        "status": "pending",
+        "error": None,
+        "finished_at": None,
+    }
+
+
+async def ensure_indexes() -> Dict[str, Dict[str, Any]]:
+    """
+    Идемпотентное создание всех индексов приложения.
+
+    Уже существующие индексы с теми же параметрами MongoDB пропускает.
+    Ошибка построения одного индекса (например, дубликаты в данных
+    для уникального индекса) не мешает построению остальных и
+    сохраняется в отчёте. При недоступности сервера оставшиеся
+    индексы сразу помечаются как не построенные.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Состояние построения каждого индекса.
+    """
+    for collection, indexes in INDEX_SPECS.items():
+        for index in indexes:
+            key = f"{collection}.{index.document['name']}"
+            index_status[key] = _describe(collection, index)
+
+    connection_error: Optional[str] = None
+    for collection, indexes in INDEX_SPECS.items():
+        for index in indexes:
+            status = index_status[f"{collection}.{index.document['name']}"]
+            try:
+                if connection_error is not None:
+                    raise ConnectionFailure(connection_error)
+                await get_database()[collection].create_indexes([index])
+                status["status"] = "ready"
+            except ConnectionFailure as ce:
+                connection_error = str(ce)
+                status["status"] = "failed"
+                status["error"] = connection_error
+            except (PyMongoError, RuntimeError) as e:
+                logger.error("Index build error for %s.%s: %s", collection, status["name"], e)
+                status["status"] = "failed"
+                status["error"] = str(e)
+            status["finished_at"] = datetime.utcnow().isoformat()
+    if connection_error is not None:
+        logger.error("Index build skipped, database is unavailable: %s", connection_error)
+    return index_status
+
+
+async def get_index_report(collection: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Отчёт о состоянии индексов с указанием их фактического наличия в базе.
+
+    Args:
+        collection (Optional[str]): Ограничить отчёт одной коллекцией.
+
+    Returns:
+        List[Dict[str, Any]]: Описания индексов с полем "present".
+
+    Raises:
+        RuntimeError: При ошибке взаимодействия с базой данных.
+    """
+    report = [
+        dict(status) for status in index_status.values()
+        if collection is None or status["collection"] == collection
+    ]
+    try:
+        present: Dict[str, set] = {}
+        for item in report:
+            name = item["collection"]
+            if name not in present:
+                info = await get_database()[name].index_information()
+                present[name] = set(info)
+            item["present"] = item["name"] in present[name]
+        return report
+    except PyMongoError as pe:
+        logger.error("Database error during index report: %s", pe)
+        raise RuntimeError("Database error occurred while reading indexes") from pe
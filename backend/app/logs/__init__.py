@@ -0,0 +1,11 @@
+from . import context
+from . import formatter
+from . import sampling
+from . import configuration
+
+__all__: list[str] = [
+    "context",
+    "formatter",
+    "sampling",
+    "configuration",
+]
@@ -0,0 +1,137 @@
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from config import settings
+from metrics.registry import callback
+from logs.context import request_id_var
+from logs.formatter import JsonFormatter
+from logs.sampling import SamplingFilter
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["DroppingQueueHandler"] = None
+_sampling_filter: Optional[SamplingFilter] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Добавление идентификатора текущего запроса в запись журнала.
+
+    Выполняется в потоке, создавшем запись, пока контекст запроса доступен.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Обработчик, передающий записи в очередь без блокировки.
+
+    Форматирование (включая трассировку исключений) выполняется в потоке
+    слушателя. При переполнении очереди запись отбрасывается и учитывается
+    в счётчике dropped.
+
+    Attributes:
+        dropped (int): Количество отброшенных из-за переполнения записей.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """
+    Разбор строки уровней логгеров вида "crud=WARNING,uvicorn.access=ERROR".
+
+    Args:
+        spec (str): Строка настроек.
+
+    Returns:
+        Dict[str, str]: Имя логгера -> уровень.
+    """
+    levels: Dict[str, str] = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging() -> None:
+    """
+    Настройка структурированного журналирования через очередь.
+
+    Корневой логгер получает один неблокирующий обработчик очереди;
+    запись в stdout выполняет отдельный поток QueueListener. Повторный
+    вызов ничего не делает.
+    """
+    global _listener, _queue_handler, _sampling_filter
+    if _listener is not None:
+        return
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(settings.log_queue_size)
+    queue_handler = DroppingQueueHandler(log_queue)
+    sampling_filter = SamplingFilter(
+        settings.log_sample_burst,
+        settings.log_sample_rate,
+        settings.log_sample_window_seconds,
+    )
+    queue_handler.addFilter(sampling_filter)
+    queue_handler.addFilter(RequestIdFilter())
+    _queue_handler, _sampling_filter = queue_handler, sampling_filter
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(settings.log_level.upper())
+    for name, level in parse_levels(settings.log_levels).items():
+        logging.getLogger(name).setLevel(level)
+    # Записи uvicorn тоже идут через очередь
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    Остановка потока слушателя с записью оставшихся в очереди записей.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+callback(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full",
+    "counter",
+    lambda: _queue_handler.dropped if _queue_handler else 0,
+)
+callback(
+    "log_records_sampled_out_total",
+    "Repeated log records suppressed by sampling",
+    "counter",
+    lambda: _sampling_filter.dropped if _sampling_filter else 0,
+)
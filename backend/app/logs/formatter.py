@@ -0,0 +1,35 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict
+import orjson
+
+# Стандартные атрибуты LogRecord, не попадающие в поле extra
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Форматирование записей журнала в одну строку JSON.
+
+    Поля: ts, level, logger, message, request_id, а также всё, что
+    передано через extra=..., и exception при наличии исключения.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode("utf-8")
@@ -0,0 +1,54 @@
+import logging
+import threading
+import time
+from typing import Dict, Tuple
+
+# Предел числа отслеживаемых шаблонов сообщений
+MAX_TRACKED_KEYS: int = 10000
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Выборочная запись повторяющихся сообщений.
+
+    Одинаковыми считаются записи одного логгера, уровня и шаблона
+    сообщения. В каждом окне первые burst записей проходят полностью,
+    далее — каждая rate-я; к пропущенной записи добавляется поле
+    sampled_out с числом отброшенных с прошлого раза. Так «шторм»
+    одинаковых ошибок не забивает очередь и вывод.
+
+    Attributes:
+        burst (int): Число записей, проходящих полностью в каждом окне.
+        rate (int): Период выборки после превышения burst.
+        window (float): Длина окна в секундах.
+        dropped (int): Всего отброшенных записей.
+    """
+
+    def __init__(self, burst: int, rate: int, window: float) -> None:
+        super().__init__()
+        self.burst = burst
+        self.rate = max(1, rate)
+        self.window = window
+        self.dropped = 0
+        self._lock = threading.Lock()
+        # ключ -> (начало окна, записей в окне, отброшено с последней пропущенной)
+        self._state: Dict[Tuple[str, int, str], Tuple[float, int, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._state and len(self._state) >= MAX_TRACKED_KEYS:
+                self._state.clear()
+            started, seen, suppressed = self._state.get(key, (now, 0, 0))
+            if now - started >= self.window:
+                started, seen = now, 0
+            seen += 1
+            if seen <= self.burst or (seen - self.burst) % self.rate == 0:
+                self._state[key] = (started, seen, 0)
+                if suppressed:
+                    record.sampled_out = suppressed
+                return True
+            self._state[key] = (started, seen, suppressed + 1)
+            self.dropped += 1
+            return False
@@ -1,11 +1,107 @@
-import os
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from routes import car_routes, registration_routes, auth_routes
+from routes import (
+    admin_routes,
+    analytics_routes,
+    auth_routes,
+    car_routes,
+    event_routes,
+    health_routes,
+    registration_routes,
+)
+from analytics.recompute import flush_days, run_recompute
+from events.bus import event_bus
+from storage.base import StorageError
+from storage.engines import create_engine, set_engine
+from security.hashing import hashing_pool
+from admission.middleware import ConcurrencyLimitMiddleware
+from metrics.middleware import MetricsMiddleware
+from logs.configuration import configure_logging, shutdown_logging
+from logs.context import RequestIdMiddleware
+from metrics.registry import REGISTRY
+from config import settings
+from shutdown import install_shutdown_hook
+from static_assets.handler import StaticAssets, asset_response
+from static_assets.store import AssetStore
+
+# Файлы фронтенда в памяти; загружаются при старте приложения
+static_store: AssetStore = AssetStore(settings.static_dir)
+
+
+def begin_shutdown() -> None:
+    """
+    Начало остановки процесса: /health/ready отвечает 503, потоки событий
+    завершаются.
+    """
+    health_routes.start_draining()
+    event_bus.close()
+
+
+def begin_startup() -> None:
+    """
+    Сброс состояния остановки, оставшегося от предыдущего запуска
+    приложения в том же процессе: /health/ready снова проверяет хранилище,
+    шина событий принимает подписки.
+    """
+    health_routes.stop_draining()
+    event_bus.open()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Жизненный цикл приложения: настройка журналирования, сброс состояния
+    остановки предыдущего запуска, загрузка фронтенда в память и запуск хранилища (для MongoDB — подключение,
+    создание индексов, фоновое заполнение поисковых полей и трансляция
+    change stream) и периодического пересчёта статистики при старте;
+    остановка хранилища, закрытие пула хэширования и журнала при остановке.
+
+    Выполняется в каждом рабочем процессе отдельно, поэтому клиент MongoDB
+    и пулы создаются уже после запуска (fork/spawn) процесса. Uvicorn
+    выполняет завершение lifespan только после того, как закрыл сокеты и
+    дождался запросов в обработке, поэтому /health/ready переводится в 503
+    и шина событий закрывается раньше — по сигналу остановки; сокеты
+    закрываются через settings.shutdown_drain_delay_seconds. Завершение
+    lifespan дожидается фоновых задач и освобождает ресурсы.
+
+    Args:
+        app (FastAPI): Экземпляр приложения.
+    """
+    configure_logging()
+    begin_startup()
+    static_store.load()
+    engine = create_engine()
+    await engine.start()
+    analytics_task = asyncio.create_task(run_recompute())
+    # Готовность и потоки событий переключаются по сигналу, до того как
+    # сервер закроет сокеты и начнёт ждать открытые соединения
+    install_shutdown_hook(begin_shutdown, settings.shutdown_drain_delay_seconds)
+    try:
+        yield
+    finally:
+        begin_shutdown()
+        analytics_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await analytics_task
+        # Прирост за дни, учтённый после последнего пересчёта, сохраняется
+        with contextlib.suppress(StorageError):
+            await flush_days()
+        await engine.stop()
+        set_engine(None)
+        hashing_pool.shutdown()
+        shutdown_logging()
+
 
-app: FastAPI = FastAPI()
+app: FastAPI = FastAPI(lifespan=lifespan)
+
+# Адаптивный лимит одновременных запросов вокруг роутеров; отклонённые
+# запросы проходят через CORS, метрики и идентификатор запроса
+app.add_middleware(ConcurrencyLimitMiddleware)
 
 # Разрешенные источники для CORS
 origins: list[str] = [
@@ -22,6 +118,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Сбор метрик по маршрутам: задержка, статусы, запросы в обработке
+app.add_middleware(MetricsMiddleware)
+# Идентификатор запроса для корреляции записей журнала (внешний слой)
+app.add_middleware(RequestIdMiddleware)
+
 # Подключение роутеров
 app.include_router(
     car_routes.router,
@@ -38,30 +139,64 @@ app.include_router(
     prefix="/auth",
     tags=["auth"]
 )
+app.include_router(
+    admin_routes.router,
+    prefix="/admin",
+    tags=["admin"]
+)
+app.include_router(
+    analytics_routes.router,
+    prefix="/analytics",
+    tags=["analytics"]
+)
+app.include_router(
+    event_routes.router,
+    prefix="/events",
+    tags=["events"]
+)
+app.include_router(
+    health_routes.router,
+    prefix="/health",
+    tags=["health"]
+)
 
-# Подключение статических файлов
+# Подключение статических файлов (раздаются из памяти)
 app.mount(
     "/static",
-    StaticFiles(directory="frontend"),
+    StaticAssets(static_store),
     name="static"
 )
 
 
 @app.get("/", response_class=HTMLResponse)
-async def read_root() -> HTMLResponse:
+async def read_root(request: Request) -> Response:
     """
     Обработчик для корневого маршрута.
 
+    Args:
+        request (Request): Запрос (для условных заголовков и Accept-Encoding).
+
     Returns:
-        HTMLResponse: Содержимое HTML-файла главной страницы.
+        Response: Содержимое HTML-файла главной страницы или 304.
     """
-    index_path: str = os.path.join("frontend", "html", "index.html")
-    try:
-        with open(index_path, "r", encoding="utf-8") as html_file:
-            content: str = html_file.read()
-        return HTMLResponse(content)
-    except FileNotFoundError:
+    asset = static_store.get("html/index.html")
+    if asset is None:
         return HTMLResponse(
             content="Главная HTML-страница не найдена.",
             status_code=404
         )
+    return asset_response(request, asset, versioned=False)
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """
+    Метрики приложения в текстовом формате Prometheus.
+
+    Returns:
+        PlainTextResponse: Текущие значения всех метрик.
+    """
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
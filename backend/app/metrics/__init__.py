@@ -0,0 +1,9 @@
+from . import instrumentation
+from . import middleware
+from . import registry
+
+__all__: list[str] = [
+    "instrumentation",
+    "middleware",
+    "registry",
+]
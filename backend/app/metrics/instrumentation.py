@@ -0,0 +1,61 @@
+import functools
+import inspect
+import time
+from typing import Any, Callable, TypeVar
+from metrics.registry import counter, histogram
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+CRUD_DURATION = histogram(
+    "crud_operation_duration_seconds",
+    "Duration of CRUD operations including MongoDB round-trips",
+    ("operation",),
+)
+CRUD_ERRORS = counter(
+    "crud_operation_errors_total",
+    "CRUD operations that raised an exception",
+    ("operation", "error"),
+)
+
+
+def timed_operation(operation: str) -> Callable[[F], F]:
+    """
+    Декоратор замера длительности и ошибок CRUD-функции.
+
+    Поддерживает корутины и асинхронные генераторы; для генераторов
+    измеряется время до полного прочтения результата.
+
+    Args:
+        operation (str): Имя операции в метках метрик (например, "car_crud.add_car").
+
+    Returns:
+        Callable[[F], F]: Декоратор.
+    """
+    def decorator(func: F) -> F:
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def generator_wrapper(*args: Any, **kwargs: Any) -> Any:
+                started = time.perf_counter()
+                try:
+                    async for item in func(*args, **kwargs):
+                        yield item
+                except Exception as e:
+                    CRUD_ERRORS.inc(operation=operation, error=type(e).__name__)
+                    raise
+                finally:
+                    CRUD_DURATION.observe(time.perf_counter() - started, operation=operation)
+            return generator_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                CRUD_ERRORS.inc(operation=operation, error=type(e).__name__)
+                raise
+            finally:
+                CRUD_DURATION.observe(time.perf_counter() - started, operation=operation)
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
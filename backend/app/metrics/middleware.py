@@ -0,0 +1,78 @@
+import time
+from typing import Any, Dict
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from metrics.registry import counter, gauge, histogram
+
+HTTP_REQUESTS = counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code",
+    ("method", "route", "status"),
+)
+HTTP_DURATION = histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template",
+    ("method", "route"),
+)
+HTTP_IN_FLIGHT = gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed",
+)
+
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """
+    Шаблон маршрута для меток метрик.
+
+    Используется шаблон пути (например, /carsdb/get_car/{license_plate}),
+    а не фактический путь, чтобы число рядов метрик не зависело от данных.
+
+    Args:
+        scope (Dict[str, Any]): ASGI scope после обработки запроса.
+
+    Returns:
+        str: Шаблон маршрута, "/static" для статики или "unmatched".
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    if scope.get("path", "").startswith("/static/"):
+        return "/static"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ASGI-промежуточный слой, собирающий задержку, статусы и число
+    одновременно обрабатываемых HTTP-запросов.
+
+    Время учитывается до отправки последнего фрагмента ответа, поэтому
+    потоковые ответы измеряются целиком.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = route_label(scope)
+            method = scope["method"]
+            HTTP_DURATION.observe(time.perf_counter() - started, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status))
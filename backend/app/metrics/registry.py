@@ -0,0 +1,400 @@
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Границы корзин гистограмм по умолчанию (секунды)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """
+    Экранирование значения метки для текстового формата Prometheus.
+
+    Args:
+        value (str): Значение метки.
+
+    Returns:
+        str: Экранированное значение.
+    """
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """
+    Форматирование набора меток.
+
+    Args:
+        names (Sequence[str]): Имена меток.
+        values (Sequence[str]): Значения меток.
+
+    Returns:
+        str: Метки в виде {a="1",b="2"} или пустая строка.
+    """
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    """
+    Форматирование числа для текстового формата Prometheus.
+
+    Args:
+        value (float): Значение.
+
+    Returns:
+        str: Текстовое представление.
+    """
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """
+    Базовый класс метрики с набором меток.
+
+    Attributes:
+        name (str): Имя метрики.
+        documentation (str): Описание метрики.
+        labelnames (Tuple[str, ...]): Имена меток.
+        kind (str): Тип метрики в формате Prometheus.
+    """
+    kind: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        """
+        Значения меток в порядке labelnames.
+
+        Args:
+            labels (Dict[str, str]): Метки.
+
+        Returns:
+            LabelValues: Кортеж значений.
+
+        Raises:
+            ValueError: Если набор меток не совпадает с объявленным.
+        """
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        """
+        Строки с текущими значениями метрики.
+
+        Returns:
+            List[str]: Строки текстового формата Prometheus.
+        """
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """
+    Монотонно возрастающий счётчик.
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """
+        Увеличение счётчика.
+
+        Args:
+            amount (float): Величина увеличения.
+            **labels (str): Значения меток.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """
+        Текущее значение счётчика.
+
+        Args:
+            **labels (str): Значения меток.
+
+        Returns:
+            float: Значение.
+        """
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(Metric):
+    """
+    Значение, которое может как расти, так и уменьшаться.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """
+        Установка значения.
+
+        Args:
+            value (float): Новое значение.
+            **labels (str): Значения меток.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """
+        Увеличение значения.
+
+        Args:
+            amount (float): Величина увеличения.
+            **labels (str): Значения меток.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """
+        Уменьшение значения.
+
+        Args:
+            amount (float): Величина уменьшения.
+            **labels (str): Значения меток.
+        """
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        """
+        Текущее значение.
+
+        Args:
+            **labels (str): Значения меток.
+
+        Returns:
+            float: Значение.
+        """
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(Metric):
+    """
+    Гистограмма распределения значений (обычно длительностей в секундах).
+
+    Attributes:
+        buckets (Tuple[float, ...]): Верхние границы корзин.
+    """
+    kind = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = (),
+            buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Учёт наблюдения.
+
+        Args:
+            value (float): Наблюдаемое значение.
+            **labels (str): Значения меток.
+        """
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * len(self.buckets)
+                self._sums[key] = 0.0
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._sums[key] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        lines = []
+        names = self.labelnames + ("le",)
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric(Metric):
+    """
+    Метрика без меток, значение которой вычисляется при каждом сборе.
+
+    Используется для показателей, которые уже ведутся в других
+    компонентах (пул хэширования, кэши).
+    """
+
+    def __init__(self, name: str, documentation: str, kind: str, func: Callable[[], float]) -> None:
+        super().__init__(name, documentation)
+        self.kind = kind
+        self._func = func
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {_format_value(float(self._func()))}"]
+
+
+class Registry:
+    """
+    Реестр метрик приложения.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Регистрация метрики.
+
+        Args:
+            metric (Metric): Метрика.
+
+        Returns:
+            Metric: Та же метрика.
+
+        Raises:
+            ValueError: Если метрика с таким именем уже зарегистрирована.
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Все метрики в текстовом формате Prometheus.
+
+        Returns:
+            str: Текст для ответа эндпоинта /metrics.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """
+    Создание и регистрация счётчика.
+
+    Args:
+        name (str): Имя метрики.
+        documentation (str): Описание.
+        labelnames (Sequence[str]): Имена меток.
+
+    Returns:
+        Counter: Счётчик.
+    """
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    """
+    Создание и регистрация измерителя.
+
+    Args:
+        name (str): Имя метрики.
+        documentation (str): Описание.
+        labelnames (Sequence[str]): Имена меток.
+
+    Returns:
+        Gauge: Измеритель.
+    """
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """
+    Создание и регистрация гистограммы.
+
+    Args:
+        name (str): Имя метрики.
+        documentation (str): Описание.
+        labelnames (Sequence[str]): Имена меток.
+        buckets (Iterable[float]): Верхние границы корзин.
+
+    Returns:
+        Histogram: Гистограмма.
+    """
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def callback(name: str, documentation: str, kind: str, func: Callable[[], float]) -> CallbackMetric:
+    """
+    Регистрация метрики, вычисляемой при сборе.
+
+    Args:
+        name (str): Имя метрики.
+        documentation (str): Описание.
+        kind (str): Тип метрики (gauge или counter).
+        func (Callable[[], float]): Функция получения значения.
+
+    Returns:
+        CallbackMetric: Метрика.
+    """
+    return REGISTRY.register(CallbackMetric(name, documentation, kind, func))
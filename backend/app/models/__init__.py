@@ -1,9 +1,13 @@
 from . import user
 from . import car
 from . import registration
+from . import validation
+from . import batch
 
 __all__: list[str] =[
     "user",
     "car",
     "registration",
+    "validation",
+    "batch",
 ]
@@ -0,0 +1,110 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, model_validator
+
+# Максимальное количество номерных знаков в одном пакетном запросе
+MAX_BATCH_PLATES: int = 10000
+
+
+class CarFilter(BaseModel):
+    """
+    Фильтр автомобилей для пакетных операций.
+
+    Attributes:
+        make (Optional[str]): Марка автомобиля.
+        model (Optional[str]): Модель автомобиля.
+        plate_prefix (Optional[str]): Префикс номерного знака.
+    """
+    make: Optional[str] = Field(None, description="Марка автомобиля")
+    model: Optional[str] = Field(None, description="Модель автомобиля")
+    plate_prefix: Optional[str] = Field(None, min_length=1, description="Префикс номерного знака")
+
+
+class RegistrationFilter(BaseModel):
+    """
+    Фильтр регистраций для пакетных операций.
+
+    Attributes:
+        owner_name (Optional[str]): Имя владельца.
+        plate_prefix (Optional[str]): Префикс номерного знака.
+        year_from (Optional[int]): Год выпуска от (включительно).
+        year_to (Optional[int]): Год выпуска до (включительно).
+    """
+    owner_name: Optional[str] = Field(None, description="Имя владельца")
+    plate_prefix: Optional[str] = Field(None, min_length=1, description="Префикс номерного знака")
+    year_from: Optional[int] = Field(None, description="Год выпуска от (включительно)")
+    year_to: Optional[int] = Field(None, description="Год выпуска до (включительно)")
+
+
+class _BatchTarget(BaseModel):
+    """
+    Цель пакетной операции: список номерных знаков либо фильтр.
+
+    Пустой фильтр не допускается, чтобы операция не затронула всю
+    коллекцию по ошибке.
+    """
+    license_plates: Optional[List[str]] = Field(
+        None,
+        min_length=1,
+        max_length=MAX_BATCH_PLATES,
+        description=f"Номерные знаки (не более {MAX_BATCH_PLATES})",
+    )
+
+    @model_validator(mode="after")
+    def validate_target(self) -> "_BatchTarget":
+        """
+        Проверяет, что задан ровно один способ выбора записей.
+
+        Returns:
+            _BatchTarget: Прошедший проверку запрос.
+
+        Raises:
+            ValueError: Если заданы оба способа, ни одного или пустой фильтр.
+        """
+        batch_filter = getattr(self, "filter", None)
+        if (self.license_plates is None) == (batch_filter is None):
+            raise ValueError("Exactly one of 'license_plates' or 'filter' must be given")
+        if batch_filter is not None and not batch_filter.model_dump(exclude_none=True):
+            raise ValueError("Filter must contain at least one condition")
+        return self
+
+
+class CarBatchDelete(_BatchTarget):
+    """
+    Запрос пакетного удаления автомобилей.
+
+    Attributes:
+        license_plates (Optional[List[str]]): Номерные знаки.
+        filter (Optional[CarFilter]): Фильтр автомобилей.
+    """
+    filter: Optional[CarFilter] = Field(None, description="Фильтр автомобилей")
+
+
+class CarBatchUpdate(CarBatchDelete):
+    """
+    Запрос пакетного обновления автомобилей.
+
+    Attributes:
+        update (Dict[str, Any]): Данные для обновления всех выбранных автомобилей.
+    """
+    update: Dict[str, Any] = Field(..., description="Данные для обновления")
+
+
+class RegistrationBatchDelete(_BatchTarget):
+    """
+    Запрос пакетного удаления регистраций.
+
+    Attributes:
+        license_plates (Optional[List[str]]): Номерные знаки.
+        filter (Optional[RegistrationFilter]): Фильтр регистраций.
+    """
+    filter: Optional[RegistrationFilter] = Field(None, description="Фильтр регистраций")
+
+
+class RegistrationBatchUpdate(RegistrationBatchDelete):
+    """
+    Запрос пакетного обновления регистраций.
+
+    Attributes:
+        update (Dict[str, Any]): Данные для обновления всех выбранных регистраций.
+    """
+    update: Dict[str, Any] = Field(..., description="Данные для обновления")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-import re
+from models.validation import CAR_PLATE_PATTERN, MAKE_PATTERN, MODEL_PATTERN, check_pattern
 
 
 class Car(BaseModel):
@@ -42,9 +42,7 @@ class Car(BaseModel):
         Raises:
             ValueError: Если значение содержит недопустимые символы.
         """
-        if not re.match(r"^[A-Za-z\s-]{1,50}$", value):
-            raise ValueError("Марка автомобиля содержит недопустимые символы.")
-        return value
+        return check_pattern(MAKE_PATTERN, value, "Марка автомобиля содержит недопустимые символы.")
 
     @field_validator("model")
     def validate_model(cls, value: str) -> str:
@@ -60,9 +58,7 @@ class Car(BaseModel):
         Raises:
             ValueError: Если значение содержит недопустимые символы.
         """
-        if not re.match(r"^[A-Za-z0-9\s-]{1,50}$", value):
-            raise ValueError("Модель автомобиля содержит недопустимые символы.")
-        return value
+        return check_pattern(MODEL_PATTERN, value, "Модель автомобиля содержит недопустимые символы.")
 
     @field_validator("license_plate")
     def validate_license_plate(cls, value: str) -> str:
@@ -78,6 +74,4 @@ class Car(BaseModel):
         Raises:
             ValueError: Если значение не соответствует формату номерного знака.
         """
-        if not re.match(r"^[A-Z0-9]{3,10}$", value):
-            raise ValueError("Номерной знак имеет некорректный формат.")
-        return value
+        return check_pattern(CAR_PLATE_PATTERN, value, "Номерной знак имеет некорректный формат.")
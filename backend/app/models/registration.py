@@ -1,6 +1,11 @@
 from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
-import re
+from models.validation import (
+    OWNER_ADDRESS_PATTERN,
+    OWNER_NAME_PATTERN,
+    REGISTRATION_PLATE_PATTERN,
+    check_pattern,
+)
 
 
 class Registration(BaseModel):
@@ -20,7 +25,6 @@ class Registration(BaseModel):
 
     license_plate: str = Field(
         ...,
-        pattern=r"^[A-Z0-9-]{1,10}$",
         description="Номерной знак автомобиля (до 10 символов)",
     )
     owner_name: str = Field(
@@ -56,11 +60,9 @@ class Registration(BaseModel):
         Raises:
             ValueError: Если имя содержит недопустимые символы.
         """
-        if not re.match(r"^[a-zA-Zа-яА-ЯёЁ\s\-]+$", value):
-            raise ValueError(
-                "Имя может содержать только буквы, пробелы и дефисы."
-            )
-        return value
+        return check_pattern(
+            OWNER_NAME_PATTERN, value, "Имя может содержать только буквы, пробелы и дефисы."
+        )
 
     @field_validator("owner_address")
     def validate_owner_address(cls, value: str) -> str:
@@ -76,11 +78,11 @@ class Registration(BaseModel):
         Raises:
             ValueError: Если адрес содержит недопустимые символы.
         """
-        if not re.match(r"^[А-Яа-яЁёA-Za-z0-9\s.,\-\\/]+$", value):
-            raise ValueError(
-                "Адрес может содержать только буквы, цифры и символы: ., - \/"
-            )
-        return value
+        return check_pattern(
+            OWNER_ADDRESS_PATTERN,
+            value,
+            "Адрес может содержать только буквы, цифры и символы: ., - \/",
+        )
 
     @field_validator("license_plate")
     def validate_license_plate(cls, value: str) -> str:
@@ -96,9 +98,8 @@ class Registration(BaseModel):
         Raises:
             ValueError: Если номерной знак содержит недопустимые символы.
         """
-        pattern = r"^[A-Z0-9-]{1,10}$"
-        if not re.match(pattern, value):
-            raise ValueError(
-                "Номерной знак должен содержать только заглавные буквы, цифры и/или дефисы (до 10 символов)."
-            )
-        return value
+        return check_pattern(
+            REGISTRATION_PLATE_PATTERN,
+            value,
+            "Номерной знак должен содержать только заглавные буквы, цифры и/или дефисы (до 10 символов).",
+        )
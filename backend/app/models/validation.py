@@ -0,0 +1,134 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Pattern, Sequence, Tuple, Type, TypeVar
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# Шаблоны полей компилируются один раз при импорте модуля
+MAKE_PATTERN: Pattern[str] = re.compile(r"^[A-Za-z\s-]{1,50}$")
+MODEL_PATTERN: Pattern[str] = re.compile(r"^[A-Za-z0-9\s-]{1,50}$")
+CAR_PLATE_PATTERN: Pattern[str] = re.compile(r"^[A-Z0-9]{3,10}$")
+REGISTRATION_PLATE_PATTERN: Pattern[str] = re.compile(r"^[A-Z0-9-]{1,10}$")
+OWNER_NAME_PATTERN: Pattern[str] = re.compile(r"^[a-zA-Zа-яА-ЯёЁ\s\-]+$")
+OWNER_ADDRESS_PATTERN: Pattern[str] = re.compile(r"^[А-Яа-яЁёA-Za-z0-9\s.,\-\\/]+$")
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def check_pattern(pattern: Pattern[str], value: str, message: str) -> str:
+    """
+    Проверка значения поля по скомпилированному шаблону.
+
+    Args:
+        pattern (Pattern[str]): Шаблон поля.
+        value (str): Проверяемое значение.
+        message (str): Текст ошибки.
+
+    Returns:
+        str: Значение без изменений.
+
+    Raises:
+        ValueError: Если значение не соответствует шаблону.
+    """
+    if pattern.match(value) is None:
+        raise ValueError(message)
+    return value
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """
+    Валидатор списка моделей (строится один раз для каждой модели).
+
+    Args:
+        model (Type[BaseModel]): Модель элементов списка.
+
+    Returns:
+        TypeAdapter: Валидатор List[model].
+    """
+    return TypeAdapter(List[model])
+
+
+def format_error(loc: Sequence[Any], msg: str) -> str:
+    """
+    Краткое описание ошибки валидации поля.
+
+    Args:
+        loc (Sequence[Any]): Путь к полю.
+        msg (str): Сообщение pydantic.
+
+    Returns:
+        str: "поле: сообщение" или только сообщение, если путь пуст.
+    """
+    return f"{'.'.join(str(part) for part in loc)}: {msg}" if loc else msg
+
+
+def validate_batch(
+        model: Type[ModelT], rows: Sequence[Tuple[int, Any]]
+) -> Tuple[List[Tuple[int, ModelT]], List[Dict[str, Any]]]:
+    """
+    Валидация пакета строк одной моделью за один проход.
+
+    Пакет проверяется валидатором List[model]: цикл по строкам выполняется
+    в ядре pydantic, а не в Python. Если в пакете есть ошибки, они
+    группируются по строкам, а оставшиеся строки проверяются ещё одним
+    проходом.
+
+    Args:
+        model (Type[ModelT]): Модель для валидации.
+        rows (Sequence[Tuple[int, Any]]): Номера строк и данные.
+
+    Returns:
+        Tuple[List[Tuple[int, ModelT]], List[Dict[str, Any]]]: Валидные модели
+            с номерами строк и ошибки {"row", "error"} в порядке строк.
+    """
+    adapter = _list_adapter(model)
+    try:
+        models = adapter.validate_python([data for _, data in rows])
+        return [(number, item) for (number, _), item in zip(rows, models)], []
+    except ValidationError as ve:
+        failed: Dict[int, List[str]] = {}
+        for item in ve.errors():
+            index, *loc = item["loc"]
+            failed.setdefault(index, []).append(format_error(loc, item["msg"]))
+
+    remaining = [row for index, row in enumerate(rows) if index not in failed]
+    models = adapter.validate_python([data for _, data in remaining])
+    valid = [(number, item) for (number, _), item in zip(remaining, models)]
+    errors = [
+        {"row": rows[index][0], "error": "; ".join(messages)}
+        for index, messages in sorted(failed.items())
+    ]
+    return valid, errors
+
+
+def validate_update(model: Type[BaseModel], update_data: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Проверка изменяемых полей записи по её модели.
+
+    Каждое поле проверяется теми же правилами, что и при создании записи,
+    поэтому обновление не может сохранить значение другого типа
+    (например, null вместо года выпуска).
+
+    Args:
+        model (Type[BaseModel]): Модель записи.
+        update_data (Mapping[str, Any]): Данные для обновления.
+
+    Returns:
+        Dict[str, Any]: Данные для обновления с приведёнными значениями.
+
+    Raises:
+        ValueError: Если поле отсутствует в модели или значение не проходит проверку.
+    """
+    instance = model.model_construct()
+    validated: Dict[str, Any] = {}
+    for field, value in update_data.items():
+        if field not in model.model_fields:
+            raise ValueError(f"Unknown field: {field}")
+        try:
+            model.__pydantic_validator__.validate_assignment(instance, field, value)
+        except ValidationError as ve:
+            raise ValueError(
+                "; ".join(format_error(item["loc"], item["msg"]) for item in ve.errors())
+            ) from None
+        validated[field] = getattr(instance, field)
+    return validated
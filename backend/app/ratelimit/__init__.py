@@ -0,0 +1,7 @@
+from . import limiter
+from . import stores
+
+__all__: list[str] = [
+    "limiter",
+    "stores",
+]
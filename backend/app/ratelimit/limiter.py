@@ -0,0 +1,123 @@
+import math
+from typing import Awaitable, Callable, Dict, Tuple
+from fastapi import Depends, HTTPException, Request
+from config import settings
+from metrics.registry import counter
+from ratelimit.stores import get_bucket_store
+from security.dependencies import get_current_user
+
+# Классы маршрутов с отдельными лимитами: корзины разных классов не
+# зависят друг от друга, поэтому поток дорогих запросов не расходует
+# лимит дешёвых
+ROUTE_CLASSES: Tuple[str, ...] = ("auth", "read", "search", "write", "bulk")
+
+RATE_LIMIT_REJECTIONS = counter(
+    "rate_limit_rejections_total",
+    "Requests rejected with 429 by route class",
+    ("route_class",),
+)
+
+# Зависимость FastAPI, проверяющая лимит запроса
+RateLimitDependency = Callable[..., Awaitable[None]]
+
+
+def parse_limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Разбор строки лимитов вида "search=60/10,bulk=5/60" (запросов за секунд).
+
+    Args:
+        spec (str): Строка настроек.
+
+    Returns:
+        Dict[str, Tuple[float, float]]: Класс маршрутов -> ёмкость корзины и
+                                        скорость пополнения (токенов в секунду).
+
+    Raises:
+        ValueError: Если класс неизвестен или лимит задан неверно.
+    """
+    limits: Dict[str, Tuple[float, float]] = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, limit = (part.strip() for part in item.split("=", 1))
+        if name not in ROUTE_CLASSES:
+            raise ValueError(f"Unknown rate limit class: {name}")
+        requests, _, seconds = limit.partition("/")
+        capacity, period = float(requests), float(seconds or 1)
+        if capacity <= 0 or period <= 0:
+            raise ValueError(f"Invalid rate limit for {name}: {limit}")
+        limits[name] = (capacity, capacity / period)
+    return limits
+
+
+LIMITS: Dict[str, Tuple[float, float]] = parse_limits(settings.rate_limits)
+
+
+async def check_rate_limit(route_class: str, identity: str) -> None:
+    """
+    Списание запроса из корзины клиента для класса маршрутов.
+
+    Args:
+        route_class (str): Класс маршрутов.
+        identity (str): Клиент: пользователь из токена или адрес.
+
+    Raises:
+        HTTPException: 429 с заголовком Retry-After, если лимит исчерпан.
+    """
+    limit = LIMITS.get(route_class)
+    if not settings.rate_limit_enabled or limit is None:
+        return
+    capacity, rate = limit
+    wait = await get_bucket_store().take(f"{route_class}:{identity}", capacity, rate)
+    if wait > 0:
+        RATE_LIMIT_REJECTIONS.inc(route_class=route_class)
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests, retry later",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
+
+
+def rate_limit(route_class: str) -> RateLimitDependency:
+    """
+    Зависимость маршрута, ограничивающая частоту запросов.
+
+    Запросы класса auth выполняются до входа и считаются по адресу
+    клиента, остальные — по пользователю из токена (токен проверяется
+    один раз: FastAPI переиспользует результат get_current_user в
+    обработчике).
+
+    Args:
+        route_class (str): Класс маршрутов из ROUTE_CLASSES.
+
+    Returns:
+        RateLimitDependency: Зависимость для параметра dependencies маршрута.
+
+    Raises:
+        ValueError: Если класс маршрутов неизвестен.
+    """
+    if route_class not in ROUTE_CLASSES:
+        raise ValueError(f"Unknown rate limit class: {route_class}")
+
+    if route_class == "auth":
+        async def by_client(request: Request) -> None:
+            await check_rate_limit(route_class, request.client.host if request.client else "")
+        return by_client
+
+    async def by_user(user: str = Depends(get_current_user)) -> None:
+        await check_rate_limit(route_class, user)
+    return by_user
+
+
+def rate_limit_listing() -> RateLimitDependency:
+    """
+    Зависимость маршрута списка записей: страница (задан limit) считается
+    чтением, полный список без limit — пакетной операцией.
+
+    Returns:
+        RateLimitDependency: Зависимость для параметра dependencies маршрута.
+    """
+    async def by_user(request: Request, user: str = Depends(get_current_user)) -> None:
+        route_class = "read" if "limit" in request.query_params else "bulk"
+        await check_rate_limit(route_class, user)
+    return by_user
@@ -0,0 +1,108 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+from config import settings
+
+
+class BucketStore(ABC):
+    """
+    Интерфейс хранилища корзин токенов (token bucket).
+
+    Проверка и списание выполняются одной операцией, чтобы общее для
+    нескольких процессов хранилище (например, Redis со скриптом Lua)
+    можно было подключить без гонок между процессами.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        """
+        Списание токенов из корзины.
+
+        Корзина пополняется на rate токенов в секунду до capacity; новая
+        корзина заполнена полностью.
+
+        Args:
+            key (str): Ключ корзины.
+            capacity (float): Ёмкость корзины (допустимый всплеск запросов).
+            rate (float): Скорость пополнения (токенов в секунду).
+            cost (float): Стоимость запроса в токенах.
+
+        Returns:
+            float: 0, если токены списаны, иначе через сколько секунд их
+                   станет достаточно.
+        """
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """
+        Статистика хранилища.
+
+        Returns:
+            Dict[str, Any]: Значения метрик.
+        """
+
+
+class MemoryBucketStore(BucketStore):
+    """
+    Внутрипроцессное хранилище корзин.
+
+    Количество корзин ограничено: вытесняется корзина, к которой дольше
+    всего не обращались (её владелец снова получает полную корзину).
+
+    Attributes:
+        max_buckets (int): Максимальное количество корзин.
+    """
+
+    def __init__(self, max_buckets: int) -> None:
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.evictions = 0
+
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+        wait = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_buckets:
+            self._buckets.popitem(last=False)
+            self.evictions += 1
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "buckets": len(self._buckets),
+            "max_buckets": self.max_buckets,
+            "evictions": self.evictions,
+        }
+
+
+_store: BucketStore = MemoryBucketStore(settings.rate_limit_max_buckets)
+
+
+def get_bucket_store() -> BucketStore:
+    """
+    Получение текущего хранилища корзин.
+
+    Returns:
+        BucketStore: Хранилище корзин.
+    """
+    return _store
+
+
+def set_bucket_store(store: BucketStore) -> None:
+    """
+    Подключение другого хранилища корзин (например, общего для процессов).
+
+    Args:
+        store (BucketStore): Новое хранилище.
+    """
+    global _store
+    _store = store
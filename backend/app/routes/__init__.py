@@ -1,9 +1,17 @@
+from . import admin_routes
+from . import analytics_routes
 from . import auth_routes
 from . import car_routes
+from . import event_routes
+from . import health_routes
 from . import registration_routes
 
 __all__: list[str] = [
+    "admin_routes",
+    "analytics_routes",
     "auth_routes",
     "car_routes",
+    "event_routes",
+    "health_routes",
     "registration_routes",
 ]
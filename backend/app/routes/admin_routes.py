@@ -0,0 +1,156 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Dict, Optional
+from admission.limiter import concurrency_limiter
+from cache.backends import get_cache_backend
+from cache.read_through import cache_enabled
+from cache.single_flight import single_flight
+from ratelimit.limiter import LIMITS
+from ratelimit.stores import get_bucket_store
+from security.dependencies import get_admin_user
+from security.hashing import hashing_pool
+from security.token_cache import token_cache
+from storage.engines import get_engine
+
+router = APIRouter()
+
+
+@router.get(
+    "/indexes",
+    responses={
+        200: {"description": "Index build status returned"},
+        403: {"description": "User is not an administrator"},
+        500: {"description": "Unexpected error while reading indexes"},
+    },
+)
+async def indexes_status(
+        collection: Optional[str] = None, user: str = Depends(get_admin_user)
+) -> Dict[str, Any]:
+    """
+    Состояние построения индексов, созданных при старте приложения.
+
+    Args:
+        collection (Optional[str]): Имя коллекции для фильтрации отчёта.
+        user (str): ID администратора (из токена).
+
+    Returns:
+        Dict[str, Any]: Список индексов со статусом построения.
+
+    Raises:
+        HTTPException: При ошибке обращения к базе данных.
+    """
+    try:
+        return {"indexes": await get_engine().index_report(collection)}
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
+
+
+@router.get(
+    "/hashing",
+    responses={
+        200: {"description": "Password hashing pool metrics returned"},
+        403: {"description": "User is not an administrator"},
+    },
+)
+async def hashing_status(user: str = Depends(get_admin_user)) -> Dict[str, Any]:
+    """
+    Метрики пула хэширования паролей: загрузка, очередь и время bcrypt.
+
+    Args:
+        user (str): ID администратора (из токена).
+
+    Returns:
+        Dict[str, Any]: Метрики пула.
+    """
+    return {"hashing": hashing_pool.stats()}
+
+
+@router.get(
+    "/token_cache",
+    responses={
+        200: {"description": "Verified-token cache statistics returned"},
+        403: {"description": "User is not an administrator"},
+    },
+)
+async def token_cache_status(user: str = Depends(get_admin_user)) -> Dict[str, Any]:
+    """
+    Статистика кэша проверенных JWT-токенов.
+
+    Args:
+        user (str): ID администратора (из токена).
+
+    Returns:
+        Dict[str, Any]: Размер кэша, попадания, промахи и вытеснения.
+    """
+    return {"token_cache": token_cache.stats()}
+
+
+@router.get(
+    "/cache",
+    responses={
+        200: {"description": "Read-through cache statistics returned"},
+        403: {"description": "User is not an administrator"},
+    },
+)
+async def cache_status(user: str = Depends(get_admin_user)) -> Dict[str, Any]:
+    """
+    Статистика кэша чтения автомобилей и регистраций и объединения
+    одинаковых одновременных чтений.
+
+    Args:
+        user (str): ID администратора (из токена).
+
+    Returns:
+        Dict[str, Any]: Доля попаданий, вытеснения, размер кэша и признак
+                        его использования; загрузки и объединённые запросы
+                        single-flight.
+    """
+    return {
+        "cache": {**get_cache_backend().stats(), "enabled": cache_enabled()},
+        "single_flight": single_flight.stats(),
+    }
+
+
+@router.get(
+    "/rate_limits",
+    responses={
+        200: {"description": "Rate limits and token bucket store statistics returned"},
+        403: {"description": "User is not an administrator"},
+    },
+)
+async def rate_limits_status(user: str = Depends(get_admin_user)) -> Dict[str, Any]:
+    """
+    Лимиты классов маршрутов и статистика хранилища корзин токенов.
+
+    Args:
+        user (str): ID администратора (из токена).
+
+    Returns:
+        Dict[str, Any]: Ёмкость и скорость пополнения по классам и метрики хранилища.
+    """
+    return {
+        "limits": {
+            route_class: {"capacity": capacity, "per_second": round(rate, 4)}
+            for route_class, (capacity, rate) in LIMITS.items()
+        },
+        "store": get_bucket_store().stats(),
+    }
+
+
+@router.get(
+    "/concurrency",
+    responses={
+        200: {"description": "Adaptive concurrency limiter state returned"},
+        403: {"description": "User is not an administrator"},
+    },
+)
+async def concurrency_status(user: str = Depends(get_admin_user)) -> Dict[str, Any]:
+    """
+    Состояние адаптивного ограничителя одновременных запросов.
+
+    Args:
+        user (str): ID администратора (из токена).
+
+    Returns:
+        Dict[str, Any]: Текущий лимит, запросы в обработке и доли приоритетов.
+    """
+    return {"concurrency": concurrency_limiter.stats()}
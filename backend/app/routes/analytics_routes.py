@@ -0,0 +1,138 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, Dict, Optional
+from analytics.aggregates import GROUPINGS, aggregates
+from analytics.recompute import recompute
+from config import settings
+from ratelimit.limiter import rate_limit
+from security.dependencies import get_admin_user, get_current_user
+from storage.base import StorageError
+
+router = APIRouter()
+
+
+@router.get(
+    "/summary",
+    responses={
+        200: {"description": "Collection totals and growth returned"},
+    },
+)
+async def summary(
+        days: int = Query(7, ge=1, le=settings.analytics_growth_days),
+        user: str = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """
+    Количество автомобилей и регистраций и их прирост за последние дни.
+
+    Args:
+        days (int): Длина периода прироста в днях, включая текущий.
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        Dict[str, Any]: totals, growth по коллекциям и время последнего пересчёта.
+    """
+    return {
+        "totals": {collection: aggregates.total(collection) for collection in GROUPINGS},
+        "growth": {collection: aggregates.growth(collection, days) for collection in GROUPINGS},
+        "recomputed_at": aggregates.recomputed_at,
+    }
+
+
+@router.get(
+    "/cars/makes",
+    responses={
+        200: {"description": "Car counts per make returned"},
+    },
+)
+async def cars_by_make(
+        limit: Optional[int] = Query(None, ge=1),
+        user: str = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """
+    Количество автомобилей по маркам.
+
+    Args:
+        limit (Optional[int]): Максимальное количество марок.
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        Dict[str, Any]: Марки с количеством автомобилей по убыванию.
+    """
+    return {"makes": aggregates.groups("cars", "make", limit=limit)}
+
+
+@router.get(
+    "/cars/models",
+    responses={
+        200: {"description": "Car counts per make and model returned"},
+    },
+)
+async def cars_by_model(
+        make: Optional[str] = None,
+        limit: Optional[int] = Query(None, ge=1),
+        user: str = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """
+    Количество автомобилей по маркам и моделям.
+
+    Args:
+        make (Optional[str]): Ограничить моделями одной марки.
+        limit (Optional[int]): Максимальное количество моделей.
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        Dict[str, Any]: Пары марка-модель с количеством автомобилей по убыванию.
+    """
+    where = {"make": make} if make is not None else None
+    return {"models": aggregates.groups("cars", "model", where, limit)}
+
+
+@router.get(
+    "/registrations/years",
+    responses={
+        200: {"description": "Registration counts per year of manufacture returned"},
+    },
+)
+async def registrations_by_year(user: str = Depends(get_current_user)) -> Dict[str, Any]:
+    """
+    Количество регистраций по году выпуска автомобиля.
+
+    Args:
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        Dict[str, Any]: Годы выпуска с количеством регистраций по возрастанию года.
+    """
+    years = aggregates.groups("registrations", "year")
+    years.sort(key=lambda row: row["year_of_manufacture"] or 0)
+    return {"years": years}
+
+
+@router.post(
+    "/recompute",
+    dependencies=[Depends(rate_limit("bulk"))],
+    responses={
+        200: {"description": "Aggregates recomputed from storage"},
+        403: {"description": "User is not an administrator"},
+        500: {"description": "Database error while recomputing"},
+    },
+)
+async def recompute_view(user: str = Depends(get_admin_user)) -> Dict[str, Any]:
+    """
+    Немедленный полный пересчёт статистики по данным хранилища.
+
+    Args:
+        user (str): ID администратора (из токена).
+
+    Returns:
+        Dict[str, Any]: Количество исправленных счётчиков и время пересчёта.
+
+    Raises:
+        HTTPException: При ошибке обращения к базе данных.
+    """
+    try:
+        drift = await recompute()
+    except StorageError as se:
+        raise HTTPException(
+            status_code=500, detail="Database error occurred while recomputing analytics"
+        ) from se
+    return {"drift": drift, "recomputed_at": aggregates.recomputed_at}
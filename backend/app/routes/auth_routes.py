@@ -1,9 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends, Form
 from crud.auth_crud import register_user_crud, login_user_crud
 from models.user import UserCreate, UserLogin
-from security.jwt import decode_access_token
+from ratelimit.limiter import rate_limit
+from security.hashing import HashingPoolSaturated
+from security.dependencies import decode_access_token_cached
 from fastapi.security import OAuth2PasswordBearer
-import traceback
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -11,10 +15,12 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 @router.post(
     "/register",
+    dependencies=[Depends(rate_limit("auth"))],
     responses={
         200: {"description": "User was successfully registered."},
         400: {"description": "Validation error (e.g., passwords mismatch or email already registered)."},
         500: {"description": "Unexpected error during registration."},
+        503: {"description": "Password hashing pool is saturated, retry later."},
     },
 )
 async def register_user(user: UserCreate) -> dict:
@@ -37,19 +43,23 @@ async def register_user(user: UserCreate) -> dict:
         return await register_user_crud(user)
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
+    except HashingPoolSaturated as hs:
+        raise HTTPException(status_code=503, detail=str(hs), headers={"Retry-After": "1"})
     except RuntimeError as re:
         raise HTTPException(status_code=500, detail=str(re))
     except Exception:
-        print(f"Unexpected error during registration: {traceback.format_exc()}")
+        logger.exception("Unexpected error during registration")
         raise HTTPException(status_code=500, detail="Unexpected error during registration")
 
 
 @router.post(
     "/login",
+    dependencies=[Depends(rate_limit("auth"))],
     responses={
         200: {"description": "User authenticated successfully. JWT token returned."},
         401: {"description": "Invalid credentials provided."},
         500: {"description": "Unexpected error during login."},
+        503: {"description": "Password hashing pool is saturated, retry later."},
     },
 )
 async def login_user(
@@ -77,10 +87,12 @@ async def login_user(
         return await login_user_crud(user_data)
     except ValueError as ve:
         raise HTTPException(status_code=401, detail=str(ve))
+    except HashingPoolSaturated as hs:
+        raise HTTPException(status_code=503, detail=str(hs), headers={"Retry-After": "1"})
     except RuntimeError as re:
         raise HTTPException(status_code=500, detail=str(re))
     except Exception:
-        print(f"Unexpected error during login: {traceback.format_exc()}")
+        logger.exception("Unexpected error during login")
         raise HTTPException(status_code=500, detail="Unexpected error during login")
 
 
@@ -106,12 +118,12 @@ async def protected_route(token: str = Depends(oauth2_scheme)) -> dict:
         HTTPException: Если токен недействителен, истек или произошла другая ошибка.
     """
     try:
-        payload = decode_access_token(token)
-        if not payload:
+        payload = decode_access_token_cached(token)
+        if not payload or "scope" in payload:
             raise HTTPException(status_code=401, detail="Invalid or expired token")
         return {"msg": f"Hello, {payload.get('sub')}!"}
     except HTTPException as he:
         raise he
     except Exception:
-        print(f"Unexpected error during token decoding: {traceback.format_exc()}")
+        logger.exception("Unexpected error during token decoding")
         raise HTTPException(status_code=500, detail="Unexpected error occurred during token verification")
@@ -1,43 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+import orjson
 from models.car import Car
+from models.batch import CarBatchDelete, CarBatchUpdate, CarFilter
 from crud.car_crud import (
     add_car,
+    add_cars_bulk,
     delete_car_by_license_plate,
-    get_all_cars,
+    delete_cars_batch,
+    get_car_by_license_plate,
+    get_cars_page,
+    get_cars_with_registrations_page,
+    iter_car_documents,
+    iter_cars,
+    lookup_cars_with_registrations,
     search_cars,
     update_car_by_license_plate,
+    update_cars_batch,
 )
-from security.jwt import decode_access_token
-from typing import Dict, Any
+from crud.batch import summarize_results
+from bulk.exporter import (
+    EXPORT_FIELDS,
+    MEDIA_TYPES,
+    SUPPORTED_FORMATS,
+    build_filter,
+    export_stream,
+    json_list_stream,
+    select_fields,
+)
+from bulk.importer import detect_format, import_file
+from search.engine import DEFAULT_LIMIT, MAX_LIMIT
+from ratelimit.limiter import rate_limit, rate_limit_listing
+from security.dependencies import get_current_user
+from typing import AsyncIterator, Dict, Any, List, Optional
+
+# Максимальное количество номеров в одном пакетном запросе
+MAX_LOOKUP_PLATES = 1000
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+router = APIRouter()
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
+def batch_filter_query(batch_filter: Optional[CarFilter]) -> Optional[Dict[str, Any]]:
     """
-    Получение текущего пользователя на основе переданного токена.
+    Преобразование фильтра пакетной операции в фильтр MongoDB.
 
     Args:
-        token (str): OAuth2 токен пользователя.
+        batch_filter (Optional[CarFilter]): Фильтр из запроса.
 
     Returns:
-        str: Идентификатор пользователя.
-
-    Raises:
-        HTTPException: Если токен недействителен или истек.
+        Optional[Dict[str, Any]]: Фильтр MongoDB или None, если фильтр не задан.
     """
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
-    return payload.get("sub")
-
-
-router = APIRouter()
+    if batch_filter is None:
+        return None
+    return build_filter(
+        {"make": batch_filter.make, "model": batch_filter.model}, batch_filter.plate_prefix
+    )
 
 
 @router.put(
     "/update_car/{license_plate}",
+    dependencies=[Depends(rate_limit("write"))],
     responses={
         200: {"description": "Car was successfully updated"},
         400: {
@@ -79,36 +101,44 @@ async def update_car_view(
 
 @router.get(
     "/search_cars/",
+    dependencies=[Depends(rate_limit("search"))],
+    response_class=ORJSONResponse,
     responses={
         200: {"description": "Cars searched successfully. Results returned."},
         500: {"description": "Unexpected error occurred while searching cars"},
     },
 )
-async def search_cars_view(query: str, user: str = Depends(get_current_user)) -> Dict[str, Any]:
+async def search_cars_view(
+        query: str,
+        limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT, description="Максимум результатов"),
+        user: str = Depends(get_current_user),
+) -> ORJSONResponse:
     """
     Поиск автомобилей по марке, модели или номерному знаку.
 
     Args:
         query (str): Запрос для поиска.
+        limit (int): Максимальное количество результатов.
         user (str): ID текущего пользователя (из токена).
 
     Returns:
-        Dict[str, Any]: Найденные автомобили и данные текущего пользователя.
+        ORJSONResponse: Найденные автомобили и данные текущего пользователя.
 
     Raises:
         HTTPException: При возникновении ошибки.
     """
     try:
-        cars = await search_cars(query)
+        cars = await search_cars(query, limit)
         if not cars:
-            return {"cars": [], "message": "No cars found matching the query."}
-        return {"cars": cars, "user": user}
+            return ORJSONResponse({"cars": [], "message": "No cars found matching the query."})
+        return ORJSONResponse({"cars": cars, "user": user})
     except RuntimeError as re:
         raise HTTPException(status_code=500, detail=str(re))
 
 
 @router.post(
     "/add_car/",
+    dependencies=[Depends(rate_limit("write"))],
     responses={
         200: {"description": "Car successfully added"},
         400: {"description": "Validation error (e.g., duplicate license plate)"},
@@ -140,6 +170,7 @@ async def add_car_view(car: Car, user: str = Depends(get_current_user)) -> Dict[
 
 @router.delete(
     "/delete_car/{license_plate}",
+    dependencies=[Depends(rate_limit("write"))],
     responses={
         200: {"description": "Car successfully deleted"},
         404: {"description": "Car not found"},
@@ -171,26 +202,365 @@ async def delete_car_view(license_plate: str, user: str = Depends(get_current_us
 
 @router.get(
     "/get_cars/",
+    dependencies=[Depends(rate_limit_listing())],
+    response_class=ORJSONResponse,
     responses={
         200: {"description": "All cars successfully retrieved"},
         500: {"description": "Unexpected error during cars retrieval"},
     },
 )
-async def get_cars(user: str = Depends(get_current_user)) -> Dict[str, Any]:
+async def get_cars(
+        limit: Optional[int] = Query(None, ge=1, le=1000, description="Размер страницы"),
+        after: Optional[str] = Query(None, description="Номерной знак, после которого начинается страница"),
+        user: str = Depends(get_current_user),
+) -> Response:
+    """
+    Получение автомобилей.
+
+    Без параметра limit весь список пишется в ответ потоком по мере
+    чтения курсора (память сервера не растёт с размером коллекции), с
+    ним — возвращается страница, упорядоченная по номерному знаку, и
+    курсор next_after для следующей.
+    Документы сериализуются orjson напрямую, без повторной валидации
+    моделью Car и без jsonable_encoder.
+
+    Args:
+        limit (Optional[int]): Размер страницы.
+        after (Optional[str]): Курсор (номерной знак) предыдущей страницы.
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        Response: Список автомобилей (поток или страница) и данные пользователя.
+
+    Raises:
+        HTTPException: При возникновении ошибки.
+    """
+    if limit is None:
+        return StreamingResponse(
+            json_list_stream("cars", iter_cars(), {"user": user}),
+            media_type="application/json",
+        )
+    try:
+        cars, next_after = await get_cars_page(limit, after)
+        return ORJSONResponse({"cars": cars, "next_after": next_after, "user": user})
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
+
+
+@router.get(
+    "/stream_cars/",
+    dependencies=[Depends(rate_limit("bulk"))],
+    responses={
+        200: {"description": "Cars streamed as NDJSON"},
+    },
+)
+async def stream_cars(user: str = Depends(get_current_user)) -> StreamingResponse:
+    """
+    Потоковая выгрузка всех автомобилей в формате NDJSON.
+
+    Каждая строка ответа — JSON-объект автомобиля; документы пишутся
+    в ответ по мере чтения курсора, поэтому память сервера не растёт
+    вместе с размером коллекции.
+
+    Args:
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        StreamingResponse: Поток NDJSON.
+    """
+    async def lines() -> AsyncIterator[bytes]:
+        async for car in iter_cars():
+            yield orjson.dumps(car) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/import_cars/",
+    dependencies=[Depends(rate_limit("bulk"))],
+    responses={
+        200: {"description": "File processed, per-row error report returned"},
+        400: {"description": "Unsupported or malformed file"},
+        500: {"description": "Unexpected error during import"},
+    },
+)
+async def import_cars_view(
+        file: UploadFile = File(..., description="CSV с заголовком или NDJSON"),
+        file_format: Optional[str] = Query(None, alias="format", description="csv или ndjson"),
+        user: str = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """
+    Массовый импорт автомобилей из CSV или NDJSON.
+
+    Файл разбирается потоково, строки валидируются моделью Car
+    пакетами и записываются неупорядоченным insert_many.
+
+    Args:
+        file (UploadFile): Загружаемый файл.
+        file_format (Optional[str]): Формат файла; по умолчанию определяется по имени.
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        Dict[str, Any]: Отчёт об импорте с ошибками по строкам.
+
+    Raises:
+        HTTPException: Если формат файла не поддерживается или произошла ошибка на сервере.
+    """
+    try:
+        fmt = detect_format(file.filename, file.content_type, file_format)
+        report = await import_file(file.file, fmt, Car, add_cars_bulk)
+        return {**report, "user": user}
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
+
+
+@router.get(
+    "/export_cars/",
+    dependencies=[Depends(rate_limit("bulk"))],
+    responses={
+        200: {"description": "Cars streamed in the requested format"},
+        400: {"description": "Unsupported format or unknown fields"},
+    },
+)
+async def export_cars_view(
+        file_format: str = Query("csv", alias="format", description="csv или ndjson"),
+        fields: Optional[str] = Query(None, description="Поля через запятую"),
+        make: Optional[str] = Query(None, description="Фильтр по марке"),
+        model: Optional[str] = Query(None, description="Фильтр по модели"),
+        plate_prefix: Optional[str] = Query(None, description="Префикс номерного знака"),
+        compress: bool = Query(False, description="Сжатие ответа gzip"),
+        user: str = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Потоковая выгрузка автомобилей в CSV или NDJSON.
+
+    Документы читаются из курсора MongoDB с проекцией только запрошенных
+    полей и пишутся в ответ фрагментами, поэтому память сервера не зависит
+    от объёма выгрузки.
+
+    Args:
+        file_format (str): Формат выгрузки.
+        fields (Optional[str]): Выгружаемые поля.
+        make (Optional[str]): Фильтр по марке.
+        model (Optional[str]): Фильтр по модели.
+        plate_prefix (Optional[str]): Префикс номерного знака.
+        compress (bool): Сжимать ли ответ gzip.
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        StreamingResponse: Поток выгрузки.
+
+    Raises:
+        HTTPException: Если формат не поддерживается или запрошены неизвестные поля.
+    """
+    if file_format not in SUPPORTED_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {file_format}")
+    try:
+        selected = select_fields(fields, EXPORT_FIELDS["cars"])
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    query = build_filter({"make": make, "model": model}, plate_prefix)
+    headers = {"Content-Disposition": f'attachment; filename="cars.{file_format}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_stream(iter_car_documents(query, selected), selected, file_format, compress),
+        media_type=MEDIA_TYPES[file_format],
+        headers=headers,
+    )
+
+
+@router.get(
+    "/get_cars_with_registrations/",
+    dependencies=[Depends(rate_limit("read"))],
+    response_class=ORJSONResponse,
+    responses={
+        200: {"description": "Page of cars joined with their registrations"},
+        500: {"description": "Unexpected error during cars retrieval"},
+    },
+)
+async def get_cars_with_registrations(
+        limit: int = Query(100, ge=1, le=1000, description="Размер страницы"),
+        after: Optional[str] = Query(None, description="Номерной знак, после которого начинается страница"),
+        user: str = Depends(get_current_user),
+) -> ORJSONResponse:
     """
-    Получение всех автомобилей.
+    Получение страницы автомобилей вместе с регистрациями.
+
+    Заменяет отдельный поиск регистрации для каждого автомобиля:
+    вся страница собирается одним запросом агрегации.
 
     Args:
+        limit (int): Размер страницы.
+        after (Optional[str]): Курсор (номерной знак) предыдущей страницы.
         user (str): ID текущего пользователя (из токена).
 
     Returns:
-        Dict[str, Any]: Список всех автомобилей и данные пользователя.
+        ORJSONResponse: Автомобили с регистрациями и курсор next_after.
 
     Raises:
         HTTPException: При возникновении ошибки.
     """
     try:
-        cars = await get_all_cars()
-        return {"cars": cars, "user": user}
+        cars, next_after = await get_cars_with_registrations_page(limit, after)
+        return ORJSONResponse({"cars": cars, "next_after": next_after, "user": user})
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
+
+
+@router.post(
+    "/lookup_cars/",
+    dependencies=[Depends(rate_limit("search"))],
+    response_class=ORJSONResponse,
+    responses={
+        200: {"description": "Cars with registrations for the given plates"},
+        400: {"description": "Too many license plates in one request"},
+        500: {"description": "Unexpected error during cars lookup"},
+    },
+)
+async def lookup_cars_view(
+        license_plates: List[str] = Body(..., embed=True, description="Номерные знаки"),
+        user: str = Depends(get_current_user),
+) -> ORJSONResponse:
+    """
+    Пакетный поиск автомобилей с регистрациями по списку номерных знаков.
+
+    Args:
+        license_plates (List[str]): Номерные знаки (не более MAX_LOOKUP_PLATES).
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        ORJSONResponse: Найденные автомобили и номера, которых нет в базе.
+
+    Raises:
+        HTTPException: При превышении размера пакета или ошибке сервера.
+    """
+    if len(license_plates) > MAX_LOOKUP_PLATES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_LOOKUP_PLATES} license plates per request",
+        )
+    try:
+        cars = await lookup_cars_with_registrations(license_plates)
+        found = {car["license_plate"] for car in cars}
+        missing = [plate for plate in dict.fromkeys(license_plates) if plate not in found]
+        return ORJSONResponse({"cars": cars, "missing": missing, "user": user})
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
+
+
+@router.get(
+    "/get_car/{license_plate}",
+    dependencies=[Depends(rate_limit("read"))],
+    responses={
+        200: {"description": "Car returned"},
+        404: {"description": "Car not found"},
+        500: {"description": "Unexpected error during car retrieval"},
+    },
+)
+async def get_car_view(license_plate: str, user: str = Depends(get_current_user)) -> Dict[str, Any]:
+    """
+    Получение автомобиля по номерному знаку.
+
+    Args:
+        license_plate (str): Номерной знак автомобиля.
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        Dict[str, Any]: Автомобиль и данные пользователя.
+
+    Raises:
+        HTTPException: Если автомобиль не найден или произошла ошибка.
+    """
+    try:
+        car = await get_car_by_license_plate(license_plate)
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
+    if car is None:
+        raise HTTPException(status_code=404, detail="Car not found")
+    return {"car": car, "user": user}
+
+
+@router.post(
+    "/update_cars/",
+    dependencies=[Depends(rate_limit("bulk"))],
+    response_class=ORJSONResponse,
+    responses={
+        200: {"description": "Batch processed, per-plate results returned"},
+        400: {"description": "Validation error (e.g., license plate modification not allowed)"},
+        500: {"description": "Unexpected error during batch update"},
+    },
+)
+async def update_cars_batch_view(
+        batch: CarBatchUpdate, user: str = Depends(get_current_user)
+) -> ORJSONResponse:
+    """
+    Пакетное обновление автомобилей по списку номерных знаков или по фильтру.
+
+    Args:
+        batch (CarBatchUpdate): Номерные знаки или фильтр и данные для обновления.
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        ORJSONResponse: Итоги по статусам и результат по каждому номеру.
+
+    Raises:
+        HTTPException: При ошибке валидации или ошибке сервера.
+    """
+    try:
+        results = await update_cars_batch(
+            batch.license_plates, batch_filter_query(batch.filter), batch.update
+        )
+        return ORJSONResponse({
+            "requested": len(results),
+            "summary": summarize_results(results),
+            "results": results,
+            "user": user,
+        })
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
+
+
+@router.post(
+    "/delete_cars/",
+    dependencies=[Depends(rate_limit("bulk"))],
+    response_class=ORJSONResponse,
+    responses={
+        200: {"description": "Batch processed, per-plate results returned"},
+        400: {"description": "Filter matches too many records"},
+        500: {"description": "Unexpected error during batch deletion"},
+    },
+)
+async def delete_cars_batch_view(
+        batch: CarBatchDelete, user: str = Depends(get_current_user)
+) -> ORJSONResponse:
+    """
+    Пакетное удаление автомобилей по списку номерных знаков или по фильтру.
+
+    Args:
+        batch (CarBatchDelete): Номерные знаки или фильтр.
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        ORJSONResponse: Итоги по статусам и результат по каждому номеру.
+
+    Raises:
+        HTTPException: При слишком широком фильтре или ошибке сервера.
+    """
+    try:
+        results = await delete_cars_batch(batch.license_plates, batch_filter_query(batch.filter))
+        return ORJSONResponse({
+            "requested": len(results),
+            "summary": summarize_results(results),
+            "results": results,
+            "user": user,
+        })
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except RuntimeError as re:
         raise HTTPException(status_code=500, detail=str(re))
@@ -0,0 +1,128 @@
+from typing import Any, AsyncIterator, Dict, List
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from config import settings
+from events import publisher
+from events.bus import event_bus
+from events.publisher import PUBLIC_FIELDS
+from security.dependencies import create_stream_ticket, get_current_user, get_stream_user
+
+router = APIRouter()
+
+
+def check_live_updates() -> None:
+    """
+    Проверка, что поток событий видит изменения всех рабочих процессов.
+
+    Локальная шина получает только записи своего процесса; без change
+    stream MongoDB при нескольких процессах клиент молча пропускал бы
+    чужие изменения, поэтому поток в таком режиме не предоставляется.
+
+    Raises:
+        HTTPException: Если события локальные, а процессов несколько.
+    """
+    if publisher.source == "local" and settings.workers > 1:
+        raise HTTPException(
+            status_code=503,
+            detail="Live updates require MongoDB change streams when running several workers",
+        )
+
+
+@router.post(
+    "/ticket",
+    responses={
+        200: {"description": "Short-lived ticket for the event stream issued"},
+        401: {"description": "Invalid or expired token"},
+        503: {"description": "Live updates are not available in this deployment"},
+    },
+)
+async def stream_ticket(user: str = Depends(get_current_user)) -> Dict[str, Any]:
+    """
+    Выдача билета для подключения к потоку событий.
+
+    Args:
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        Dict[str, Any]: Билет и время его жизни в секундах.
+
+    Raises:
+        HTTPException: Если поток событий недоступен.
+    """
+    check_live_updates()
+    return {"ticket": create_stream_ticket(user), "expires_in": settings.events_ticket_seconds}
+
+
+@router.get(
+    "/stream",
+    responses={
+        200: {"description": "Server-sent events with incremental changes"},
+        400: {"description": "Unknown collection requested"},
+        401: {"description": "Invalid or expired ticket"},
+        429: {"description": "Too many open event streams for the user"},
+        503: {"description": "Live updates are not available in this deployment"},
+    },
+)
+async def stream_events(
+        request: Request,
+        collections: str = Query(",".join(PUBLIC_FIELDS), description="Коллекции через запятую"),
+        user: str = Depends(get_stream_user),
+) -> StreamingResponse:
+    """
+    Поток изменений коллекций в формате Server-Sent Events.
+
+    Каждое сообщение — JSON-событие: insert (document), update (fields),
+    delete (license_plate) или resync (клиенту нужно перезагрузить
+    коллекцию). Пустые сообщения-комментарии поддерживают соединение.
+    Подключение выполняется по билету из /events/ticket. При остановке
+    сервера шина событий закрывается и поток завершается.
+
+    Args:
+        request (Request): Запрос (для отслеживания отключения клиента).
+        collections (str): Коллекции, события которых нужны клиенту.
+        user (str): ID текущего пользователя (из билета).
+
+    Returns:
+        StreamingResponse: Поток text/event-stream.
+
+    Raises:
+        HTTPException: Если запрошена неизвестная коллекция, у пользователя
+                       слишком много открытых потоков или поток недоступен.
+    """
+    check_live_updates()
+    selected: List[str] = [name.strip() for name in collections.split(",") if name.strip()]
+    unknown = sorted(set(selected) - set(PUBLIC_FIELDS))
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"Unknown collections: {', '.join(unknown)}")
+
+    # Каждый поток держит соединение и очередь событий, поэтому число
+    # потоков одного пользователя ограничено, как и частота его запросов
+    if event_bus.subscriptions_of(user) >= settings.events_max_streams_per_user:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many open event streams",
+            headers={"Retry-After": str(int(settings.events_heartbeat_seconds))},
+        )
+    subscription = event_bus.subscribe(selected, user)
+
+    async def messages() -> AsyncIterator[bytes]:
+        try:
+            # Клиент переподключается через 3 секунды после разрыва
+            yield b"retry: 3000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(settings.events_heartbeat_seconds)
+                if subscription.closed:
+                    break
+                if event is None:
+                    yield b": keep-alive\n\n"
+                else:
+                    yield b"data: " + orjson.dumps(event) + b"\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        messages(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,76 @@
+import logging
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from config import settings
+from storage.engines import get_engine
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Процесс завершается: новые запросы балансировщику лучше не направлять
+draining: bool = False
+
+
+def start_draining() -> None:
+    """
+    Перевод процесса в режим завершения: /health/ready начинает отвечать 503.
+
+    Вызывается по сигналу остановки, пока процесс ещё принимает запросы
+    (см. main.begin_shutdown).
+    """
+    global draining
+    draining = True
+
+
+def stop_draining() -> None:
+    """
+    Выход из режима завершения при запуске приложения (lifespan может
+    запускаться в процессе повторно).
+    """
+    global draining
+    draining = False
+
+
+@router.get(
+    "/live",
+    responses={
+        200: {"description": "Process is alive"},
+    },
+)
+async def liveness() -> dict:
+    """
+    Проверка живости процесса: цикл событий отвечает на запросы.
+
+    Returns:
+        dict: Статус процесса.
+    """
+    return {"status": "ok"}
+
+
+@router.get(
+    "/ready",
+    responses={
+        200: {"description": "Worker is ready to serve requests"},
+        503: {"description": "Database is unreachable or the worker is shutting down"},
+    },
+)
+async def readiness() -> JSONResponse:
+    """
+    Проверка готовности процесса принимать запросы.
+
+    Процесс готов, если он не завершается и хранилище отвечает на ping.
+
+    Returns:
+        JSONResponse: Статус готовности (200 или 503).
+    """
+    if draining:
+        return JSONResponse({"status": "draining"}, status_code=503)
+    try:
+        await get_engine().ping(settings.health_check_timeout_seconds)
+    except RuntimeError as re:
+        logger.warning("Readiness check failed: %s", re)
+        return JSONResponse(
+            {"status": "unavailable", "detail": "Database is unreachable"}, status_code=503
+        )
+    return JSONResponse({"status": "ok"})
@@ -1,42 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from typing import AsyncIterator, Dict, Any, Optional
+import orjson
 from models.registration import Registration
+from models.batch import RegistrationBatchDelete, RegistrationBatchUpdate, RegistrationFilter
 from crud.registration_crud import (
     add_registration,
-    get_all_registrations,
+    add_registrations_bulk,
+    get_registration_by_license_plate,
+    get_registrations_page,
+    iter_registration_documents,
+    iter_registrations,
     delete_registration_by_license_plate,
+    delete_registrations_batch,
     search_registrations,
     update_registration_by_license_plate,
+    update_registrations_batch,
 )
-from security.jwt import decode_access_token
-from fastapi.security import OAuth2PasswordBearer
-
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+from crud.batch import summarize_results
+from bulk.exporter import (
+    EXPORT_FIELDS,
+    MEDIA_TYPES,
+    SUPPORTED_FORMATS,
+    build_filter,
+    export_stream,
+    json_list_stream,
+    select_fields,
+)
+from bulk.importer import detect_format, import_file
+from search.engine import DEFAULT_LIMIT, MAX_LIMIT
+from ratelimit.limiter import rate_limit, rate_limit_listing
+from security.dependencies import get_current_user
 
 router = APIRouter()
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
+def batch_filter_query(batch_filter: Optional[RegistrationFilter]) -> Optional[Dict[str, Any]]:
     """
-    Получение текущего пользователя на основе переданного токена.
+    Преобразование фильтра пакетной операции в фильтр MongoDB.
 
     Args:
-        token (str): OAuth2 токен пользователя.
+        batch_filter (Optional[RegistrationFilter]): Фильтр из запроса.
 
     Returns:
-        str: Идентификатор пользователя.
-
-    Raises:
-        HTTPException: Если токен недействителен или истек.
+        Optional[Dict[str, Any]]: Фильтр MongoDB или None, если фильтр не задан.
     """
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
-    return payload.get("sub")
+    if batch_filter is None:
+        return None
+    return build_filter(
+        {"owner_name": batch_filter.owner_name},
+        batch_filter.plate_prefix,
+        {"year_of_manufacture": (batch_filter.year_from, batch_filter.year_to)},
+    )
 
 
 @router.put(
     "/update_registration/{license_plate}",
+    dependencies=[Depends(rate_limit("write"))],
     responses={
         200: {"description": "Registration was successfully updated"},
         400: {"description": "Validation error (e.g., license plate modification not allowed)"},
@@ -78,38 +98,46 @@ async def update_registration_view(
 
 @router.get(
     "/search_registrations/",
+    dependencies=[Depends(rate_limit("search"))],
+    response_class=ORJSONResponse,
     responses={
         200: {"description": "Registrations searched successfully. Results returned."},
         500: {"description": "Unexpected error during registrations search"},
     },
 )
 async def search_registrations_view(
-        query: str, user: str = Depends(get_current_user)
-) -> Dict[str, Any]:
+        query: str,
+        limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT, description="Максимум результатов"),
+        user: str = Depends(get_current_user),
+) -> ORJSONResponse:
     """
     Поиск регистраций.
 
     Args:
         query (str): Запрос для поиска регистраций.
+        limit (int): Максимальное количество результатов.
         user (str): Текущий пользователь, извлеченный из токена (определяется через Depends).
 
     Returns:
-        Dict[str, Any]: Найденные регистрации и сообщение о статусе поиска.
+        ORJSONResponse: Найденные регистрации и сообщение о статусе поиска.
 
     Raises:
         HTTPException: Если произошла ошибка на сервере.
     """
     try:
-        registrations = await search_registrations(query)
+        registrations = await search_registrations(query, limit)
         if not registrations:
-            return {"registrations": [], "message": "No registrations found matching the query."}
-        return {"registrations": registrations}
+            return ORJSONResponse(
+                {"registrations": [], "message": "No registrations found matching the query."}
+            )
+        return ORJSONResponse({"registrations": registrations})
     except RuntimeError as re:
         raise HTTPException(status_code=500, detail=str(re))
 
 
 @router.post(
     "/add_registration/",
+    dependencies=[Depends(rate_limit("write"))],
     responses={
         200: {"description": "Registration successfully added"},
         400: {"description": "Validation error (e.g., duplicate license plate)"},
@@ -143,33 +171,83 @@ async def add_registration_view(
 
 @router.get(
     "/get_registrations/",
+    dependencies=[Depends(rate_limit_listing())],
+    response_class=ORJSONResponse,
     responses={
         200: {"description": "All registrations successfully retrieved"},
         500: {"description": "Unexpected error during registrations retrieval"},
     },
 )
-async def get_registrations(user: str = Depends(get_current_user)) -> Dict[str, Any]:
+async def get_registrations(
+        limit: Optional[int] = Query(None, ge=1, le=1000, description="Размер страницы"),
+        after: Optional[str] = Query(None, description="Номерной знак, после которого начинается страница"),
+        user: str = Depends(get_current_user),
+) -> Response:
     """
-    Получение всех регистраций.
+    Получение регистраций.
+
+    Без параметра limit весь список пишется в ответ потоком по мере
+    чтения курсора (память сервера не растёт с размером коллекции), с
+    ним — возвращается страница, упорядоченная по номерному знаку, и
+    курсор next_after для следующей.
+    Документы сериализуются orjson напрямую, без повторной валидации
+    моделью Registration и без jsonable_encoder.
 
     Args:
+        limit (Optional[int]): Размер страницы.
+        after (Optional[str]): Курсор (номерной знак) предыдущей страницы.
         user (str): Текущий пользователь, извлеченный из токена (определяется через Depends).
 
     Returns:
-        Dict[str, Any]: Список всех регистраций.
+        Response: Список регистраций (поток или страница).
 
     Raises:
         HTTPException: Если произошла ошибка на сервере.
     """
+    if limit is None:
+        return StreamingResponse(
+            json_list_stream("registrations", iter_registrations(), {"user": user}),
+            media_type="application/json",
+        )
     try:
-        registrations = await get_all_registrations()
-        return {"registrations": registrations, "user": user}
+        registrations, next_after = await get_registrations_page(limit, after)
+        return ORJSONResponse(
+            {"registrations": registrations, "next_after": next_after, "user": user}
+        )
     except RuntimeError as re:
         raise HTTPException(status_code=500, detail=str(re))
 
 
+@router.get(
+    "/stream_registrations/",
+    dependencies=[Depends(rate_limit("bulk"))],
+    responses={
+        200: {"description": "Registrations streamed as NDJSON"},
+    },
+)
+async def stream_registrations(user: str = Depends(get_current_user)) -> StreamingResponse:
+    """
+    Потоковая выгрузка всех регистраций в формате NDJSON.
+
+    Каждая строка ответа — JSON-объект регистрации; документы пишутся
+    в ответ по мере чтения курсора.
+
+    Args:
+        user (str): Текущий пользователь, извлеченный из токена (определяется через Depends).
+
+    Returns:
+        StreamingResponse: Поток NDJSON.
+    """
+    async def lines() -> AsyncIterator[bytes]:
+        async for registration in iter_registrations():
+            yield orjson.dumps(registration) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.delete(
     "/delete_registration/{license_plate}",
+    dependencies=[Depends(rate_limit("write"))],
     responses={
         200: {"description": "Registration successfully deleted"},
         404: {"description": "Registration not found"},
@@ -199,3 +277,225 @@ async def delete_registration_view(
         raise HTTPException(status_code=404, detail=str(ve))
     except RuntimeError as re:
         raise HTTPException(status_code=500, detail=str(re))
+
+
+@router.post(
+    "/import_registrations/",
+    dependencies=[Depends(rate_limit("bulk"))],
+    responses={
+        200: {"description": "File processed, per-row error report returned"},
+        400: {"description": "Unsupported or malformed file"},
+        500: {"description": "Unexpected error during import"},
+    },
+)
+async def import_registrations_view(
+        file: UploadFile = File(..., description="CSV с заголовком или NDJSON"),
+        file_format: Optional[str] = Query(None, alias="format", description="csv или ndjson"),
+        user: str = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """
+    Массовый импорт регистраций из CSV или NDJSON.
+
+    Файл разбирается потоково, строки валидируются моделью Registration
+    пакетами и записываются неупорядоченным insert_many.
+
+    Args:
+        file (UploadFile): Загружаемый файл.
+        file_format (Optional[str]): Формат файла; по умолчанию определяется по имени.
+        user (str): Текущий пользователь, извлеченный из токена (определяется через Depends).
+
+    Returns:
+        Dict[str, Any]: Отчёт об импорте с ошибками по строкам.
+
+    Raises:
+        HTTPException: Если формат файла не поддерживается или произошла ошибка на сервере.
+    """
+    try:
+        fmt = detect_format(file.filename, file.content_type, file_format)
+        report = await import_file(file.file, fmt, Registration, add_registrations_bulk)
+        return {**report, "user": user}
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
+
+
+@router.get(
+    "/export_registrations/",
+    dependencies=[Depends(rate_limit("bulk"))],
+    responses={
+        200: {"description": "Registrations streamed in the requested format"},
+        400: {"description": "Unsupported format or unknown fields"},
+    },
+)
+async def export_registrations_view(
+        file_format: str = Query("csv", alias="format", description="csv или ndjson"),
+        fields: Optional[str] = Query(None, description="Поля через запятую"),
+        owner_name: Optional[str] = Query(None, description="Фильтр по имени владельца"),
+        plate_prefix: Optional[str] = Query(None, description="Префикс номерного знака"),
+        year_from: Optional[int] = Query(None, description="Год выпуска от (включительно)"),
+        year_to: Optional[int] = Query(None, description="Год выпуска до (включительно)"),
+        compress: bool = Query(False, description="Сжатие ответа gzip"),
+        user: str = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Потоковая выгрузка регистраций в CSV или NDJSON.
+
+    Документы читаются из курсора MongoDB с проекцией только запрошенных
+    полей и пишутся в ответ фрагментами, поэтому память сервера не зависит
+    от объёма выгрузки.
+
+    Args:
+        file_format (str): Формат выгрузки.
+        fields (Optional[str]): Выгружаемые поля.
+        owner_name (Optional[str]): Фильтр по имени владельца.
+        plate_prefix (Optional[str]): Префикс номерного знака.
+        year_from (Optional[int]): Нижняя граница года выпуска.
+        year_to (Optional[int]): Верхняя граница года выпуска.
+        compress (bool): Сжимать ли ответ gzip.
+        user (str): Текущий пользователь, извлеченный из токена (определяется через Depends).
+
+    Returns:
+        StreamingResponse: Поток выгрузки.
+
+    Raises:
+        HTTPException: Если формат не поддерживается или запрошены неизвестные поля.
+    """
+    if file_format not in SUPPORTED_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {file_format}")
+    try:
+        selected = select_fields(fields, EXPORT_FIELDS["registrations"])
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    query = build_filter(
+        {"owner_name": owner_name},
+        plate_prefix,
+        {"year_of_manufacture": (year_from, year_to)},
+    )
+    headers = {"Content-Disposition": f'attachment; filename="registrations.{file_format}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_stream(
+            iter_registration_documents(query, selected), selected, file_format, compress
+        ),
+        media_type=MEDIA_TYPES[file_format],
+        headers=headers,
+    )
+
+
+@router.get(
+    "/get_registration/{license_plate}",
+    dependencies=[Depends(rate_limit("read"))],
+    responses={
+        200: {"description": "Registration returned"},
+        404: {"description": "Registration not found"},
+        500: {"description": "Unexpected error during registration retrieval"},
+    },
+)
+async def get_registration_view(
+        license_plate: str, user: str = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Получение регистрации по номерному знаку.
+
+    Args:
+        license_plate (str): Номерной знак, идентифицирующий регистрацию.
+        user (str): Текущий пользователь, извлеченный из токена (определяется через Depends).
+
+    Returns:
+        Dict[str, Any]: Регистрация и данные пользователя.
+
+    Raises:
+        HTTPException: Если регистрация не найдена или произошла ошибка на сервере.
+    """
+    try:
+        registration = await get_registration_by_license_plate(license_plate)
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
+    if registration is None:
+        raise HTTPException(status_code=404, detail="Registration not found")
+    return {"registration": registration, "user": user}
+
+
+@router.post(
+    "/update_registrations/",
+    dependencies=[Depends(rate_limit("bulk"))],
+    response_class=ORJSONResponse,
+    responses={
+        200: {"description": "Batch processed, per-plate results returned"},
+        400: {"description": "Validation error (e.g., license plate modification not allowed)"},
+        500: {"description": "Unexpected error during batch update"},
+    },
+)
+async def update_registrations_batch_view(
+        batch: RegistrationBatchUpdate, user: str = Depends(get_current_user)
+) -> ORJSONResponse:
+    """
+    Пакетное обновление регистраций по списку номерных знаков или по фильтру.
+
+    Args:
+        batch (RegistrationBatchUpdate): Номерные знаки или фильтр и данные для обновления.
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        ORJSONResponse: Итоги по статусам и результат по каждому номеру.
+
+    Raises:
+        HTTPException: При ошибке валидации или ошибке сервера.
+    """
+    try:
+        results = await update_registrations_batch(
+            batch.license_plates, batch_filter_query(batch.filter), batch.update
+        )
+        return ORJSONResponse({
+            "requested": len(results),
+            "summary": summarize_results(results),
+            "results": results,
+            "user": user,
+        })
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
+
+
+@router.post(
+    "/delete_registrations/",
+    dependencies=[Depends(rate_limit("bulk"))],
+    response_class=ORJSONResponse,
+    responses={
+        200: {"description": "Batch processed, per-plate results returned"},
+        400: {"description": "Filter matches too many records"},
+        500: {"description": "Unexpected error during batch deletion"},
+    },
+)
+async def delete_registrations_batch_view(
+        batch: RegistrationBatchDelete, user: str = Depends(get_current_user)
+) -> ORJSONResponse:
+    """
+    Пакетное удаление регистраций по списку номерных знаков или по фильтру.
+
+    Args:
+        batch (RegistrationBatchDelete): Номерные знаки или фильтр.
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        ORJSONResponse: Итоги по статусам и результат по каждому номеру.
+
+    Raises:
+        HTTPException: При слишком широком фильтре или ошибке сервера.
+    """
+    try:
+        results = await delete_registrations_batch(batch.license_plates, batch_filter_query(batch.filter))
+        return ORJSONResponse({
+            "requested": len(results),
+            "summary": summarize_results(results),
+            "results": results,
+            "user": user,
+        })
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=500, detail=str(re))
@@ -0,0 +1,7 @@
+from . import engine
+from . import tokens
+
+__all__: list[str] = [
+    "engine",
+    "tokens",
+]
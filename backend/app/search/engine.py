@@ -0,0 +1,217 @@
+import logging
+import re
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+from search.tokens import (
+    SEARCH_FIELDS,
+    TOKENS_KEY,
+    build_search_fields,
+    normalize_plate,
+    tokenize,
+)
+
+if TYPE_CHECKING:
+    from storage.base import Repository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT: int = 50
+MAX_LIMIT: int = 200
+
+# Во сколько раз больше кандидатов запрашивается у хранилища для ранжирования
+CANDIDATE_FACTOR: int = 4
+
+
+def plate_clause(plate: str) -> Dict[str, Any]:
+    """
+    Условие на префикс номерного знака.
+
+    Args:
+        plate (str): Нормализованный запрос как номерной знак (непустой).
+
+    Returns:
+        Dict[str, Any]: Фильтр для find.
+    """
+    return {"license_plate": {"$regex": f"^{re.escape(plate)}"}}
+
+
+def words_clause(words: List[str], exact: bool = False) -> Dict[str, Any]:
+    """
+    Условие, что каждое слово запроса — префикс (или точно одно из) слов
+    документа.
+
+    Args:
+        words (List[str]): Слова запроса (непустой список).
+        exact (bool): Требовать точного совпадения слов.
+
+    Returns:
+        Dict[str, Any]: Фильтр для find.
+    """
+    if exact:
+        return {"$and": [{TOKENS_KEY: word} for word in words]}
+    return {"$and": [{TOKENS_KEY: {"$regex": f"^{re.escape(word)}"}} for word in words]}
+
+
+def score(document: Mapping[str, Any], plate: str, words: Iterable[str]) -> float:
+    """
+    Оценка релевантности документа запросу.
+
+    Точное совпадение номера важнее совпадения его префикса, а точное
+    совпадение слова важнее совпадения префикса слова.
+
+    Args:
+        document (Mapping[str, Any]): Документ из хранилища.
+        plate (str): Нормализованный запрос как номерной знак.
+        words (Iterable[str]): Слова запроса.
+
+    Returns:
+        float: Оценка релевантности (больше — лучше).
+    """
+    result = 0.0
+    license_plate = document.get("license_plate") or ""
+    if plate and license_plate == plate:
+        result += 100.0
+    elif plate and license_plate.startswith(plate):
+        result += 50.0 * len(plate) / len(license_plate)
+
+    tokens = document.get(TOKENS_KEY) or []
+    for word in words:
+        if word in tokens:
+            result += 10.0
+        elif any(token.startswith(word) for token in tokens):
+            result += 5.0
+    return result
+
+
+def rank(documents: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+    """
+    Упорядочивание документов по релевантности запросу.
+
+    Args:
+        documents (List[Dict[str, Any]]): Найденные документы.
+        query (str): Поисковый запрос.
+
+    Returns:
+        List[Dict[str, Any]]: Документы по убыванию релевантности
+                              (при равенстве — по номерному знаку).
+    """
+    plate = normalize_plate(query)
+    words = tokenize(query)
+    return sorted(
+        documents,
+        key=lambda document: (
+            -score(document, plate, words),
+            document.get("license_plate") or "",
+        ),
+    )
+
+
+async def search_documents(
+        repository: "Repository",
+        query: str,
+        limit: int = DEFAULT_LIMIT,
+        fields: Optional[Iterable[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Поиск документов коллекции с ранжированием и ограничением выдачи.
+
+    Кандидаты читаются отдельно по каждому условию, не больше
+    limit * CANDIDATE_FACTOR на условие: совпадения префикса номера — по
+    возрастанию номера (точное совпадение идёт первым), документы, в
+    которых все слова запроса совпадают точно, и документы, в которых
+    слова совпадают по префиксу. Условия на слова читаются без сортировки,
+    в порядке индекса _search_tokens: сортировка по полю-массиву заставила
+    бы MongoDB сортировать все совпадения в памяти. Объединение кандидатов
+    ранжируется, поэтому время ответа не растёт линейно с размером
+    коллекции, а лучшие совпадения не теряются из-за произвольного
+    порядка выдачи $or.
+
+    Args:
+        repository (Repository): Коллекция для поиска.
+        query (str): Поисковый запрос.
+        limit (int): Максимальное количество результатов.
+        fields (Optional[Iterable[str]]): Поля результата; если заданы, из
+                                          хранилища читаются только они (и
+                                          токены для ранжирования).
+
+    Returns:
+        List[Dict[str, Any]]: Найденные документы по убыванию релевантности.
+    """
+    if fields is not None:
+        fields = [*fields, TOKENS_KEY]
+    plate = normalize_plate(query)
+    words = tokenize(query)
+    clauses: List[Tuple[Dict[str, Any], bool]] = []
+    if plate:
+        clauses.append((plate_clause(plate), True))
+    if words:
+        clauses += [(words_clause(words, exact=True), False), (words_clause(words), False)]
+    candidates: Dict[Any, Dict[str, Any]] = {}
+    for clause, sort in clauses:
+        for document in await repository.find(
+                clause, fields, limit=limit * CANDIDATE_FACTOR, sort=sort
+        ):
+            candidates.setdefault(document["license_plate"], document)
+    documents = rank(list(candidates.values()), query)[:limit]
+    if fields is not None:
+        for document in documents:
+            document.pop(TOKENS_KEY, None)
+    return documents
+
+
+async def backfill_search_fields(
+        collection: AsyncIOMotorCollection, fields: Iterable[str], batch_size: int = 1000
+) -> int:
+    """
+    Заполнение поисковых полей у документов, созданных до их появления.
+
+    Args:
+        collection (AsyncIOMotorCollection): Коллекция для обработки.
+        fields (Iterable[str]): Поля, участвующие в поиске.
+        batch_size (int): Размер пакета обновлений.
+
+    Returns:
+        int: Количество обновлённых документов.
+    """
+    fields = tuple(fields)
+    projection = {field: 1 for field in fields}
+    cursor = collection.find({TOKENS_KEY: {"$exists": False}}, projection)
+    updated = 0
+    batch: List[UpdateOne] = []
+    async for document in cursor:
+        batch.append(UpdateOne(
+            {"_id": document["_id"]},
+            {"$set": build_search_fields(document, fields)},
+        ))
+        if len(batch) >= batch_size:
+            await collection.bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+    if batch:
+        await collection.bulk_write(batch, ordered=False)
+        updated += len(batch)
+    return updated
+
+
+async def backfill_all(database: AsyncIOMotorDatabase) -> Dict[str, int]:
+    """
+    Заполнение поисковых полей во всех коллекциях с поиском.
+
+    Запускается фоновой задачей при старте приложения; ошибки не
+    прерывают работу приложения, а только выводятся в журнал.
+
+    Args:
+        database (AsyncIOMotorDatabase): База данных приложения.
+
+    Returns:
+        Dict[str, int]: Количество обновлённых документов по коллекциям.
+    """
+    result: Dict[str, int] = {}
+    for name, fields in SEARCH_FIELDS.items():
+        try:
+            result[name] = await backfill_search_fields(database[name], fields)
+        except PyMongoError as pe:
+            logger.error("Database error during search backfill of %s: %s", name, pe)
+    return result
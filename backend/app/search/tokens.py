@@ -0,0 +1,93 @@
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+# Поля документов, по которым строится поиск по словам
+SEARCH_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "cars": ("make", "model"),
+    "registrations": ("owner_name", "owner_address"),
+}
+
+# Служебные поля документа: слова каждого поля и их объединение (индексируется)
+FIELD_TOKENS_KEY: str = "_search"
+TOKENS_KEY: str = "_search_tokens"
+
+_TOKEN_PATTERN = re.compile(r"[0-9a-zа-яё]+")
+
+
+def tokenize(text: Any) -> List[str]:
+    """
+    Разбиение текста на нормализованные слова (нижний регистр, буквы и цифры).
+
+    Args:
+        text (Any): Исходное значение поля; не строки приводятся к строке.
+
+    Returns:
+        List[str]: Уникальные слова в порядке появления.
+    """
+    if text is None:
+        return []
+    return list(dict.fromkeys(_TOKEN_PATTERN.findall(str(text).lower())))
+
+
+def normalize_plate(text: str) -> str:
+    """
+    Нормализация запроса по номерному знаку: верхний регистр, без пробелов.
+
+    Args:
+        text (str): Исходный запрос.
+
+    Returns:
+        str: Нормализованный номерной знак.
+    """
+    return "".join(text.split()).upper()
+
+
+def build_search_fields(document: Mapping[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Построение служебных поисковых полей для нового документа.
+
+    Args:
+        document (Mapping[str, Any]): Данные документа.
+        fields (Iterable[str]): Поля, участвующие в поиске.
+
+    Returns:
+        Dict[str, Any]: Поля _search (слова по каждому полю) и _search_tokens.
+    """
+    per_field = {field: tokenize(document.get(field)) for field in fields}
+    union = sorted({token for tokens in per_field.values() for token in tokens})
+    return {FIELD_TOKENS_KEY: per_field, TOKENS_KEY: union}
+
+
+def build_update_pipeline(
+        update_data: Mapping[str, Any], fields: Iterable[str]
+) -> List[Dict[str, Any]]:
+    """
+    Построение конвейера обновления, пересчитывающего поисковые поля.
+
+    Слова изменённых полей вычисляются на стороне приложения, а их
+    объединение с неизменёнными полями собирается MongoDB атомарно
+    в рамках того же update_one.
+
+    Args:
+        update_data (Mapping[str, Any]): Обновляемые поля документа.
+        fields (Iterable[str]): Поля, участвующие в поиске.
+
+    Returns:
+        List[Dict[str, Any]]: Стадии конвейера обновления.
+    """
+    fields = tuple(fields)
+    changes: Dict[str, Any] = {
+        key: {"$literal": value} for key, value in update_data.items()
+    }
+    touched = [field for field in fields if field in update_data]
+    if not touched:
+        return [{"$set": changes}]
+
+    for field in touched:
+        changes[f"{FIELD_TOKENS_KEY}.{field}"] = {"$literal": tokenize(update_data[field])}
+    union = {
+        "$setUnion": [
+            {"$ifNull": [f"${FIELD_TOKENS_KEY}.{field}", []]} for field in fields
+        ]
+    }
+    return [{"$set": changes}, {"$set": {TOKENS_KEY: union}}]
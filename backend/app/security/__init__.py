@@ -1,7 +1,11 @@
+from . import dependencies
 from . import hashing
 from . import jwt
+from . import token_cache
 
 __all__: list[str] = [
+    "dependencies",
     "hashing",
     "jwt",
+    "token_cache",
 ]
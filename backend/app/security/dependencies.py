@@ -0,0 +1,140 @@
+import time
+from datetime import timedelta
+from typing import Any, Dict, FrozenSet, Optional
+from fastapi import Depends, HTTPException, Query
+from fastapi.security import OAuth2PasswordBearer
+from config import settings
+from metrics.registry import histogram
+from security.jwt import create_access_token, decode_access_token
+from security.token_cache import token_cache
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+
+# Область действия билетов потока событий
+STREAM_SCOPE: str = "events"
+
+JWT_DECODE_DURATION = histogram(
+    "jwt_decode_duration_seconds",
+    "Time spent decoding and verifying JWT tokens on cache misses",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+)
+
+
+def decode_access_token_cached(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Расшифровка JWT-токена с использованием кэша проверенных токенов.
+
+    Повторные запросы с тем же токеном не проходят повторную проверку
+    подписи, пока запись кэша не устарела.
+
+    Args:
+        token (str): Токен доступа.
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные токена или None, если токен невалиден.
+    """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    started = time.perf_counter()
+    payload = decode_access_token(token)
+    JWT_DECODE_DURATION.observe(time.perf_counter() - started)
+    if payload:
+        token_cache.put(token, payload)
+    return payload
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
+    """
+    Получение текущего пользователя на основе переданного токена.
+
+    Токены с ограниченной областью действия (билеты потока событий) здесь
+    не принимаются.
+
+    Args:
+        token (str): OAuth2 токен пользователя.
+
+    Returns:
+        str: Идентификатор пользователя.
+
+    Raises:
+        HTTPException: Если токен недействителен или истек.
+    """
+    payload = decode_access_token_cached(token)
+    if not payload or "scope" in payload:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    return payload.get("sub")
+
+
+def admin_users() -> FrozenSet[str]:
+    """
+    Разбор списка администраторов из настроек.
+
+    Returns:
+        FrozenSet[str]: Идентификаторы пользователей с правами администратора.
+    """
+    return frozenset(
+        user.strip() for user in settings.admin_users.split(",") if user.strip()
+    )
+
+
+async def get_admin_user(user: str = Depends(get_current_user)) -> str:
+    """
+    Получение текущего пользователя, входящего в settings.admin_users.
+
+    Регистрация открыта, поэтому служебные маршруты (состояние индексов,
+    кэшей и лимитов, пересчёт статистики) требуют явного разрешения.
+
+    Args:
+        user (str): ID текущего пользователя (из токена).
+
+    Returns:
+        str: Идентификатор пользователя.
+
+    Raises:
+        HTTPException: Если пользователь не администратор.
+    """
+    if user not in admin_users():
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    return user
+
+
+def create_stream_ticket(user: str) -> str:
+    """
+    Короткоживущий билет для подключения к потоку событий.
+
+    EventSource в браузере не умеет передавать заголовок Authorization,
+    поэтому билет передаётся в адресе и может попасть в журналы; он
+    действует settings.events_ticket_seconds и только для потока событий.
+
+    Args:
+        user (str): ID пользователя.
+
+    Returns:
+        str: Билет (JWT с областью действия STREAM_SCOPE).
+    """
+    return create_access_token(
+        {"sub": user, "scope": STREAM_SCOPE},
+        timedelta(seconds=settings.events_ticket_seconds),
+    )
+
+
+async def get_stream_user(
+        ticket: str = Query(..., description="Билет потока событий из /events/ticket")
+) -> str:
+    """
+    Получение пользователя по билету потока событий из параметра запроса.
+
+    Args:
+        ticket (str): Билет потока событий.
+
+    Returns:
+        str: Идентификатор пользователя.
+
+    Raises:
+        HTTPException: Если билет недействителен или истек.
+    """
+    payload = decode_access_token_cached(ticket)
+    if not payload or payload.get("scope") != STREAM_SCOPE:
+        raise HTTPException(status_code=401, detail="Invalid or expired ticket")
+    return payload.get("sub")
@@ -1,7 +1,181 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
 from passlib.context import CryptContext
+from config import settings
+from metrics.registry import callback, histogram
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
+HASH_DURATION = histogram(
+    "password_hash_duration_seconds",
+    "Time spent in bcrypt per operation",
+    ("operation",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+)
+
+
+class HashingPoolSaturated(RuntimeError):
+    """
+    Очередь пула хэширования заполнена, запрос отклонён без ожидания.
+    """
+
+
+class HashingPool:
+    """
+    Ограниченный пул потоков для bcrypt.
+
+    bcrypt освобождает GIL на время вычисления, поэтому хэширование в
+    потоках не блокирует цикл событий и выполняется параллельно. Число
+    одновременно принятых операций ограничено workers + queue_size;
+    сверх этого запросы сразу отклоняются исключением HashingPoolSaturated.
+    Потоки создаются при первой операции и после shutdown создаются
+    заново, поэтому пул переживает повторный запуск приложения в том же
+    процессе.
+
+    Attributes:
+        workers (int): Количество потоков.
+        max_pending (int): Максимум принятых (выполняемых и ожидающих) операций.
+    """
+
+    def __init__(self, workers: int, queue_size: int, latency_window: int = 1000) -> None:
+        self.workers = workers
+        self.max_pending = workers + queue_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+
+    def _timed(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Выполнение операции в потоке пула с замером времени.
+
+        Args:
+            func (Callable[..., T]): Выполняемая функция.
+            *args (Any): Аргументы функции.
+
+        Returns:
+            T: Результат функции.
+        """
+        with self._lock:
+            self._active += 1
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            HASH_DURATION.observe(elapsed, operation=func.__name__)
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                self._latencies.append(elapsed)
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Выполнение функции хэширования в пуле.
+
+        Args:
+            func (Callable[..., T]): Функция (hash или verify).
+            *args (Any): Аргументы функции.
+
+        Returns:
+            T: Результат функции.
+
+        Raises:
+            HashingPoolSaturated: Если пул и его очередь заполнены.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HashingPoolSaturated("Password hashing pool is saturated")
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+            executor = self._executor
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, self._timed, func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Метрики пула: загрузка, очередь, счётчики и время хэширования.
+
+        Returns:
+            Dict[str, Any]: Текущие значения метрик.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            pending, active = self._pending, self._active
+            completed, rejected = self._completed, self._rejected
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            index = min(len(latencies) - 1, int(fraction * len(latencies)))
+            return round(latencies[index] * 1000, 3)
+
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "active": active,
+            "queued": max(0, pending - active),
+            "utilization": round(active / self.workers, 3),
+            "completed": completed,
+            "rejected": rejected,
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": percentile(1.0),
+            },
+        }
+
+    def shutdown(self) -> None:
+        """
+        Остановка потоков пула после завершения принятых операций.
+
+        Следующая операция запустит новые потоки.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+hashing_pool = HashingPool(settings.hashing_workers, settings.hashing_queue_size)
+
+callback(
+    "password_hash_pool_active",
+    "bcrypt operations currently running",
+    "gauge",
+    lambda: hashing_pool.stats()["active"],
+)
+callback(
+    "password_hash_pool_queued",
+    "bcrypt operations waiting for a worker thread",
+    "gauge",
+    lambda: hashing_pool.stats()["queued"],
+)
+callback(
+    "password_hash_pool_rejected_total",
+    "bcrypt operations rejected because the pool was saturated",
+    "counter",
+    lambda: hashing_pool.stats()["rejected"],
+)
+
 
 def hash_password(password: str) -> str:
     """
@@ -28,3 +202,36 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         bool: True, если пароли совпадают, иначе False.
     """
     return pwd_context.verify(plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Хэширование пароля в пуле потоков, без блокировки цикла событий.
+
+    Args:
+        password (str): Пароль в виде обычной строки для хэширования.
+
+    Returns:
+        str: Хэшированный пароль.
+
+    Raises:
+        HashingPoolSaturated: Если пул хэширования перегружен.
+    """
+    return await hashing_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Сравнение пароля с хэшем в пуле потоков, без блокировки цикла событий.
+
+    Args:
+        plain_password (str): Введенный пароль в виде обычной строки.
+        hashed_password (str): Хэшированный пароль.
+
+    Returns:
+        bool: True, если пароли совпадают, иначе False.
+
+    Raises:
+        HashingPoolSaturated: Если пул хэширования перегружен.
+    """
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
@@ -7,18 +7,22 @@ ALGORITHM: str = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
 
-def create_access_token(data: dict) -> str:
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Создание JWT-токена доступа.
 
     Args:
         data (dict): Данные, которые нужно закодировать в токен.
+        expires_delta (Optional[timedelta]): Время жизни токена; по умолчанию
+                                             ACCESS_TOKEN_EXPIRE_MINUTES.
 
     Returns:
         str: Сформированный JWT-токен.
     """
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.utcnow() + expires_delta
     to_encode.update({"exp": expire})
     token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return token
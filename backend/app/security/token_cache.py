@@ -0,0 +1,114 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from config import settings
+from metrics.registry import callback
+
+
+class TokenCache:
+    """
+    Ограниченный LRU-кэш проверенных JWT-токенов с временем жизни.
+
+    Ключ — SHA-256 токена, поэтому сами токены в памяти не хранятся.
+    Запись живёт не дольше ttl секунд и не дольше срока действия
+    токена (exp), так что истёкший токен никогда не будет принят из кэша.
+
+    Attributes:
+        max_size (int): Максимальное количество записей.
+        ttl (float): Максимальное время жизни записи в секундах.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        """
+        Вычисление ключа кэша для токена.
+
+        Args:
+            token (str): JWT-токен.
+
+        Returns:
+            str: SHA-256 токена в шестнадцатеричном виде.
+        """
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Получение расшифрованных данных токена из кэша.
+
+        Args:
+            token (str): JWT-токен.
+
+        Returns:
+            Optional[Dict[str, Any]]: Данные токена или None, если записи нет
+                                      или она устарела.
+        """
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        """
+        Сохранение проверенного токена в кэше.
+
+        Args:
+            token (str): JWT-токен.
+            payload (Dict[str, Any]): Расшифрованные данные токена.
+        """
+        expires_at = time.time() + self.ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        key = self._key(token)
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Очистка кэша.
+        """
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Статистика кэша.
+
+        Returns:
+            Dict[str, Any]: Размер, попадания, промахи, вытеснения и доля попаданий.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache(settings.token_cache_size, settings.token_cache_ttl_seconds)
+
+callback("token_cache_hits_total", "Verified-token cache hits", "counter", lambda: token_cache.hits)
+callback("token_cache_misses_total", "Verified-token cache misses", "counter", lambda: token_cache.misses)
@@ -0,0 +1,38 @@
+import logging
+import uvicorn
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    """
+    Запуск сервера в рабочем режиме.
+
+    Uvicorn запускает settings.workers процессов; каждый импортирует
+    приложение заново и выполняет свой lifespan, поэтому процессы не
+    разделяют ни клиент MongoDB, ни кэши, ни пулы хэширования. После
+    SIGTERM процесс settings.shutdown_drain_delay_seconds отвечает 503 на
+    /health/ready, затем перестаёт принимать соединения и ждёт завершения
+    запросов не дольше settings.shutdown_timeout_seconds.
+
+    Хранилище в памяти у каждого процесса своё, поэтому с ним сервер
+    всегда запускается одним процессом.
+    """
+    workers = settings.workers
+    if settings.storage_engine == "memory" and workers > 1:
+        logger.warning("In-memory storage is per process, starting 1 worker instead of %d", workers)
+        workers = 1
+        # Приложение импортируется в этом же процессе и видит фактическое число
+        settings.workers = workers
+    uvicorn.run(
+        "main:app",
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=workers,
+        timeout_graceful_shutdown=settings.shutdown_timeout_seconds,
+    )
+
+
+if __name__ == "__main__":
+    main()
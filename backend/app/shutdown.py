@@ -0,0 +1,54 @@
+import asyncio
+import signal
+import threading
+from types import FrameType
+from typing import Any, Callable, Optional, Tuple
+
+# Сигналы, по которым uvicorn начинает остановку
+HANDLED_SIGNALS: Tuple[signal.Signals, ...] = (signal.SIGINT, signal.SIGTERM)
+
+
+def install_shutdown_hook(hook: Callable[[], None], delay: float = 0.0) -> None:
+    """
+    Вызов hook по первому сигналу остановки, до обработчика uvicorn.
+
+    Uvicorn по сигналу сразу закрывает сокеты и ждёт завершения
+    соединений, а lifespan выполняет только после этого; всё, что должно
+    произойти до ожидания (перевод /health/ready в 503, завершение
+    долгоживущих потоков событий), нужно делать здесь. Обработчик uvicorn
+    по SIGTERM вызывается через delay секунд: всё это время процесс
+    принимает запросы, а балансировщик успевает увидеть, что процесс не
+    готов. Повторный сигнал и SIGINT передаются uvicorn сразу.
+
+    Обработчик устанавливается поверх обработчика uvicorn, поэтому
+    вызывается из lifespan после запуска сервера. Вне главного потока
+    (TestClient) сигналы не перехватываются.
+
+    Args:
+        hook (Callable[[], None]): Действие при остановке; выполняется в
+                                  цикле событий не более одного раза.
+        delay (float): Задержка начала остановки по SIGTERM (с).
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    loop = asyncio.get_running_loop()
+    called = False
+
+    def chain(previous: Any) -> Callable[[int, Optional[FrameType]], None]:
+        def handle(signum: int, frame: Optional[FrameType]) -> None:
+            nonlocal called
+            first = not called
+            if first:
+                called = True
+                loop.call_soon_threadsafe(hook)
+            if not callable(previous):
+                return
+            if first and signum == signal.SIGTERM and delay > 0:
+                loop.call_soon_threadsafe(loop.call_later, delay, previous, signum, frame)
+            else:
+                previous(signum, frame)
+
+        return handle
+
+    for sig in HANDLED_SIGNALS:
+        signal.signal(sig, chain(signal.getsignal(sig)))
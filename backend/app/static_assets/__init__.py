@@ -0,0 +1,7 @@
+from . import handler
+from . import store
+
+__all__: list[str] = [
+    "handler",
+    "store",
+]
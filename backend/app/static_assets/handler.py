@@ -0,0 +1,132 @@
+from email.utils import parsedate_to_datetime
+from typing import Optional, Set
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+from static_assets.store import Asset, AssetStore
+
+# Ответ с версией в URL не меняется никогда, без версии — проверяется по ETag
+IMMUTABLE_CACHE_CONTROL: str = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL: str = "no-cache"
+
+# Порядок предпочтения сжатых вариантов
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def accepted_encodings(header: str) -> Set[str]:
+    """
+    Разбор заголовка Accept-Encoding.
+
+    Args:
+        header (str): Значение заголовка.
+
+    Returns:
+        Set[str]: Кодировки с ненулевым q.
+    """
+    result: Set[str] = set()
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        key, _, value = params.strip().partition("=")
+        if key.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if name and quality > 0:
+            result.add(name)
+    return result
+
+
+def is_not_modified(headers: Headers, asset: Asset) -> bool:
+    """
+    Проверка условных заголовков запроса (If-None-Match, If-Modified-Since).
+
+    Args:
+        headers (Headers): Заголовки запроса.
+        asset (Asset): Запрошенный файл.
+
+    Returns:
+        bool: True, если у клиента актуальная версия и можно ответить 304.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or asset.etag in tags
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(if_modified_since).timestamp() >= asset.mtime
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def asset_response(request: Request, asset: Asset, versioned: Optional[bool] = None) -> Response:
+    """
+    Ответ с файлом из памяти с учётом кэширования и сжатия.
+
+    Args:
+        request (Request): Запрос.
+        asset (Asset): Запрошенный файл.
+        versioned (Optional[bool]): Можно ли кэшировать ответ бессрочно; по
+                                    умолчанию — если ?v= совпадает с версией файла.
+
+    Returns:
+        Response: 200 с содержимым (возможно, сжатым) или 304.
+    """
+    if versioned is None:
+        versioned = request.query_params.get("v") == asset.version
+    headers = {
+        "ETag": asset.etag,
+        "Last-Modified": asset.last_modified,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if versioned else REVALIDATE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if is_not_modified(request.headers, asset):
+        return Response(status_code=304, headers=headers)
+
+    body = asset.body
+    accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+    for encoding in ENCODING_PREFERENCE:
+        if encoding in asset.encodings and encoding in accepted:
+            body = asset.encodings[encoding]
+            headers["Content-Encoding"] = encoding
+            break
+    if request.method == "HEAD":
+        headers["Content-Length"] = str(len(body))
+        body = b""
+    return Response(body, media_type=asset.media_type, headers=headers)
+
+
+class StaticAssets:
+    """
+    ASGI-приложение для раздачи файлов фронтенда из AssetStore.
+
+    Подключается через app.mount вместо StaticFiles; диск при обработке
+    запросов не используется.
+    """
+
+    def __init__(self, store: AssetStore) -> None:
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request = Request(scope, receive)
+        if request.method not in ("GET", "HEAD"):
+            response: Response = PlainTextResponse(
+                "Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"}
+            )
+        else:
+            # Mount добавляет свой префикс в root_path, путь остаётся полным
+            path = scope["path"]
+            root_path = scope.get("root_path", "")
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path):]
+            asset = self.store.get(path.lstrip("/"))
+            if asset is None:
+                response = PlainTextResponse("Not Found", status_code=404)
+            else:
+                response = asset_response(request, asset)
+        await response(scope, receive, send)
@@ -0,0 +1,162 @@
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+from typing import Dict, Optional, Set
+
+try:
+    import brotli
+except ImportError:  # brotli — необязательная зависимость
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Префикс URL, под которым раздаются файлы фронтенда
+STATIC_PREFIX: str = "/static/"
+# Файлы меньше этого размера не сжимаются: выигрыш меньше накладных расходов
+MIN_COMPRESS_SIZE: int = 512
+# Длина версии (префикса SHA-256 содержимого) в ETag и параметре ?v=
+VERSION_LENGTH: int = 16
+
+COMPRESSIBLE_TYPES: Set[str] = {
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+}
+
+# Ссылки на подресурсы, к которым при загрузке добавляется ?v=<версия>:
+# href/src в HTML и fetch("...") в JS. Навигационные ссылки (<a href>)
+# не версионируются, чтобы адреса страниц не менялись.
+_REFERENCE_PATTERNS = {
+    ".html": re.compile(
+        r'(<(?:link|script)\b[^>]*?\b(?:href|src)=")(/static/[^"?#]+)(")'
+    ),
+    ".js": re.compile(r'(\bfetch\(\s*")(/static/[^"?#]+)(")'),
+}
+
+
+class Asset:
+    """
+    Файл фронтенда, загруженный в память, с предварительно сжатыми вариантами.
+
+    Attributes:
+        path (str): Путь относительно каталога фронтенда (через "/").
+        body (bytes): Содержимое (со ссылками, дополненными версиями).
+        media_type (str): MIME-тип.
+        version (str): Префикс SHA-256 содержимого.
+        etag (str): Значение заголовка ETag.
+        last_modified (str): Значение заголовка Last-Modified.
+        encodings (Dict[str, bytes]): Сжатые варианты по Content-Encoding.
+    """
+
+    def __init__(self, path: str, body: bytes, media_type: str, mtime: float) -> None:
+        self.path = path
+        self.body = body
+        self.media_type = media_type
+        self.version = hashlib.sha256(body).hexdigest()[:VERSION_LENGTH]
+        self.etag = f'"{self.version}"'
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.mtime = int(mtime)
+        self.encodings: Dict[str, bytes] = {}
+        if media_type in COMPRESSIBLE_TYPES and len(body) >= MIN_COMPRESS_SIZE:
+            self._compress()
+
+    def _compress(self) -> None:
+        """
+        Подготовка сжатых вариантов; вариант сохраняется, только если он
+        меньше исходного содержимого.
+        """
+        variants = {"gzip": gzip.compress(self.body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants["br"] = brotli.compress(self.body)
+        for encoding, data in variants.items():
+            if len(data) < len(self.body):
+                self.encodings[encoding] = data
+
+
+class AssetStore:
+    """
+    Хранилище файлов фронтенда в памяти.
+
+    Файлы читаются один раз при загрузке; ссылки на CSS/JS в HTML и
+    fetch-запросы в JS дополняются версией содержимого, поэтому такие
+    ответы можно кэшировать в браузере бессрочно.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.assets: Dict[str, Asset] = {}
+
+    def get(self, path: str) -> Optional[Asset]:
+        """
+        Получение файла по относительному пути.
+
+        Args:
+            path (str): Путь относительно каталога фронтенда.
+
+        Returns:
+            Optional[Asset]: Файл или None, если его нет.
+        """
+        return self.assets.get(path)
+
+    def load(self) -> int:
+        """
+        Загрузка всех файлов каталога в память.
+
+        Returns:
+            int: Количество загруженных файлов.
+        """
+        raw: Dict[str, bytes] = {}
+        mtimes: Dict[str, float] = {}
+        for root, _, files in os.walk(self.directory, followlinks=True):
+            for name in files:
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                with open(full_path, "rb") as file:
+                    raw[path] = file.read()
+                mtimes[path] = os.path.getmtime(full_path)
+
+        assets: Dict[str, Asset] = {}
+        resolving: Set[str] = set()
+
+        def build(path: str) -> Asset:
+            # Версия файла зависит от версий файлов, на которые он ссылается;
+            # при циклических ссылках ссылка остаётся без версии
+            if path in assets:
+                return assets[path]
+            resolving.add(path)
+            body = raw[path]
+            pattern = _REFERENCE_PATTERNS.get(os.path.splitext(path)[1])
+            if pattern is not None:
+                body = pattern.sub(
+                    lambda match: versioned(match, path), body.decode("utf-8")
+                ).encode("utf-8")
+            media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            assets[path] = Asset(path, body, media_type, mtimes[path])
+            resolving.discard(path)
+            return assets[path]
+
+        def versioned(match: re.Match, owner: str) -> str:
+            prefix, url, suffix = match.groups()
+            target = url[len(STATIC_PREFIX):]
+            if target not in raw or target in resolving:
+                return match.group(0)
+            return f"{prefix}{url}?v={build(target).version}{suffix}"
+
+        for path in raw:
+            build(path)
+        self.assets = assets
+        logger.info(
+            "Loaded %d static assets (%d bytes) from %s",
+            len(assets),
+            sum(len(asset.body) for asset in assets.values()),
+            self.directory,
+        )
+        return len(assets)
@@ -0,0 +1,13 @@
+from . import base
+from . import engines
+from . import memory
+from . import mongo
+from . import query
+
+__all__: list[str] = [
+    "base",
+    "engines",
+    "memory",
+    "mongo",
+    "query",
+]
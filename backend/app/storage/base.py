@@ -0,0 +1,339 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from search.tokens import FIELD_TOKENS_KEY, TOKENS_KEY
+
+# Уникальный ключ каждой коллекции
+COLLECTION_KEYS: Dict[str, str] = {
+    "cars": "license_plate",
+    "registrations": "license_plate",
+    "users": "email",
+    "analytics_days": "key",
+}
+
+# Служебные поля документов, не попадающие в ответы API
+PRIVATE_FIELDS: Tuple[str, ...] = ("_id", FIELD_TOKENS_KEY, TOKENS_KEY)
+
+# Фильтр в синтаксисе MongoDB: поддерживаются равенство, $in, $gt/$gte/$lt/$lte,
+# $regex, $exists, $and и $or
+Query = Mapping[str, Any]
+
+
+class StorageError(Exception):
+    """
+    Ошибка хранилища: база недоступна или операция отклонена.
+    """
+
+
+class DuplicateKeyError(StorageError):
+    """
+    Нарушение уникальности ключа коллекции.
+    """
+
+
+class UpdateResult:
+    """
+    Результат обновления документов.
+
+    Attributes:
+        matched (int): Количество документов, подошедших под фильтр.
+        modified (int): Количество фактически изменённых документов.
+    """
+
+    def __init__(self, matched: int, modified: int) -> None:
+        self.matched = matched
+        self.modified = modified
+
+
+def public_document(document: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Документ без служебных полей.
+
+    Args:
+        document (Mapping[str, Any]): Документ хранилища.
+
+    Returns:
+        Dict[str, Any]: Копия документа без PRIVATE_FIELDS.
+    """
+    return {key: value for key, value in document.items() if key not in PRIVATE_FIELDS}
+
+
+class Repository(ABC):
+    """
+    Коллекция документов с уникальным ключом.
+
+    Все операции чтения без явного указания возвращают документы по
+    возрастанию ключа коллекции.
+
+    Attributes:
+        name (str): Имя коллекции.
+        key (str): Поле с уникальным ключом.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.key = COLLECTION_KEYS[name]
+
+    @abstractmethod
+    async def find_one(
+            self, query: Query, fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Поиск одного документа.
+
+        Args:
+            query (Query): Фильтр.
+            fields (Optional[Iterable[str]]): Возвращаемые поля; None — документ целиком.
+
+        Returns:
+            Optional[Dict[str, Any]]: Документ или None.
+
+        Raises:
+            StorageError: При ошибке хранилища.
+        """
+
+    @abstractmethod
+    async def find(
+            self,
+            query: Query,
+            fields: Optional[Iterable[str]] = None,
+            limit: Optional[int] = None,
+            sort: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Поиск документов.
+
+        Args:
+            query (Query): Фильтр.
+            fields (Optional[Iterable[str]]): Возвращаемые поля; None — документы целиком.
+            limit (Optional[int]): Максимальное количество документов.
+            sort (bool): Упорядочить по ключу; без сортировки хранилище
+                         возвращает документы в удобном ему порядке.
+
+        Returns:
+            List[Dict[str, Any]]: Найденные документы.
+
+        Raises:
+            StorageError: При ошибке хранилища.
+        """
+
+    @abstractmethod
+    def iterate(
+            self, query: Query, fields: Optional[Iterable[str]] = None, batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Потоковое чтение документов по возрастанию ключа.
+
+        Args:
+            query (Query): Фильтр.
+            fields (Optional[Iterable[str]]): Возвращаемые поля.
+            batch_size (int): Размер пакета чтения.
+
+        Yields:
+            Dict[str, Any]: Очередной документ.
+
+        Raises:
+            StorageError: При ошибке хранилища.
+        """
+
+    @abstractmethod
+    async def insert_one(self, document: Mapping[str, Any]) -> None:
+        """
+        Вставка документа.
+
+        Args:
+            document (Mapping[str, Any]): Документ.
+
+        Raises:
+            DuplicateKeyError: Если документ с таким ключом уже есть.
+            StorageError: При ошибке хранилища.
+        """
+
+    @abstractmethod
+    async def insert_many(self, documents: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Неупорядоченная вставка документов: ошибка одного документа не
+        мешает вставке остальных.
+
+        Args:
+            documents (List[Mapping[str, Any]]): Документы.
+
+        Returns:
+            List[Dict[str, Any]]: Ошибки записи: index (позиция документа),
+                                  duplicate (нарушение уникальности) и message.
+
+        Raises:
+            StorageError: Если результат вставки неизвестен.
+        """
+
+    @abstractmethod
+    async def update(
+            self, query: Query, changes: Mapping[str, Any], many: bool = False
+    ) -> UpdateResult:
+        """
+        Изменение полей документов с пересчётом поисковых полей.
+
+        Args:
+            query (Query): Фильтр.
+            changes (Mapping[str, Any]): Новые значения полей.
+            many (bool): Изменить все подходящие документы, а не первый.
+
+        Returns:
+            UpdateResult: Количество подошедших и изменённых документов.
+
+        Raises:
+            StorageError: При ошибке хранилища.
+        """
+
+    @abstractmethod
+    async def increment(
+            self,
+            key: Any,
+            amounts: Mapping[str, int],
+            defaults: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        """
+        Атомарное увеличение числовых полей документа; отсутствующий
+        документ создаётся.
+
+        Args:
+            key (Any): Ключ документа.
+            amounts (Mapping[str, int]): Поле -> на сколько его увеличить.
+            defaults (Optional[Mapping[str, Any]]): Остальные поля
+                                                    создаваемого документа.
+
+        Raises:
+            StorageError: При ошибке хранилища.
+        """
+
+    @abstractmethod
+    async def delete(self, query: Query, many: bool = False) -> int:
+        """
+        Удаление документов.
+
+        Args:
+            query (Query): Фильтр.
+            many (bool): Удалить все подходящие документы, а не первый.
+
+        Returns:
+            int: Количество удалённых документов.
+
+        Raises:
+            StorageError: При ошибке хранилища.
+        """
+
+    @abstractmethod
+    async def find_one_and_delete(
+            self, query: Query, fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Атомарное удаление одного документа с возвратом его прежнего вида.
+
+        Args:
+            query (Query): Фильтр.
+            fields (Optional[Iterable[str]]): Возвращаемые поля; None — документ целиком.
+
+        Returns:
+            Optional[Dict[str, Any]]: Удалённый документ или None, если
+                                      подходящего документа не было.
+
+        Raises:
+            StorageError: При ошибке хранилища.
+        """
+
+    @abstractmethod
+    async def count_by(self, fields: Sequence[str]) -> Dict[Tuple[Any, ...], int]:
+        """
+        Количество документов по сочетаниям значений полей.
+
+        Args:
+            fields (Sequence[str]): Поля группировки.
+
+        Returns:
+            Dict[Tuple[Any, ...], int]: Количество документов для каждого
+                                        сочетания значений (None — поля нет).
+
+        Raises:
+            StorageError: При ошибке хранилища.
+        """
+
+    @abstractmethod
+    async def join(
+            self, query: Query, foreign: str, as_field: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Документы вместе с документом другой коллекции с тем же ключом.
+
+        Args:
+            query (Query): Фильтр документов этой коллекции.
+            foreign (str): Присоединяемая коллекция.
+            as_field (str): Поле для присоединённого документа (None, если его нет).
+            limit (Optional[int]): Максимальное количество документов.
+
+        Returns:
+            List[Dict[str, Any]]: Публичные поля документов по возрастанию ключа.
+
+        Raises:
+            StorageError: При ошибке хранилища.
+        """
+
+
+class StorageEngine(ABC):
+    """
+    Хранилище данных приложения: набор коллекций и их жизненный цикл.
+
+    Attributes:
+        name (str): Имя движка в настройке storage_engine.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    async def start(self) -> None:
+        """
+        Подключение к хранилищу и запуск фоновых задач.
+        """
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """
+        Остановка фоновых задач и освобождение ресурсов.
+        """
+
+    @abstractmethod
+    async def ping(self, timeout: float) -> None:
+        """
+        Проверка доступности хранилища.
+
+        Args:
+            timeout (float): Максимальное время ожидания ответа (с).
+
+        Raises:
+            RuntimeError: Если хранилище недоступно.
+        """
+
+    @abstractmethod
+    def repository(self, name: str) -> Repository:
+        """
+        Коллекция по имени.
+
+        Args:
+            name (str): Имя коллекции.
+
+        Returns:
+            Repository: Коллекция.
+        """
+
+    @abstractmethod
+    async def index_report(self, collection: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Отчёт о состоянии индексов.
+
+        Args:
+            collection (Optional[str]): Ограничить отчёт одной коллекцией.
+
+        Returns:
+            List[Dict[str, Any]]: Описания индексов с полями status и present.
+
+        Raises:
+            RuntimeError: При ошибке обращения к хранилищу.
+        """
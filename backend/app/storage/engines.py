@@ -0,0 +1,76 @@
+from typing import Dict, Optional, Type
+from config import settings
+from storage.base import Repository, StorageEngine
+from storage.memory import MemoryEngine
+from storage.mongo import MongoEngine
+
+# Доступные движки хранилища по имени в настройке storage_engine
+ENGINES: Dict[str, Type[StorageEngine]] = {
+    MemoryEngine.name: MemoryEngine,
+    MongoEngine.name: MongoEngine,
+}
+
+_engine: Optional[StorageEngine] = None
+
+
+def create_engine(name: str = settings.storage_engine) -> StorageEngine:
+    """
+    Создание движка хранилища; повторный вызов возвращает уже созданный.
+
+    Args:
+        name (str): Имя движка из ENGINES.
+
+    Returns:
+        StorageEngine: Движок хранилища.
+
+    Raises:
+        ValueError: Если движок с таким именем не существует.
+    """
+    global _engine
+    if _engine is None:
+        if name not in ENGINES:
+            raise ValueError(f"Unknown storage engine: {name}")
+        _engine = ENGINES[name]()
+    return _engine
+
+
+def get_engine() -> StorageEngine:
+    """
+    Получение текущего движка хранилища.
+
+    Returns:
+        StorageEngine: Движок хранилища.
+
+    Raises:
+        RuntimeError: Если движок ещё не создан.
+    """
+    if _engine is None:
+        raise RuntimeError("Storage engine is not initialized")
+    return _engine
+
+
+def set_engine(engine: Optional[StorageEngine]) -> None:
+    """
+    Подключение другого движка (None — сброс текущего).
+
+    Args:
+        engine (Optional[StorageEngine]): Новый движок.
+    """
+    global _engine
+    _engine = engine
+
+
+def get_repository(name: str) -> Repository:
+    """
+    Получение коллекции текущего движка.
+
+    Args:
+        name (str): Имя коллекции (cars, registrations, users).
+
+    Returns:
+        Repository: Коллекция.
+
+    Raises:
+        RuntimeError: Если движок ещё не создан.
+    """
+    return get_engine().repository(name)
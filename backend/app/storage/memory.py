@@ -0,0 +1,572 @@
+import asyncio
+import copy
+import heapq
+import itertools
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from operator import itemgetter
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from search.tokens import SEARCH_FIELDS, TOKENS_KEY, build_search_fields
+from storage.base import (
+    COLLECTION_KEYS,
+    DuplicateKeyError,
+    Query,
+    Repository,
+    StorageEngine,
+    StorageError,
+    UpdateResult,
+    public_document,
+)
+from storage.query import is_operator, literal_prefix, matches
+
+# Поля с отсортированными индексами для диапазонов и префиксов; ключ
+# коллекции дополнительно индексируется хэш-таблицей
+SORTED_INDEXES: Dict[str, Tuple[str, ...]] = {
+    "cars": ("license_plate", TOKENS_KEY, "make", "model"),
+    "registrations": ("license_plate", TOKENS_KEY, "owner_name", "year_of_manufacture"),
+    "users": (),
+    "analytics_days": (),
+}
+
+_value = itemgetter(0)
+_MISSING = object()
+
+
+class KeyRange:
+    """
+    Ключи документов с непрерывного участка отсортированного индекса.
+
+    Участок не копируется: длина известна сразу, а ключи читаются по
+    мере обхода, поэтому первая страница большого диапазона не требует
+    просмотра всего диапазона.
+    """
+
+    def __init__(self, entries: List[Tuple[Any, Any]], start: int, end: int) -> None:
+        self._entries = entries
+        self._start = start
+        self._end = max(start, end)
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(self._start, self._end):
+            yield self._entries[index][1]
+
+
+class SortedIndex:
+    """
+    Отсортированный индекс поля: пары (значение, ключ документа).
+
+    Для полей-массивов (слова документа) в индекс попадает каждый элемент.
+
+    Attributes:
+        field (str): Индексируемое поле.
+    """
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self.entries: List[Tuple[Any, Any]] = []
+
+    def _values(self, document: Mapping[str, Any]) -> List[Any]:
+        value = document.get(self.field)
+        if value is None:
+            return []
+        return list(value) if isinstance(value, list) else [value]
+
+    def add(self, key: Any, document: Mapping[str, Any]) -> None:
+        """
+        Добавление документа в индекс.
+
+        Args:
+            key (Any): Ключ документа.
+            document (Mapping[str, Any]): Документ.
+        """
+        for value in self._values(document):
+            insort(self.entries, (value, key))
+
+    def check(self, key: Any, document: Mapping[str, Any]) -> None:
+        """
+        Проверка, что значения документа сравнимы со значениями индекса.
+
+        Args:
+            key (Any): Ключ документа.
+            document (Mapping[str, Any]): Документ.
+
+        Raises:
+            TypeError: Если значение поля несравнимо со значениями индекса.
+        """
+        for value in self._values(document):
+            bisect_left(self.entries, (value, key))
+
+    def discard(self, key: Any) -> None:
+        """
+        Удаление всех значений документа из индекса полным просмотром.
+
+        Используется при откате, когда проиндексированная часть документа
+        неизвестна.
+
+        Args:
+            key (Any): Ключ документа.
+        """
+        self.entries[:] = [entry for entry in self.entries if entry[1] != key]
+
+    def remove(self, key: Any, document: Mapping[str, Any]) -> None:
+        """
+        Удаление документа из индекса.
+
+        Args:
+            key (Any): Ключ документа.
+            document (Mapping[str, Any]): Документ в проиндексированном виде.
+        """
+        for value in self._values(document):
+            position = bisect_left(self.entries, (value, key))
+            if position < len(self.entries) and self.entries[position] == (value, key):
+                del self.entries[position]
+
+    def between(
+            self,
+            low: Any = None,
+            high: Any = None,
+            include_low: bool = True,
+            include_high: bool = True,
+    ) -> KeyRange:
+        """
+        Ключи документов со значением поля в диапазоне.
+
+        Args:
+            low (Any): Нижняя граница (None — без границы).
+            high (Any): Верхняя граница (None — без границы).
+            include_low (bool): Включать нижнюю границу.
+            include_high (bool): Включать верхнюю границу.
+
+        Returns:
+            KeyRange: Ключи по возрастанию значения поля.
+
+        Raises:
+            TypeError: Если граница несравнима со значениями индекса.
+        """
+        start, end = 0, len(self.entries)
+        if low is not None:
+            search = bisect_left if include_low else bisect_right
+            start = search(self.entries, low, key=_value)
+        if high is not None:
+            search = bisect_right if include_high else bisect_left
+            end = search(self.entries, high, key=_value)
+        return KeyRange(self.entries, start, end)
+
+    def prefix(self, prefix: str) -> KeyRange:
+        """
+        Ключи документов, значение поля которых начинается с префикса.
+
+        Args:
+            prefix (str): Непустой префикс.
+
+        Returns:
+            KeyRange: Ключи по возрастанию значения поля.
+        """
+        # Все строки с префиксом лежат в [prefix, prefix с увеличенным последним символом)
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return self.between(prefix, upper, include_high=False)
+
+
+def _unique(keys: Iterable[Any]) -> Iterator[Any]:
+    # Ключи без повторов в порядке первого появления
+    seen = set()
+    for key in keys:
+        if key not in seen:
+            seen.add(key)
+            yield key
+
+
+def _unique_sorted(keys: Iterable[Any]) -> Iterator[Any]:
+    # Повторы в отсортированной последовательности идут подряд
+    previous: Any = _MISSING
+    for key in keys:
+        if key != previous:
+            previous = key
+            yield key
+
+
+class Plan:
+    """
+    Кандидаты для фильтра, выбранные по индексу.
+
+    Ключи могут читаться лениво (участки индексов, объединение условий
+    $or), поэтому размер плана задаётся отдельно: для $or это сумма
+    размеров условий, верхняя граница числа кандидатов.
+
+    Attributes:
+        keys (Iterable[Any]): Ключи документов-кандидатов (возможны повторы).
+        ordered (bool): Ключи уже идут по возрастанию без повторов.
+        size (int): Число кандидатов (или его верхняя граница).
+    """
+
+    def __init__(self, keys: Iterable[Any], ordered: bool, size: Optional[int] = None) -> None:
+        self.keys = keys
+        self.ordered = ordered
+        self.size = len(keys) if size is None else size
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class MemoryRepository(Repository):
+    """
+    Коллекция в памяти процесса.
+
+    Документы хранятся в хэш-таблице по ключу коллекции (поиск по
+    номерному знаку или e-mail за O(1)); поля из SORTED_INDEXES
+    индексируются отсортированными списками, по которым за O(log n)
+    находятся диапазоны и префиксы. Фильтр исполняется по самому
+    селективному индексу, а остальные условия проверяются на кандидатах.
+    Операции не уступают управление циклу событий, поэтому каждая из
+    них атомарна.
+    """
+
+    def __init__(self, name: str, engine: "MemoryEngine") -> None:
+        super().__init__(name)
+        self._engine = engine
+        self._documents: Dict[Any, Dict[str, Any]] = {}
+        self._indexes: Dict[str, SortedIndex] = {
+            field: SortedIndex(field) for field in SORTED_INDEXES.get(name, ())
+        }
+        self._search_fields = SEARCH_FIELDS.get(name, ())
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    @property
+    def indexes(self) -> Dict[str, SortedIndex]:
+        """
+        Отсортированные индексы коллекции.
+
+        Returns:
+            Dict[str, SortedIndex]: Поле -> индекс.
+        """
+        return self._indexes
+
+    def _plan_field(self, field: str, condition: Any) -> Optional[Plan]:
+        operators = condition if is_operator(condition) else {"$eq": condition}
+        if field == self.key and "$eq" in operators:
+            return Plan([operators["$eq"]], True)
+        if field == self.key and "$in" in operators:
+            return Plan(list(operators["$in"]), False)
+        index = self._indexes.get(field)
+        if index is None:
+            return None
+        ordered = field == self.key
+        try:
+            if "$eq" in operators:
+                value = operators["$eq"]
+                return Plan(index.between(value, value), ordered)
+            if "$in" in operators:
+                keys = [key for value in operators["$in"] for key in index.between(value, value)]
+                return Plan(keys, False)
+            prefix = literal_prefix(operators)
+            if prefix is not None:
+                return Plan(index.prefix(prefix), ordered)
+            low_operator = "$gt" if "$gt" in operators else "$gte"
+            high_operator = "$lt" if "$lt" in operators else "$lte"
+            low, high = operators.get(low_operator), operators.get(high_operator)
+            if low is not None or high is not None:
+                keys = index.between(low, high, low_operator == "$gte", high_operator == "$lte")
+                return Plan(keys, ordered)
+        except TypeError:
+            return None
+        return None
+
+    def _plan(self, query: Query) -> Optional[Plan]:
+        # Из индексируемых условий выбирается дающее меньше всего кандидатов
+        best: Optional[Plan] = None
+        for field, condition in query.items():
+            if field == "$and":
+                plans = [self._plan(clause) for clause in condition]
+                plans = [plan for plan in plans if plan is not None]
+                plan = min(plans, key=len) if plans else None
+            elif field == "$or":
+                plans = [self._plan(clause) for clause in condition]
+                if not plans or any(plan is None for plan in plans):
+                    plan = None
+                else:
+                    plan = self._union(plans)
+            else:
+                plan = self._plan_field(field, condition)
+            if plan is not None and (best is None or len(plan) < len(best)):
+                best = plan
+        return best
+
+    @staticmethod
+    def _union(plans: List[Plan]) -> Plan:
+        # Условия $or объединяются лениво: упорядоченные по ключу участки
+        # сливаются с сохранением порядка, остальные читаются подряд. Если
+        # результат не нужно сортировать (или все участки упорядочены),
+        # limit ограничивает число прочитанных ключей, а не только результат
+        size = sum(len(plan) for plan in plans)
+        if all(plan.ordered for plan in plans):
+            keys = _unique_sorted(heapq.merge(*(plan.keys for plan in plans)))
+            return Plan(keys, True, size)
+        return Plan(itertools.chain.from_iterable(plan.keys for plan in plans), False, size)
+
+    def _ordered_keys(self) -> Iterable[Any]:
+        index = self._indexes.get(self.key)
+        if index is not None:
+            return index.between()
+        return sorted(self._documents)
+
+    def _select(self, query: Query, sort: bool = True) -> Iterator[Dict[str, Any]]:
+        plan = self._plan(query)
+        if plan is None:
+            keys = self._ordered_keys() if sort else list(self._documents)
+        elif plan.ordered:
+            keys = plan.keys
+        elif sort:
+            keys = sorted(set(plan.keys))
+        else:
+            keys = _unique(plan.keys)
+        for key in keys:
+            document = self._documents.get(key)
+            if document is not None and matches(document, query):
+                yield document
+
+    @staticmethod
+    def _project(document: Mapping[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+        if fields is None:
+            return copy.deepcopy(dict(document))
+        return {field: copy.copy(document[field]) for field in fields if field in document}
+
+    def _index(self, key: Any, document: Dict[str, Any]) -> None:
+        self._documents[key] = document
+        for index in self._indexes.values():
+            index.add(key, document)
+
+    def _unindex(self, key: Any) -> Dict[str, Any]:
+        document = self._documents.pop(key)
+        for index in self._indexes.values():
+            index.remove(key, document)
+        return document
+
+    def _check(self, key: Any, document: Mapping[str, Any]) -> None:
+        # Все ключи индексов проверяются до изменения состояния, поэтому
+        # вставка в индекс не может прерваться на середине
+        for field, index in self._indexes.items():
+            try:
+                index.check(key, document)
+            except TypeError:
+                raise StorageError(
+                    f"Field {self.name}.{field} has a type incompatible with its index: "
+                    f"{document.get(field)!r}"
+                ) from None
+
+    def _restore(self, replaced: List[Tuple[Any, Any, Dict[str, Any]]]) -> None:
+        # Откат замен в обратном порядке: новая версия удаляется из всех
+        # индексов целиком, прежняя индексируется заново
+        for old_key, new_key, document in reversed(replaced):
+            self._documents.pop(new_key, None)
+            for index in self._indexes.values():
+                index.discard(new_key)
+            self._index(old_key, document)
+
+    def _insert(self, document: Mapping[str, Any]) -> None:
+        key = document.get(self.key)
+        if key in self._documents:
+            raise DuplicateKeyError(f"Duplicate key {self.name}.{self.key}: {key!r}")
+        self._check(key, document)
+        self._index(key, copy.deepcopy(dict(document)))
+
+    async def find_one(
+            self, query: Query, fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        document = next(self._select(query), None)
+        return None if document is None else self._project(document, fields)
+
+    async def find(
+            self,
+            query: Query,
+            fields: Optional[Iterable[str]] = None,
+            limit: Optional[int] = None,
+            sort: bool = True,
+    ) -> List[Dict[str, Any]]:
+        fields = None if fields is None else tuple(fields)
+        documents = itertools.islice(self._select(query, sort), limit)
+        return [self._project(document, fields) for document in documents]
+
+    async def iterate(
+            self, query: Query, fields: Optional[Iterable[str]] = None, batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        # Пакеты выбираются по ключу после последнего выданного документа,
+        # как курсор, поэтому копируется не больше одного пакета, а записи
+        # между пакетами не сдвигают обход
+        fields = None if fields is None else tuple(fields)
+        page_query = query
+        while True:
+            documents = list(itertools.islice(self._select(page_query), batch_size))
+            for document in documents:
+                yield self._project(document, fields)
+            if len(documents) < batch_size:
+                return
+            page_query = {"$and": [query, {self.key: {"$gt": documents[-1][self.key]}}]}
+            await asyncio.sleep(0)
+
+    async def insert_one(self, document: Mapping[str, Any]) -> None:
+        self._insert(document)
+
+    async def insert_many(self, documents: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        errors: List[Dict[str, Any]] = []
+        for position, document in enumerate(documents):
+            try:
+                self._insert(document)
+            except DuplicateKeyError as de:
+                errors.append({"index": position, "duplicate": True, "message": str(de)})
+        return errors
+
+    async def update(
+            self, query: Query, changes: Mapping[str, Any], many: bool = False
+    ) -> UpdateResult:
+        selected = self._select(query)
+        documents = list(selected) if many else list(itertools.islice(selected, 1))
+        changes = copy.deepcopy(dict(changes))
+        touched = any(field in changes for field in self._search_fields)
+        pending: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        new_keys = set()
+        for document in documents:
+            updated = {**document, **changes}
+            if touched:
+                updated.update(build_search_fields(updated, self._search_fields))
+            if updated == document:
+                continue
+            key, new_key = document[self.key], updated.get(self.key)
+            if new_key != key and (new_key in self._documents or new_key in new_keys):
+                raise DuplicateKeyError(f"Duplicate key {self.name}.{self.key}: {new_key!r}")
+            for field in self._indexes:
+                old_value, new_value = document.get(field), updated.get(field)
+                if None not in (old_value, new_value) and type(old_value) is not type(new_value):
+                    raise StorageError(
+                        f"Field {self.name}.{field} cannot change type from "
+                        f"{type(old_value).__name__} to {type(new_value).__name__}"
+                    )
+            self._check(new_key, updated)
+            new_keys.add(new_key)
+            pending.append((document, updated))
+
+        replaced: List[Tuple[Any, Any, Dict[str, Any]]] = []
+        try:
+            for document, updated in pending:
+                key, new_key = document[self.key], updated[self.key]
+                self._unindex(key)
+                replaced.append((key, new_key, document))
+                self._index(new_key, updated)
+        except Exception:
+            self._restore(replaced)
+            raise
+        return UpdateResult(len(documents), len(pending))
+
+    async def increment(
+            self,
+            key: Any,
+            amounts: Mapping[str, int],
+            defaults: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        document = self._documents.get(key)
+        if document is None:
+            self._insert({**(defaults or {}), self.key: key, **amounts})
+            return
+        changes = {field: document.get(field, 0) + amount for field, amount in amounts.items()}
+        await self.update({self.key: key}, changes)
+
+    async def delete(self, query: Query, many: bool = False) -> int:
+        selected = self._select(query)
+        documents = list(selected) if many else list(itertools.islice(selected, 1))
+        for document in documents:
+            self._unindex(document[self.key])
+        return len(documents)
+
+    async def find_one_and_delete(
+            self, query: Query, fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        document = next(self._select(query), None)
+        if document is None:
+            return None
+        self._unindex(document[self.key])
+        return self._project(document, fields)
+
+    async def count_by(self, fields: Sequence[str]) -> Dict[Tuple[Any, ...], int]:
+        counts: Dict[Tuple[Any, ...], int] = {}
+        for document in self._documents.values():
+            key = tuple(document.get(field) for field in fields)
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    async def join(
+            self, query: Query, foreign: str, as_field: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        related = self._engine.repository(foreign)
+        result: List[Dict[str, Any]] = []
+        for document in itertools.islice(self._select(query), limit):
+            joined = public_document(document)
+            other = related._documents.get(document[self.key])
+            joined[as_field] = None if other is None else public_document(other)
+            result.append(joined)
+        return result
+
+
+class MemoryEngine(StorageEngine):
+    """
+    Хранилище в памяти процесса.
+
+    Данные не сохраняются между перезапусками и не разделяются между
+    рабочими процессами; предназначено для тестов, нагрузочных прогонов
+    и небольших установок с одним процессом. События живых обновлений
+    публикуют операции CRUD этого процесса.
+    """
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._repositories: Dict[str, MemoryRepository] = {
+            name: MemoryRepository(name, self) for name in COLLECTION_KEYS
+        }
+        self._started_at: Optional[str] = None
+
+    async def start(self) -> None:
+        self._started_at = datetime.utcnow().isoformat()
+
+    async def stop(self) -> None:
+        pass
+
+    async def ping(self, timeout: float) -> None:
+        pass
+
+    def repository(self, name: str) -> MemoryRepository:
+        return self._repositories[name]
+
+    async def index_report(self, collection: Optional[str] = None) -> List[Dict[str, Any]]:
+        report: List[Dict[str, Any]] = []
+        for name, repository in self._repositories.items():
+            if collection is not None and name != collection:
+                continue
+            indexes = [(f"{repository.key}_hash", repository.key, "hashed", True)]
+            indexes += [(f"{field}_sorted", field, 1, False) for field in repository.indexes]
+            for index_name, field, kind, unique in indexes:
+                report.append({
+                    "collection": name,
+                    "name": index_name,
+                    "keys": {field: kind},
+                    "unique": unique,
+                    "status": "ready",
+                    "error": None,
+                    "finished_at": self._started_at,
+                    "present": True,
+                })
+        return report
@@ -0,0 +1,250 @@
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import errors
+from database import close_mongo_connection, connect_to_mongo, get_database, ping_mongo
+from events.change_streams import watch_changes
+from indexes import ensure_indexes, get_index_report
+from search.engine import backfill_all
+from search.tokens import SEARCH_FIELDS, build_update_pipeline
+from storage.base import (
+    COLLECTION_KEYS,
+    PRIVATE_FIELDS,
+    DuplicateKeyError,
+    Query,
+    Repository,
+    StorageEngine,
+    StorageError,
+    UpdateResult,
+)
+
+# Код ошибки MongoDB для нарушения уникального индекса
+DUPLICATE_KEY_CODE = 11000
+
+
+@contextlib.contextmanager
+def translate_errors() -> Iterator[None]:
+    """
+    Преобразование ошибок PyMongo в ошибки хранилища.
+
+    Raises:
+        DuplicateKeyError: При нарушении уникального индекса.
+        StorageError: При любой другой ошибке MongoDB.
+    """
+    try:
+        yield
+    except errors.DuplicateKeyError as de:
+        raise DuplicateKeyError(str(de)) from de
+    except errors.PyMongoError as pe:
+        raise StorageError(str(pe)) from pe
+
+
+def projection(fields: Optional[Iterable[str]]) -> Optional[Dict[str, int]]:
+    """
+    Проекция MongoDB для списка полей.
+
+    Args:
+        fields (Optional[Iterable[str]]): Возвращаемые поля.
+
+    Returns:
+        Optional[Dict[str, int]]: Проекция без _id или None (документ целиком).
+    """
+    if fields is None:
+        return None
+    return {"_id": 0, **{field: 1 for field in fields}}
+
+
+class MongoRepository(Repository):
+    """
+    Коллекция MongoDB.
+
+    Уникальность ключа и поиск по нему обеспечиваются индексами из
+    indexes.INDEX_SPECS.
+    """
+
+    @property
+    def collection(self) -> AsyncIOMotorCollection:
+        """
+        Коллекция клиента Motor.
+
+        Returns:
+            AsyncIOMotorCollection: Коллекция.
+        """
+        return get_database()[self.name]
+
+    async def find_one(
+            self, query: Query, fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        with translate_errors():
+            return await self.collection.find_one(query, projection(fields))
+
+    async def find(
+            self,
+            query: Query,
+            fields: Optional[Iterable[str]] = None,
+            limit: Optional[int] = None,
+            sort: bool = True,
+    ) -> List[Dict[str, Any]]:
+        with translate_errors():
+            cursor = self.collection.find(query, projection(fields))
+            if sort:
+                cursor = cursor.sort(self.key, 1)
+            if limit is not None:
+                cursor = cursor.limit(limit)
+            return await cursor.to_list(None)
+
+    async def iterate(
+            self, query: Query, fields: Optional[Iterable[str]] = None, batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        with translate_errors():
+            cursor = (
+                self.collection.find(query, projection(fields))
+                .sort(self.key, 1)
+                .batch_size(batch_size)
+            )
+            async for document in cursor:
+                yield document
+
+    async def insert_one(self, document: Mapping[str, Any]) -> None:
+        with translate_errors():
+            await self.collection.insert_one(dict(document))
+
+    async def insert_many(self, documents: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        try:
+            await self.collection.insert_many(
+                [dict(document) for document in documents], ordered=False
+            )
+            return []
+        except errors.BulkWriteError as bwe:
+            return [
+                {
+                    "index": write_error["index"],
+                    "duplicate": write_error["code"] == DUPLICATE_KEY_CODE,
+                    "message": write_error["errmsg"],
+                }
+                for write_error in bwe.details.get("writeErrors", [])
+            ]
+        except errors.PyMongoError as pe:
+            raise StorageError(str(pe)) from pe
+
+    async def update(
+            self, query: Query, changes: Mapping[str, Any], many: bool = False
+    ) -> UpdateResult:
+        # Поисковые поля пересчитываются конвейером в том же запросе
+        pipeline = build_update_pipeline(changes, SEARCH_FIELDS.get(self.name, ()))
+        with translate_errors():
+            if many:
+                result = await self.collection.update_many(query, pipeline)
+            else:
+                result = await self.collection.update_one(query, pipeline)
+        return UpdateResult(result.matched_count, result.modified_count)
+
+    async def increment(
+            self,
+            key: Any,
+            amounts: Mapping[str, int],
+            defaults: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        update: Dict[str, Any] = {"$inc": dict(amounts)}
+        if defaults:
+            update["$setOnInsert"] = dict(defaults)
+        with translate_errors():
+            await self.collection.update_one({self.key: key}, update, upsert=True)
+
+    async def delete(self, query: Query, many: bool = False) -> int:
+        with translate_errors():
+            if many:
+                result = await self.collection.delete_many(query)
+            else:
+                result = await self.collection.delete_one(query)
+        return result.deleted_count
+
+    async def find_one_and_delete(
+            self, query: Query, fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        with translate_errors():
+            return await self.collection.find_one_and_delete(query, projection(fields))
+
+    async def count_by(self, fields: Sequence[str]) -> Dict[Tuple[Any, ...], int]:
+        # Отсутствующее поле в выражении-массиве группируется как null
+        pipeline = [{"$group": {
+            "_id": [f"${field}" for field in fields],
+            "count": {"$sum": 1},
+        }}]
+        with translate_errors():
+            return {
+                tuple(group["_id"]): group["count"]
+                async for group in self.collection.aggregate(pipeline)
+            }
+
+    async def join(
+            self, query: Query, foreign: str, as_field: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        # Присоединение через $lookup использует уникальный индекс ключа
+        # присоединяемой коллекции
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": query},
+            {"$sort": {self.key: 1}},
+        ]
+        if limit is not None:
+            pipeline.append({"$limit": limit})
+        pipeline += [
+            {"$lookup": {
+                "from": foreign,
+                "localField": self.key,
+                "foreignField": COLLECTION_KEYS[foreign],
+                "as": as_field,
+            }},
+            {"$set": {
+                as_field: {"$ifNull": [{"$arrayElemAt": [f"${as_field}", 0]}, None]},
+            }},
+            {"$unset": [
+                *PRIVATE_FIELDS,
+                *(f"{as_field}.{field}" for field in PRIVATE_FIELDS),
+            ]},
+        ]
+        with translate_errors():
+            return [document async for document in self.collection.aggregate(pipeline)]
+
+
+class MongoEngine(StorageEngine):
+    """
+    Хранилище в MongoDB.
+
+    При старте создаёт клиент и индексы и запускает фоновые задачи:
+    заполнение поисковых полей и трансляцию change stream в шину событий.
+    """
+
+    name = "mongo"
+
+    def __init__(self) -> None:
+        self._repositories: Dict[str, MongoRepository] = {
+            name: MongoRepository(name) for name in COLLECTION_KEYS
+        }
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        connect_to_mongo()
+        await ensure_indexes()
+        self._tasks = [
+            asyncio.create_task(backfill_all(get_database())),
+            asyncio.create_task(watch_changes(get_database())),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        close_mongo_connection()
+
+    async def ping(self, timeout: float) -> None:
+        await ping_mongo(timeout)
+
+    def repository(self, name: str) -> MongoRepository:
+        return self._repositories[name]
+
+    async def index_report(self, collection: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await get_index_report(collection)
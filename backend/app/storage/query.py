@@ -0,0 +1,169 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Pattern
+
+# Символы регулярного выражения, после которых префикс перестаёт быть литералом
+_REGEX_SPECIAL = set(".^$*+?{}[]|()")
+
+# Отсутствующее поле документа
+_MISSING = object()
+
+
+@lru_cache(maxsize=1024)
+def _compile(pattern: str, options: str) -> Pattern[str]:
+    flags = re.IGNORECASE if "i" in options else 0
+    return re.compile(pattern, flags)
+
+
+def is_operator(condition: Any) -> bool:
+    """
+    Проверка, что условие на поле задано операторами ($gt, $in, ...).
+
+    Args:
+        condition (Any): Условие из фильтра.
+
+    Returns:
+        bool: True, если это словарь операторов, а не значение для сравнения.
+    """
+    return isinstance(condition, Mapping) and any(key.startswith("$") for key in condition)
+
+
+def literal_prefix(condition: Mapping[str, Any]) -> Optional[str]:
+    """
+    Литеральный префикс, которым обязана начинаться строка, подходящая
+    под условие $regex.
+
+    Args:
+        condition (Mapping[str, Any]): Операторы условия на поле.
+
+    Returns:
+        Optional[str]: Префикс или None, если выражение не привязано к
+                       началу строки, не начинается с литерала или
+                       нечувствительно к регистру.
+    """
+    pattern = condition.get("$regex")
+    if not isinstance(pattern, str) or not pattern.startswith("^") or condition.get("$options"):
+        return None
+    prefix = []
+    index = 1
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\" and index + 1 < len(pattern) and not pattern[index + 1].isalnum():
+            prefix.append(pattern[index + 1])
+            index += 2
+            continue
+        if char in _REGEX_SPECIAL or char == "\\":
+            break
+        prefix.append(char)
+        index += 1
+    # Квантификатор относится к последнему символу префикса
+    if index < len(pattern) and pattern[index] in "*?{" and prefix:
+        prefix.pop()
+    return "".join(prefix) or None
+
+
+def _compare(value: Any, operator: str, operand: Any) -> bool:
+    """
+    Проверка одного значения поля оператором сравнения.
+
+    Args:
+        value (Any): Значение поля (элемент, если поле — массив).
+        operator (str): Оператор.
+        operand (Any): Аргумент оператора.
+
+    Returns:
+        bool: Результат сравнения; несравнимые типы не подходят.
+    """
+    try:
+        if operator == "$eq":
+            return value == operand
+        if operator == "$gt":
+            return value is not _MISSING and value > operand
+        if operator == "$gte":
+            return value is not _MISSING and value >= operand
+        if operator == "$lt":
+            return value is not _MISSING and value < operand
+        if operator == "$lte":
+            return value is not _MISSING and value <= operand
+        if operator == "$in":
+            return value in operand
+        if operator == "$regex":
+            return isinstance(value, str) and _compile(operand, "").search(value) is not None
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported query operator: {operator}")
+
+
+def _match_field(value: Any, condition: Any) -> bool:
+    """
+    Проверка значения поля условием. Для массивов условие выполняется,
+    если ему удовлетворяет сам массив или любой его элемент.
+
+    Args:
+        value (Any): Значение поля или _MISSING.
+        condition (Any): Значение для сравнения или словарь операторов.
+
+    Returns:
+        bool: True, если значение подходит.
+    """
+    operators: Dict[str, Any] = dict(condition) if is_operator(condition) else {"$eq": condition}
+    options = operators.pop("$options", "")
+    for operator, operand in operators.items():
+        if operator == "$exists":
+            if (value is not _MISSING) != bool(operand):
+                return False
+            continue
+        if operator == "$ne":
+            if _match_field(value, operand):
+                return False
+            continue
+        if operator == "$nin":
+            if _match_field(value, {"$in": operand}):
+                return False
+            continue
+        if operator == "$regex" and options:
+            candidates = value if isinstance(value, list) else [value]
+            pattern = _compile(operand, options)
+            if not any(isinstance(item, str) and pattern.search(item) for item in candidates):
+                return False
+            continue
+        if value is _MISSING:
+            if not (operator == "$eq" and operand is None or operator == "$in" and None in operand):
+                return False
+            continue
+        if _compare(value, operator, operand):
+            continue
+        if not (isinstance(value, list) and any(_compare(item, operator, operand) for item in value)):
+            return False
+    return True
+
+
+def matches(document: Mapping[str, Any], query: Mapping[str, Any]) -> bool:
+    """
+    Проверка документа фильтром в синтаксисе MongoDB.
+
+    Поддерживаются равенство, $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin,
+    $exists, $regex (с $options), $and и $or; поля верхнего уровня.
+
+    Args:
+        document (Mapping[str, Any]): Документ.
+        query (Mapping[str, Any]): Фильтр.
+
+    Returns:
+        bool: True, если документ подходит под фильтр.
+
+    Raises:
+        ValueError: Если фильтр содержит неподдерживаемый оператор.
+    """
+    for field, condition in query.items():
+        if field == "$and":
+            if not all(matches(document, clause) for clause in condition):
+                return False
+        elif field == "$or":
+            if not any(matches(document, clause) for clause in condition):
+                return False
+        elif field.startswith("$"):
+            raise ValueError(f"Unsupported query operator: {field}")
+        elif not _match_field(document.get(field, _MISSING), condition):
+            return False
+    return True
@@ -0,0 +1,9 @@
+from . import seeding
+from . import stats
+from . import workloads
+
+__all__: list[str] = [
+    "seeding",
+    "stats",
+    "workloads",
+]
@@ -0,0 +1,222 @@
+"""
+Нагрузочный прогон API.
+
+Приложение запускается в том же процессе через httpx.ASGITransport, база
+засевается тестовыми данными, затем каждая рабочая нагрузка выполняется
+заданным числом конкурентных клиентов. Результат (перцентили задержки и
+пропускная способность) выводится в формате JSON, чтобы прогоны до и после
+изменения можно было сравнивать.
+
+Запуск из каталога backend:
+
+    python -m benchmarks --mongo-uri mongodb://localhost:27017 --cars 10000
+
+Без MongoDB прогон выполняется на хранилище в памяти:
+
+    python -m benchmarks --engine memory --cars 10000
+"""
+import argparse
+import asyncio
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import httpx
+import orjson
+from .stats import summarize
+from .workloads import USER_PASSWORD, build_workloads, user_email
+from .seeding import seed_database
+
+APP_DIR: Path = Path(__file__).resolve().parent.parent / "app"
+WORKLOADS: List[str] = ["login", "add_car", "search", "get_all", "update"]
+ENGINES: List[str] = ["mongo", "memory"]
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """
+    Разбор аргументов командной строки.
+
+    Args:
+        argv (List[str]): Аргументы без имени программы.
+
+    Returns:
+        argparse.Namespace: Параметры прогона.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[1])
+    parser.add_argument("--engine", choices=ENGINES, default="mongo", help="Движок хранилища")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017", help="MongoDB для прогона")
+    parser.add_argument("--db-name", default=None, help="Имя базы (по умолчанию временная bench_<время>)")
+    parser.add_argument("--keep-db", action="store_true", help="Не удалять базу после прогона")
+    parser.add_argument("--cars", type=int, default=10000, help="Количество автомобилей для засева")
+    parser.add_argument("--registrations", type=int, default=10000, help="Количество регистраций")
+    parser.add_argument("--users", type=int, default=100, help="Количество пользователей")
+    parser.add_argument("--concurrency", type=int, default=32, help="Число конкурентных клиентов")
+    parser.add_argument("--requests", type=int, default=1000, help="Запросов на каждую нагрузку")
+    parser.add_argument("--warmup", type=int, default=50, help="Прогревочных запросов (не учитываются)")
+    parser.add_argument(
+        "--workloads", default=",".join(WORKLOADS),
+        help=f"Нагрузки через запятую из: {', '.join(WORKLOADS)}",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора")
+    parser.add_argument("--output", default=None, help="Файл для сохранения результата в JSON")
+    args = parser.parse_args(argv)
+
+    args.workloads = [name.strip() for name in args.workloads.split(",") if name.strip()]
+    unknown = sorted(set(args.workloads) - set(WORKLOADS))
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(unknown)}")
+    if min(args.cars, args.users, args.concurrency, args.requests) < 1:
+        parser.error("--cars, --users, --concurrency and --requests must be positive")
+    if args.db_name is None:
+        args.db_name = f"bench_{int(time.time())}"
+    # Прогон меняет рабочий каталог на каталог приложения
+    if args.output:
+        args.output = Path(args.output).resolve()
+    return args
+
+
+def git_revision() -> Optional[str]:
+    """
+    Текущая ревизия репозитория для привязки результата к коду.
+
+    Returns:
+        Optional[str]: Хэш коммита или None, если git недоступен.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=APP_DIR, capture_output=True,
+            text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_workload(
+        client: httpx.AsyncClient, next_request: Callable, total: int, concurrency: int
+) -> Dict[str, Any]:
+    """
+    Выполнение одной нагрузки конкурентными клиентами.
+
+    Args:
+        client (httpx.AsyncClient): Клиент, подключенный к приложению.
+        next_request (Callable): Фабрика запросов нагрузки.
+        total (int): Общее количество запросов.
+        concurrency (int): Число конкурентных клиентов.
+
+    Returns:
+        Dict[str, Any]: Сводка по задержкам и пропускной способности.
+    """
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            request = next_request()
+            started = time.perf_counter()
+            try:
+                response = await request(client)
+                status = str(response.status_code)
+                failed = response.status_code >= 400
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+    summary = summarize(latencies, errors, time.perf_counter() - started)
+    summary["statuses"] = statuses
+    return summary
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Полный прогон: запуск приложения, засев, нагрузки, очистка.
+
+    Args:
+        args (argparse.Namespace): Параметры прогона.
+
+    Returns:
+        Dict[str, Any]: Метаданные прогона и результаты по нагрузкам.
+    """
+    # Настройки приложения читаются из окружения при импорте
+    os.environ["APP_STORAGE_ENGINE"] = args.engine
+    os.environ["APP_MONGO_URI"] = args.mongo_uri
+    os.environ["APP_MONGO_DB_NAME"] = args.db_name
+    os.environ.setdefault("APP_LOG_LEVEL", "WARNING")
+    # Нагрузка идёт от одного пользователя и адреса, лимиты её бы отклоняли;
+    # адаптивный лимит отклонял бы запросы сверх заданной конкурентности
+    os.environ.setdefault("APP_RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("APP_CONCURRENCY_LIMIT_ENABLED", "false")
+    sys.path.insert(0, str(APP_DIR))
+    # Статические файлы подключаются по относительному пути
+    os.chdir(APP_DIR)
+    from main import app
+    from database import get_database
+
+    transport = httpx.ASGITransport(app=app)
+    results: Dict[str, Any] = {}
+    async with app.router.lifespan_context(app):
+        try:
+            seeded = await seed_database(args.cars, args.registrations, args.users)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                response = await client.post(
+                    "/auth/login", data={"username": user_email(0), "password": USER_PASSWORD}
+                )
+                response.raise_for_status()
+                factories = build_workloads(
+                    args.cars, args.users, response.json()["access_token"], args.seed
+                )
+                for name in args.workloads:
+                    if args.warmup:
+                        await run_workload(client, factories[name], args.warmup, args.concurrency)
+                    results[name] = await run_workload(
+                        client, factories[name], args.requests, args.concurrency
+                    )
+        finally:
+            if args.engine == "mongo" and not args.keep_db:
+                await get_database().client.drop_database(args.db_name)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "engine": args.engine,
+            "database": args.db_name if args.engine == "mongo" else None,
+            "seeded": seeded,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Точка входа: прогон и вывод результата.
+
+    Args:
+        argv (Optional[List[str]]): Аргументы командной строки.
+    """
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    output = orjson.dumps(asyncio.run(run(args)), option=orjson.OPT_INDENT_2)
+    if args.output:
+        args.output.write_bytes(output)
+    sys.stdout.buffer.write(output + b"\n")
+
+
+if __name__ == "__main__":
+    main()
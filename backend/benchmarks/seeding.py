@@ -0,0 +1,72 @@
+from typing import Any, Dict, List
+from .workloads import USER_PASSWORD, car_payload, registration_payload, user_email
+
+# Размер пакета вставки при засеве
+SEED_BATCH_SIZE: int = 1000
+
+
+async def _insert_batches(name: str, documents: List[Dict[str, Any]]) -> None:
+    """
+    Вставка документов пакетами по SEED_BATCH_SIZE.
+
+    Args:
+        name (str): Имя коллекции.
+        documents (List[Dict[str, Any]]): Документы для вставки.
+    """
+    from storage.engines import get_repository
+
+    repository = get_repository(name)
+    for start in range(0, len(documents), SEED_BATCH_SIZE):
+        await repository.insert_many(documents[start:start + SEED_BATCH_SIZE])
+
+
+async def seed_database(cars: int, registrations: int, users: int) -> Dict[str, int]:
+    """
+    Заполнение базы тестовыми данными.
+
+    Документы строятся теми же функциями, что и в CRUD, поэтому поисковые
+    поля заполнены так же, как при обычной вставке. Пароль всех
+    пользователей одинаков и хэшируется один раз. Модули приложения
+    импортируются внутри функции: настройки читаются из окружения при
+    импорте, а его задает запускающий модуль.
+
+    Args:
+        cars (int): Количество автомобилей.
+        registrations (int): Количество регистраций (не больше cars).
+        users (int): Количество пользователей.
+
+    Returns:
+        Dict[str, int]: Фактическое количество вставленных документов.
+    """
+    from crud.car_crud import car_to_document
+    from crud.registration_crud import registration_to_document
+    from models.car import Car
+    from models.registration import Registration
+    from security.hashing import hash_password
+
+    registrations = min(registrations, cars)
+    await _insert_batches(
+        "cars",
+        [car_to_document(Car(**car_payload(i))) for i in range(cars)],
+    )
+    await _insert_batches(
+        "registrations",
+        [
+            registration_to_document(Registration(**registration_payload(i)))
+            for i in range(registrations)
+        ],
+    )
+    hashed_password = hash_password(USER_PASSWORD)
+    await _insert_batches(
+        "users",
+        [
+            {
+                "first_name": "Bench",
+                "last_name": f"User{i}",
+                "email": user_email(i),
+                "hashed_password": hashed_password,
+            }
+            for i in range(users)
+        ],
+    )
+    return {"cars": cars, "registrations": registrations, "users": users}
@@ -0,0 +1,49 @@
+import math
+from typing import Any, Dict, List
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Перцентиль по методу ближайшего ранга.
+
+    Args:
+        sorted_values (List[float]): Отсортированные значения.
+        fraction (float): Доля от 0 до 1.
+
+    Returns:
+        float: Значение перцентиля (0.0 для пустого списка).
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """
+    Сводка по результатам одной рабочей нагрузки.
+
+    Args:
+        latencies (List[float]): Задержки успешных и неуспешных запросов (с).
+        errors (int): Количество ответов с ошибкой.
+        elapsed (float): Общее время выполнения нагрузки (с).
+
+    Returns:
+        Dict[str, Any]: Число запросов, ошибки, пропускная способность и
+                        перцентили задержки в миллисекундах.
+    """
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "min": round(values[0] * 1000, 3) if values else 0.0,
+            "p50": round(percentile(values, 0.50) * 1000, 3),
+            "p95": round(percentile(values, 0.95) * 1000, 3),
+            "p99": round(percentile(values, 0.99) * 1000, 3),
+            "max": round(values[-1] * 1000, 3) if values else 0.0,
+            "mean": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        },
+    }
@@ -0,0 +1,139 @@
+import itertools
+import random
+from typing import Any, Awaitable, Callable, Dict, List
+import httpx
+
+MAKES: List[str] = ["Toyota", "Lada", "Kia", "Hyundai", "Volkswagen", "Skoda", "Renault", "Nissan"]
+MODELS: List[str] = ["Camry", "Vesta", "Rio", "Solaris", "Polo", "Octavia", "Logan", "Qashqai"]
+OWNERS: List[str] = ["Иванов Иван", "Петров Петр", "Сидорова Анна", "Smith John", "Кузнецов Олег"]
+STREETS: List[str] = ["ул. Ленина", "пр. Мира", "ул. Гагарина", "Main st", "ул. Садовая"]
+
+USER_PASSWORD: str = "benchmark-password"
+
+# Запрос рабочей нагрузки: принимает HTTP-клиент, возвращает ответ
+Request = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+
+def car_plate(index: int) -> str:
+    """
+    Номерной знак засеянного автомобиля.
+
+    Args:
+        index (int): Порядковый номер автомобиля.
+
+    Returns:
+        str: Номерной знак, проходящий валидацию Car и Registration.
+    """
+    return f"B{index:07d}"
+
+
+def user_email(index: int) -> str:
+    """
+    E-mail засеянного пользователя.
+
+    Args:
+        index (int): Порядковый номер пользователя.
+
+    Returns:
+        str: E-mail.
+    """
+    return f"bench{index}@example.com"
+
+
+def car_payload(index: int) -> Dict[str, Any]:
+    """
+    Данные автомобиля для засева и нагрузки add_car.
+
+    Args:
+        index (int): Порядковый номер автомобиля.
+
+    Returns:
+        Dict[str, Any]: Поля модели Car.
+    """
+    return {
+        "make": MAKES[index % len(MAKES)],
+        "model": MODELS[index % len(MODELS)],
+        "license_plate": car_plate(index),
+    }
+
+
+def registration_payload(index: int) -> Dict[str, Any]:
+    """
+    Данные регистрации для засева.
+
+    Args:
+        index (int): Порядковый номер автомобиля.
+
+    Returns:
+        Dict[str, Any]: Поля модели Registration.
+    """
+    return {
+        "license_plate": car_plate(index),
+        "owner_name": OWNERS[index % len(OWNERS)],
+        "owner_address": f"{STREETS[index % len(STREETS)]} {index % 200 + 1}",
+        "year_of_manufacture": 1990 + index % 30,
+    }
+
+
+def build_workloads(
+        cars: int, users: int, token: str, seed: int = 0
+) -> Dict[str, Callable[[], Request]]:
+    """
+    Построение фабрик запросов для каждой рабочей нагрузки.
+
+    Каждая фабрика при вызове возвращает следующий запрос; add_car
+    использует номера за пределами засеянного диапазона, поэтому
+    вставки не конфликтуют с существующими данными.
+
+    Args:
+        cars (int): Количество засеянных автомобилей.
+        users (int): Количество засеянных пользователей.
+        token (str): JWT-токен для авторизованных запросов.
+        seed (int): Начальное значение генератора случайных чисел.
+
+    Returns:
+        Dict[str, Callable[[], Request]]: Имя нагрузки -> фабрика запросов.
+    """
+    rng = random.Random(seed)
+    headers = {"Authorization": f"Bearer {token}"}
+    new_plates = itertools.count(cars)
+
+    def login() -> Request:
+        email = user_email(rng.randrange(users))
+        return lambda client: client.post(
+            "/auth/login", data={"username": email, "password": USER_PASSWORD}
+        )
+
+    def add_car() -> Request:
+        payload = car_payload(next(new_plates))
+        return lambda client: client.post("/carsdb/add_car/", json=payload, headers=headers)
+
+    def search() -> Request:
+        if rng.random() < 0.5:
+            query = car_plate(rng.randrange(cars))[:rng.randint(2, 6)]
+        else:
+            query = rng.choice(MAKES)[:rng.randint(2, 5)]
+        return lambda client: client.get(
+            "/carsdb/search_cars/", params={"query": query}, headers=headers
+        )
+
+    def get_all() -> Request:
+        after = car_plate(rng.randrange(cars))
+        return lambda client: client.get(
+            "/carsdb/get_cars/", params={"limit": 100, "after": after}, headers=headers
+        )
+
+    def update() -> Request:
+        index = rng.randrange(cars)
+        payload = {"model": f"{MODELS[rng.randrange(len(MODELS))]} {rng.randrange(100)}"}
+        return lambda client: client.put(
+            f"/carsdb/update_car/{car_plate(index)}", json=payload, headers=headers
+        )
+
+    return {
+        "login": login,
+        "add_car": add_car,
+        "search": search,
+        "get_all": get_all,
+        "update": update,
+    }
@@ -0,0 +1,78 @@
+"""
+Общие фикстуры тестов.
+
+Тесты выполняются на хранилище в памяти, без MongoDB. Приложение
+импортируется из каталога app так же, как при запуске server.py, поэтому
+переменные окружения задаются до импорта настроек. Ограничения частоты и
+одновременности запросов отключены: тесты проверяют поведение маршрутов,
+а не лимиты.
+
+Запуск из каталога backend:
+
+    python -m pytest -q tests
+"""
+import itertools
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterator
+import pytest
+
+APP_DIR: Path = Path(__file__).resolve().parent.parent / "app"
+
+os.environ["APP_STORAGE_ENGINE"] = "memory"
+os.environ.setdefault("APP_LOG_LEVEL", "WARNING")
+os.environ.setdefault("APP_RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("APP_CONCURRENCY_LIMIT_ENABLED", "false")
+os.environ.setdefault("APP_ANALYTICS_RECOMPUTE_SECONDS", "3600")
+os.environ.setdefault("APP_SHUTDOWN_DRAIN_DELAY_SECONDS", "0")
+sys.path.insert(0, str(APP_DIR))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+_plates = itertools.count(1)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def plate() -> str:
+    """
+    Уникальный номерной знак для теста (данные приложения общие на сессию).
+    """
+    return f"T{next(_plates):06d}"
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    """
+    Клиент приложения; lifespan выполняется один раз на сессию.
+    """
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client: TestClient) -> Dict[str, str]:
+    """
+    Заголовок авторизации зарегистрированного пользователя.
+    """
+    credentials = {"email": "tester@example.com", "password": "secret123"}
+    response = client.post("/auth/register", json={
+        **credentials,
+        "confirm_password": credentials["password"],
+        "first_name": "Test",
+        "last_name": "User",
+    })
+    assert response.status_code == 200, response.text
+    response = client.post(
+        "/auth/login",
+        data={"username": credentials["email"], "password": credentials["password"]},
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
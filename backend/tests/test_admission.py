@@ -0,0 +1,57 @@
+"""
+Адаптивный лимит одновременных запросов: реакция на ответы и ошибки.
+"""
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from admission.limiter import AdaptiveLimiter
+from admission.middleware import ConcurrencyLimitMiddleware
+from config import settings
+
+
+def make_limiter() -> AdaptiveLimiter:
+    return AdaptiveLimiter(
+        initial_limit=2, min_limit=1, max_limit=100, target_latency=10.0, backoff=0.5
+    )
+
+
+def make_client(limiter: AdaptiveLimiter, monkeypatch) -> TestClient:
+    monkeypatch.setattr(settings, "concurrency_limit_enabled", True)
+
+    async def ok(request):
+        return PlainTextResponse("ok")
+
+    async def unavailable(request):
+        return PlainTextResponse("db timeout", status_code=500)
+
+    async def broken(request):
+        raise RuntimeError("db down")
+
+    app = Starlette(routes=[
+        Route("/ok", ok),
+        Route("/unavailable", unavailable),
+        Route("/broken", broken),
+    ])
+    app.add_middleware(ConcurrencyLimitMiddleware, limiter=limiter)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_fast_success_grows_limit(monkeypatch) -> None:
+    limiter = make_limiter()
+    client = make_client(limiter, monkeypatch)
+    for _ in range(5):
+        assert client.get("/ok").status_code == 200
+    assert limiter.limit > 2 and limiter.decreases == 0 and limiter.in_flight == 0
+
+
+@pytest.mark.parametrize("path", ["/unavailable", "/broken"])
+def test_server_errors_shrink_limit(monkeypatch, path: str) -> None:
+    limiter = make_limiter()
+    client = make_client(limiter, monkeypatch)
+    assert client.get(path).status_code == 500
+    assert limiter.limit == 1 and limiter.increases == 0 and limiter.in_flight == 0
+    # Следующие ошибки в пределах target_latency лимит повторно не уменьшают
+    client.get(path)
+    assert limiter.limit == 1 and limiter.decreases == 1
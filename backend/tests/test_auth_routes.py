@@ -0,0 +1,48 @@
+"""
+Маршруты /auth: регистрация, вход и проверка токена.
+"""
+from typing import Dict
+from fastapi.testclient import TestClient
+
+USER = {
+    "email": "auth@example.com",
+    "password": "secret123",
+    "confirm_password": "secret123",
+    "first_name": "Auth",
+    "last_name": "User",
+}
+
+
+def test_register_login_and_protected(client: TestClient) -> None:
+    assert client.post("/auth/register", json=USER).status_code == 200
+    assert client.post("/auth/register", json=USER).status_code == 400
+    response = client.post("/auth/login", data={"username": USER["email"], "password": "wrong-one"})
+    assert response.status_code == 401
+    response = client.post("/auth/login", data={"username": USER["email"], "password": USER["password"]})
+    assert response.status_code == 200
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert client.get("/auth/protected", headers=headers).status_code == 200
+
+
+def test_register_rejects_mismatched_passwords(client: TestClient) -> None:
+    response = client.post("/auth/register", json={
+        **USER, "email": "other@example.com", "confirm_password": "different1",
+    })
+    assert response.status_code in (400, 422)
+
+
+def test_protected_routes_require_token(client: TestClient) -> None:
+    assert client.get("/auth/protected").status_code == 401
+    assert client.get("/carsdb/get_cars/", params={"limit": 1}).status_code == 401
+    headers = {"Authorization": "Bearer not-a-token"}
+    assert client.get("/carsdb/get_cars/", params={"limit": 1}, headers=headers).status_code == 401
+
+
+def test_stream_ticket_is_not_an_access_token(
+        client: TestClient, auth_headers: Dict[str, str]
+) -> None:
+    response = client.post("/events/ticket", headers=auth_headers)
+    assert response.status_code == 200
+    ticket = {"Authorization": f"Bearer {response.json()['ticket']}"}
+    assert client.get("/auth/protected", headers=ticket).status_code == 401
+    assert client.get("/carsdb/get_cars/", params={"limit": 1}, headers=ticket).status_code == 401
@@ -0,0 +1,70 @@
+"""
+Пакетные операции по номерам: ограничение фильтра и статусы при гонке.
+"""
+from typing import Any, Dict, List
+import pytest
+from cache.read_through import ReadThroughCache
+from crud import batch
+from crud.batch import CONFLICT_STATUS, apply_by_plates, matched_count, resolve_plates
+from storage.memory import MemoryEngine, MemoryRepository
+
+pytestmark = pytest.mark.anyio
+
+cache = ReadThroughCache("batch-tests")
+
+
+@pytest.fixture
+async def cars() -> MemoryRepository:
+    repository = MemoryEngine().repository("cars")
+    await repository.insert_many([
+        {"license_plate": f"B{number}", "make": "Lada", "model": "Vesta"} for number in range(5)
+    ])
+    return repository
+
+
+def statuses(results: List[Dict[str, str]]) -> Dict[str, str]:
+    return {result["license_plate"]: result["status"] for result in results}
+
+
+async def test_filter_is_capped(cars: MemoryRepository, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(batch, "MAX_BATCH_PLATES", 3)
+    with pytest.raises(ValueError):
+        await resolve_plates(cars, None, {"make": "Lada"})
+    assert await resolve_plates(cars, None, {"license_plate": {"$in": ["B1", "B0"]}}) == ["B0", "B1"]
+    assert await resolve_plates(cars, ["B1", "B1", "X"], None) == ["B1", "X"]
+
+
+async def test_update_status_comes_from_write(cars: MemoryRepository) -> None:
+    applied: List[Dict[str, Any]] = []
+
+    async def racing_update(plate_filter: Dict[str, Any]) -> int:
+        # Другой запрос удаляет номер между чтением и записью
+        await cars.delete({"license_plate": "B1"})
+        return await matched_count(cars.update(plate_filter, {"model": "Niva"}, many=True))
+
+    results = await apply_by_plates(
+        cars, cache, ["B0", "B1", "X"], racing_update, "updated", ("make",), applied.extend
+    )
+    assert statuses(results) == {"B0": "updated", "B1": "not_found", "X": "not_found"}
+    assert [document["license_plate"] for document in applied] == ["B0"]
+
+
+async def test_delete_race_is_reported_as_conflict(cars: MemoryRepository) -> None:
+    applied: List[Dict[str, Any]] = []
+
+    async def racing_delete(plate_filter: Dict[str, Any]) -> int:
+        await cars.delete({"license_plate": "B1"})
+        return await cars.delete(plate_filter, many=True)
+
+    results = await apply_by_plates(
+        cars, cache, ["B0", "B1"], racing_delete, "deleted", (), applied.extend, removes=True
+    )
+    assert statuses(results) == {"B0": CONFLICT_STATUS, "B1": CONFLICT_STATUS}
+    assert applied == []
+
+    results = await apply_by_plates(
+        cars, cache, ["B2", "X"], lambda plate_filter: cars.delete(plate_filter, many=True),
+        "deleted", (), applied.extend, removes=True,
+    )
+    assert statuses(results) == {"B2": "deleted", "X": "not_found"}
+    assert applied == [{"license_plate": "B2"}]
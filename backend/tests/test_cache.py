@@ -0,0 +1,36 @@
+"""
+Кэш чтения и объединение одновременных чтений: результаты не разделяются
+между вызывающими.
+"""
+import asyncio
+import pytest
+from cache.backends import MemoryCacheBackend
+from cache.single_flight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_memory_backend_returns_copies() -> None:
+    backend = MemoryCacheBackend(10)
+    await backend.set("key", {"value": {"plate": "A001AA", "tokens": ["a"]}}, 60)
+    first = await backend.get("key")
+    first["value"].pop("tokens")
+    assert await backend.get("key") == {"value": {"plate": "A001AA", "tokens": ["a"]}}
+
+
+async def test_single_flight_gives_each_waiter_a_copy() -> None:
+    flights = SingleFlight()
+    loads = 0
+
+    async def loader():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return [{"plate": "A001AA", "tokens": ["a"]}]
+
+    first, second = await asyncio.gather(
+        flights.do("key", "test", loader), flights.do("key", "test", loader)
+    )
+    first[0].pop("tokens")
+    assert loads == 1 and flights.coalesced == 1
+    assert second == [{"plate": "A001AA", "tokens": ["a"]}]
@@ -0,0 +1,161 @@
+"""
+Маршруты /carsdb на хранилище в памяти.
+"""
+from typing import Any, Dict
+from fastapi.testclient import TestClient
+
+
+def add_car(
+        client: TestClient, headers: Dict[str, str], plate: str, make: str = "Lada", model: str = "Vesta"
+) -> Any:
+    return client.post(
+        "/carsdb/add_car/",
+        json={"license_plate": plate, "make": make, "model": model},
+        headers=headers,
+    )
+
+
+def test_add_get_update_delete_car(
+        client: TestClient, auth_headers: Dict[str, str], plate: str
+) -> None:
+    assert add_car(client, auth_headers, plate).status_code == 200
+    assert add_car(client, auth_headers, plate).status_code == 400
+    response = client.get(f"/carsdb/get_car/{plate}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["car"] == {"license_plate": plate, "make": "Lada", "model": "Vesta"}
+
+    response = client.put(f"/carsdb/update_car/{plate}", json={"model": "Granta"}, headers=auth_headers)
+    assert response.status_code == 200
+    car = client.get(f"/carsdb/get_car/{plate}", headers=auth_headers).json()["car"]
+    assert car["model"] == "Granta"
+
+    assert client.delete(f"/carsdb/delete_car/{plate}", headers=auth_headers).status_code == 200
+    assert client.get(f"/carsdb/get_car/{plate}", headers=auth_headers).status_code == 404
+    assert client.delete(f"/carsdb/delete_car/{plate}", headers=auth_headers).status_code == 404
+
+
+def test_add_car_validates_fields(client: TestClient, auth_headers: Dict[str, str]) -> None:
+    assert add_car(client, auth_headers, "bad plate").status_code == 422
+    assert add_car(client, auth_headers, "VALID1", make="L4da!").status_code == 422
+
+
+def test_update_car_rejects_invalid_changes(
+        client: TestClient, auth_headers: Dict[str, str], plate: str
+) -> None:
+    add_car(client, auth_headers, plate)
+    for changes in ({"license_plate": "OTHER1"}, {"make": 42}, {"color": "red"}):
+        response = client.put(f"/carsdb/update_car/{plate}", json=changes, headers=auth_headers)
+        assert response.status_code == 400, changes
+    response = client.put(f"/carsdb/update_car/{plate}", json={"model": "Vesta"}, headers=auth_headers)
+    assert response.status_code == 404
+    car = client.get(f"/carsdb/get_car/{plate}", headers=auth_headers).json()["car"]
+    assert car["make"] == "Lada"
+
+
+def test_search_finds_by_plate_prefix_and_words(
+        client: TestClient, auth_headers: Dict[str, str], plate: str
+) -> None:
+    add_car(client, auth_headers, plate, make="Zaporozhets", model="Classic")
+    response = client.get("/carsdb/search_cars/", params={"query": plate}, headers=auth_headers)
+    assert [car["license_plate"] for car in response.json()["cars"]][0] == plate
+    response = client.get("/carsdb/search_cars/", params={"query": "zaporo"}, headers=auth_headers)
+    assert plate in [car["license_plate"] for car in response.json()["cars"]]
+    assert all("_search_tokens" not in car for car in response.json()["cars"])
+
+
+def test_get_cars_pages_by_plate(client: TestClient, auth_headers: Dict[str, str]) -> None:
+    for plate in ("PAGE001", "PAGE002", "PAGE003"):
+        add_car(client, auth_headers, plate)
+    seen = []
+    after = "PAGE000"
+    while True:
+        response = client.get(
+            "/carsdb/get_cars/", params={"limit": 2, "after": after}, headers=auth_headers
+        )
+        assert response.status_code == 200
+        body = response.json()
+        seen += [car["license_plate"] for car in body["cars"]]
+        if body["next_after"] is None:
+            break
+        after = body["next_after"]
+    assert seen == sorted(seen)
+    assert {"PAGE001", "PAGE002", "PAGE003"} <= set(seen)
+
+
+def test_get_cars_without_limit_streams_whole_list(
+        client: TestClient, auth_headers: Dict[str, str]
+) -> None:
+    for plate in ("FULL001", "FULL002"):
+        add_car(client, auth_headers, plate)
+    response = client.get("/carsdb/get_cars/", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    body = response.json()
+    plates = [car["license_plate"] for car in body["cars"]]
+    assert {"FULL001", "FULL002"} <= set(plates) and plates == sorted(plates)
+    assert body["user"] == "tester@example.com"
+    assert all(set(car) == {"license_plate", "make", "model"} for car in body["cars"])
+
+
+def test_cars_with_registrations_and_lookup(
+        client: TestClient, auth_headers: Dict[str, str], plate: str
+) -> None:
+    add_car(client, auth_headers, plate)
+    client.post("/regdb/add_registration/", json={
+        "license_plate": plate,
+        "owner_name": "Ivan",
+        "owner_address": "Moscow",
+        "year_of_manufacture": 2015,
+    }, headers=auth_headers)
+    response = client.get(
+        "/carsdb/get_cars_with_registrations/",
+        params={"limit": 1, "after": plate[:-1] + chr(ord(plate[-1]) - 1)},
+        headers=auth_headers,
+    )
+    car = response.json()["cars"][0]
+    assert car["license_plate"] == plate and car["registration"]["owner_name"] == "Ivan"
+
+    response = client.post(
+        "/carsdb/lookup_cars/", json={"license_plates": [plate, "MISSING9"]}, headers=auth_headers
+    )
+    body = response.json()
+    assert [car["license_plate"] for car in body["cars"]] == [plate]
+    assert body["missing"] == ["MISSING9"]
+
+
+def test_batch_update_and_delete_by_plates(
+        client: TestClient, auth_headers: Dict[str, str], plate: str
+) -> None:
+    add_car(client, auth_headers, plate)
+    response = client.post("/carsdb/update_cars/", json={
+        "license_plates": [plate, "MISSING8"], "update": {"model": "Niva"},
+    }, headers=auth_headers)
+    body = response.json()
+    assert {result["license_plate"]: result["status"] for result in body["results"]} == {
+        plate: "updated", "MISSING8": "not_found",
+    }
+    response = client.post(
+        "/carsdb/delete_cars/", json={"license_plates": [plate]}, headers=auth_headers
+    )
+    assert response.json()["results"] == [{"license_plate": plate, "status": "deleted"}]
+    assert client.get(f"/carsdb/get_car/{plate}", headers=auth_headers).status_code == 404
+
+
+def test_batch_requires_exactly_one_target(
+        client: TestClient, auth_headers: Dict[str, str]
+) -> None:
+    for body in ({}, {"filter": {}}, {"license_plates": ["A1"], "filter": {"make": "Lada"}}):
+        assert client.post("/carsdb/delete_cars/", json=body, headers=auth_headers).status_code == 422
+
+
+def test_import_and_export_csv(client: TestClient, auth_headers: Dict[str, str]) -> None:
+    csv = "license_plate,make,model\nIMP001,Kia,Rio\nIMP002,Kia,Ceed\n"
+    response = client.post(
+        "/carsdb/import_cars/",
+        files={"file": ("cars.csv", csv, "text/csv")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    response = client.get("/carsdb/export_cars/", params={"format": "csv"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert "IMP001" in response.text and "IMP002" in response.text
@@ -0,0 +1,198 @@
+"""
+Контракт Repository на хранилище в памяти.
+"""
+from typing import Any, Dict, Iterator, List
+import pytest
+from search.tokens import SEARCH_FIELDS, TOKENS_KEY, build_search_fields
+from storage.base import DuplicateKeyError, StorageError
+from storage import memory
+from storage.memory import KeyRange, MemoryEngine, MemoryRepository
+
+pytestmark = pytest.mark.anyio
+
+
+def car(plate: str, make: str = "Lada", model: str = "Vesta") -> Dict[str, Any]:
+    document = {"license_plate": plate, "make": make, "model": model}
+    document.update(build_search_fields(document, SEARCH_FIELDS["cars"]))
+    return document
+
+
+def plates(documents: List[Dict[str, Any]]) -> List[str]:
+    return [document["license_plate"] for document in documents]
+
+
+class CountingKeyRange(KeyRange):
+    """
+    Участок индекса, считающий прочитанные ключи.
+    """
+
+    reads = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        for key in super().__iter__():
+            CountingKeyRange.reads += 1
+            yield key
+
+
+@pytest.fixture
+def engine() -> MemoryEngine:
+    return MemoryEngine()
+
+
+@pytest.fixture
+async def cars(engine: MemoryEngine) -> MemoryRepository:
+    repository = engine.repository("cars")
+    await repository.insert_many([
+        car("C300", "Kia", "Rio"),
+        car("A100", "Lada", "Vesta"),
+        car("B200", "Lada", "Granta"),
+        car("A150", "Kia", "Ceed"),
+    ])
+    return repository
+
+
+async def test_find_returns_documents_in_key_order(cars: MemoryRepository) -> None:
+    assert plates(await cars.find({})) == ["A100", "A150", "B200", "C300"]
+    assert plates(await cars.find({"make": "Lada"})) == ["A100", "B200"]
+    assert plates(await cars.find({}, limit=2)) == ["A100", "A150"]
+
+
+async def test_find_projects_fields_and_returns_copies(cars: MemoryRepository) -> None:
+    document = await cars.find_one({"license_plate": "A100"}, ["license_plate", "make"])
+    assert document == {"license_plate": "A100", "make": "Lada"}
+    document["make"] = "Changed"
+    assert (await cars.find_one({"license_plate": "A100"}))["make"] == "Lada"
+
+
+async def test_insert_rejects_duplicate_key(cars: MemoryRepository) -> None:
+    with pytest.raises(DuplicateKeyError):
+        await cars.insert_one(car("A100"))
+    errors = await cars.insert_many([car("D400"), car("A100"), car("D400")])
+    assert [(error["index"], error["duplicate"]) for error in errors] == [(1, True), (2, True)]
+    assert len(cars) == 5
+
+
+async def test_update_renames_key_and_reindexes(cars: MemoryRepository) -> None:
+    result = await cars.update({"license_plate": "A100"}, {"license_plate": "Z999", "make": "Uaz"})
+    assert (result.matched, result.modified) == (1, 1)
+    assert await cars.find_one({"license_plate": "A100"}) is None
+    assert plates(await cars.find({"make": "Uaz"})) == ["Z999"]
+    assert plates(await cars.find({TOKENS_KEY: "uaz"})) == ["Z999"]
+
+
+async def test_update_to_duplicate_key_changes_nothing(cars: MemoryRepository) -> None:
+    with pytest.raises(DuplicateKeyError):
+        await cars.update({"make": "Kia"}, {"license_plate": "B200"}, many=True)
+    assert plates(await cars.find({"make": "Kia"})) == ["A150", "C300"]
+    assert plates(await cars.find({"license_plate": {"$regex": "^B"}})) == ["B200"]
+
+
+async def test_update_with_incompatible_type_rolls_back(cars: MemoryRepository) -> None:
+    with pytest.raises(StorageError):
+        await cars.update({"make": "Lada"}, {"model": 42}, many=True)
+    assert plates(await cars.find({"model": "Vesta"})) == ["A100"]
+    assert plates(await cars.find({"model": {"$gte": "A"}})) == ["A100", "A150", "B200", "C300"]
+
+
+async def test_update_many_counts_matched_and_modified(cars: MemoryRepository) -> None:
+    result = await cars.update({"make": "Kia"}, {"model": "Rio"}, many=True)
+    assert (result.matched, result.modified) == (2, 1)
+
+
+async def test_delete_one_and_many(cars: MemoryRepository) -> None:
+    assert await cars.delete({"make": "Kia"}) == 1
+    assert plates(await cars.find({"make": "Kia"})) == ["C300"]
+    assert await cars.delete({"make": "Lada"}, many=True) == 2
+    assert plates(await cars.find({})) == ["C300"]
+    assert await cars.find({"make": "Lada"}) == []
+
+
+async def test_find_one_and_delete_returns_deleted_document(cars: MemoryRepository) -> None:
+    document = await cars.find_one_and_delete({"license_plate": "B200"}, ["make"])
+    assert document == {"make": "Lada"}
+    assert await cars.find_one_and_delete({"license_plate": "B200"}) is None
+    assert plates(await cars.find({"make": "Lada"})) == ["A100"]
+
+
+async def test_in_and_range_conditions(cars: MemoryRepository) -> None:
+    assert plates(await cars.find({"license_plate": {"$in": ["C300", "A100", "X000"]}})) == [
+        "A100", "C300",
+    ]
+    assert plates(await cars.find({"model": {"$in": ["Rio", "Ceed"]}})) == ["A150", "C300"]
+    assert plates(await cars.find({"license_plate": {"$gt": "A100", "$lt": "C300"}})) == [
+        "A150", "B200",
+    ]
+    assert plates(await cars.find({"license_plate": {"$gte": "B200"}})) == ["B200", "C300"]
+
+
+async def test_or_merges_clauses_without_duplicates(cars: MemoryRepository) -> None:
+    query = {"$or": [
+        {"license_plate": {"$regex": "^A"}},
+        {"license_plate": {"$in": ["A100", "C300"]}},
+    ]}
+    assert plates(await cars.find(query)) == ["A100", "A150", "C300"]
+    query = {"$or": [{"license_plate": {"$regex": "^A1"}}, {"license_plate": "B200"}]}
+    assert plates(await cars.find(query)) == ["A100", "A150", "B200"]
+    query = {"$or": [{"license_plate": {"$regex": "^A"}}, {TOKENS_KEY: {"$regex": "^gr"}}]}
+    assert sorted(plates(await cars.find(query, sort=False))) == ["A100", "A150", "B200"]
+
+
+async def test_or_with_limit_reads_only_needed_keys(
+        engine: MemoryEngine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repository = engine.repository("cars")
+    await repository.insert_many([car(f"A{number:04d}") for number in range(1000)])
+    await repository.insert_many([car(f"B{number:04d}", "Kia") for number in range(1000)])
+    monkeypatch.setattr(memory, "KeyRange", CountingKeyRange)
+    monkeypatch.setattr(CountingKeyRange, "reads", 0)
+    query = {"$or": [
+        {"license_plate": {"$regex": "^A"}},
+        {TOKENS_KEY: {"$regex": "^ki"}},
+    ]}
+    assert len(await repository.find(query, limit=5, sort=False)) == 5
+    assert CountingKeyRange.reads == 5
+    query = {"$or": [{"license_plate": {"$regex": "^A"}}, {"license_plate": {"$regex": "^B"}}]}
+    assert plates(await repository.find(query, limit=3)) == ["A0000", "A0001", "A0002"]
+    assert CountingKeyRange.reads <= 10
+
+
+async def test_unindexed_condition_is_checked_on_candidates(cars: MemoryRepository) -> None:
+    assert plates(await cars.find({"make": "Lada", "model": "Granta"})) == ["B200"]
+    assert plates(await cars.find({"$and": [{"make": "Kia"}, {"license_plate": "C300"}]})) == [
+        "C300",
+    ]
+
+
+async def test_count_by_groups_documents(cars: MemoryRepository) -> None:
+    assert await cars.count_by(["make"]) == {("Lada",): 2, ("Kia",): 2}
+    counts = await cars.count_by(["make", "model"])
+    assert counts[("Kia", "Rio")] == 1 and sum(counts.values()) == 4
+
+
+async def test_join_attaches_foreign_document(engine: MemoryEngine, cars: MemoryRepository) -> None:
+    registrations = engine.repository("registrations")
+    await registrations.insert_one({
+        "license_plate": "B200",
+        "owner_name": "Ivan",
+        "owner_address": "Moscow",
+        "year_of_manufacture": 2020,
+    })
+    joined = await cars.join({"make": "Lada"}, "registrations", "registration")
+    assert plates(joined) == ["A100", "B200"]
+    assert joined[0]["registration"] is None
+    assert joined[1]["registration"]["owner_name"] == "Ivan"
+    assert TOKENS_KEY not in joined[1] and TOKENS_KEY not in joined[1]["registration"]
+    assert plates(await cars.join({}, "registrations", "registration", limit=1)) == ["A100"]
+
+
+async def test_increment_creates_and_updates_document(engine: MemoryEngine) -> None:
+    days = engine.repository("analytics_days")
+    await days.increment("cars:2024-01-01", {"added": 2}, {"collection": "cars"})
+    await days.increment("cars:2024-01-01", {"added": 1, "removed": 1})
+    document = await days.find_one({"key": "cars:2024-01-01"})
+    assert (document["added"], document["removed"], document["collection"]) == (3, 1, "cars")
+
+
+async def test_iterate_yields_all_documents(cars: MemoryRepository) -> None:
+    documents = [document async for document in cars.iterate({}, ["license_plate"], batch_size=3)]
+    assert plates(documents) == ["A100", "A150", "B200", "C300"]
@@ -0,0 +1,62 @@
+"""
+Маршруты /regdb на хранилище в памяти.
+"""
+from typing import Any, Dict
+from fastapi.testclient import TestClient
+
+
+def add_registration(
+        client: TestClient, headers: Dict[str, str], plate: str, owner: str = "Ivan", year: int = 2015
+) -> Any:
+    return client.post("/regdb/add_registration/", json={
+        "license_plate": plate,
+        "owner_name": owner,
+        "owner_address": "Moscow, Lenina 1",
+        "year_of_manufacture": year,
+    }, headers=headers)
+
+
+def test_add_get_update_delete_registration(
+        client: TestClient, auth_headers: Dict[str, str], plate: str
+) -> None:
+    assert add_registration(client, auth_headers, plate).status_code == 200
+    assert add_registration(client, auth_headers, plate).status_code == 400
+    response = client.get(f"/regdb/get_registration/{plate}", headers=auth_headers)
+    assert response.json()["registration"]["owner_name"] == "Ivan"
+
+    response = client.put(
+        f"/regdb/update_registration/{plate}", json={"owner_name": "Petr"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    response = client.get(f"/regdb/get_registration/{plate}", headers=auth_headers)
+    assert response.json()["registration"]["owner_name"] == "Petr"
+
+    response = client.put(
+        f"/regdb/update_registration/{plate}", json={"year_of_manufacture": "old"}, headers=auth_headers
+    )
+    assert response.status_code == 400
+
+    assert client.delete(f"/regdb/delete_registration/{plate}", headers=auth_headers).status_code == 200
+    assert client.get(f"/regdb/get_registration/{plate}", headers=auth_headers).status_code == 404
+
+
+def test_search_and_pages(client: TestClient, auth_headers: Dict[str, str], plate: str) -> None:
+    add_registration(client, auth_headers, plate, owner="Afanasiy")
+    response = client.get(
+        "/regdb/search_registrations/", params={"query": "afanas"}, headers=auth_headers
+    )
+    assert plate in [registration["license_plate"] for registration in response.json()["registrations"]]
+    response = client.get("/regdb/get_registrations/", params={"limit": 1}, headers=auth_headers)
+    body = response.json()
+    assert len(body["registrations"]) == 1 and "next_after" in body
+
+
+def test_batch_update_by_filter(client: TestClient, auth_headers: Dict[str, str], plate: str) -> None:
+    add_registration(client, auth_headers, plate, owner="Filtered", year=1999)
+    response = client.post("/regdb/update_registrations/", json={
+        "filter": {"plate_prefix": plate}, "update": {"owner_address": "Kazan"},
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["summary"].get("updated") == 1
+    response = client.get(f"/regdb/get_registration/{plate}", headers=auth_headers)
+    assert response.json()["registration"]["owner_address"] == "Kazan"
@@ -0,0 +1,45 @@
+"""
+Поиск: кандидаты по каждому условию запроса и ранжирование.
+"""
+from typing import Any, Dict, List
+import pytest
+from search.engine import search_documents
+from search.tokens import SEARCH_FIELDS, build_search_fields
+from storage.memory import MemoryEngine, MemoryRepository
+
+pytestmark = pytest.mark.anyio
+
+
+def car(plate: str, make: str, model: str) -> Dict[str, Any]:
+    document = {"license_plate": plate, "make": make, "model": model}
+    document.update(build_search_fields(document, SEARCH_FIELDS["cars"]))
+    return document
+
+
+def plates(documents: List[Dict[str, Any]]) -> List[str]:
+    return [document["license_plate"] for document in documents]
+
+
+@pytest.fixture
+async def cars() -> MemoryRepository:
+    repository = MemoryEngine().repository("cars")
+    await repository.insert_many([car(f"A{number:03d}", "Kia", "Riot") for number in range(50)])
+    await repository.insert_many([car(f"RIO{number:02d}", "Uaz", "Hunter") for number in range(50)])
+    await repository.insert_many([car("ZZZ999", "Kia", "Rio"), car("RIO", "Gaz", "Volga")])
+    return repository
+
+
+async def test_exact_word_match_beats_earlier_prefix_matches(cars: MemoryRepository) -> None:
+    result = await search_documents(cars, "kia rio", limit=1)
+    assert plates(result) == ["ZZZ999"]
+
+
+async def test_exact_plate_ranks_first(cars: MemoryRepository) -> None:
+    result = await search_documents(cars, "rio", limit=3)
+    assert plates(result) == ["RIO", "RIO00", "RIO01"]
+
+
+async def test_fields_are_projected_without_tokens(cars: MemoryRepository) -> None:
+    result = await search_documents(cars, "hunter", limit=2, fields=["license_plate"])
+    assert result == [{"license_plate": "RIO00"}, {"license_plate": "RIO01"}]
+
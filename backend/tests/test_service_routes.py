@@ -0,0 +1,56 @@
+"""
+Служебные маршруты: проверки состояния, метрики, статистика, события.
+"""
+from typing import Dict
+from fastapi.testclient import TestClient
+from config import settings
+from events.bus import event_bus
+
+
+def test_health_and_metrics(client: TestClient) -> None:
+    assert client.get("/health/live").json() == {"status": "ok"}
+    assert client.get("/health/ready").status_code == 200
+    response = client.get("/metrics")
+    assert response.status_code == 200 and "http_requests_total" in response.text
+
+
+def test_analytics_follow_writes(client: TestClient, auth_headers: Dict[str, str], plate: str) -> None:
+    before = client.get("/analytics/summary", headers=auth_headers).json()["totals"]["cars"]
+    client.post(
+        "/carsdb/add_car/",
+        json={"license_plate": plate, "make": "Moskvich", "model": "Classic"},
+        headers=auth_headers,
+    )
+    summary = client.get("/analytics/summary", headers=auth_headers).json()
+    assert summary["totals"]["cars"] == before + 1
+    makes = client.get("/analytics/cars/makes", headers=auth_headers).json()["makes"]
+    assert {"make": "Moskvich", "count": 1} in makes
+    client.delete(f"/carsdb/delete_car/{plate}", headers=auth_headers)
+    summary = client.get("/analytics/summary", headers=auth_headers).json()
+    assert summary["totals"]["cars"] == before
+
+
+def test_event_bus_delivers_local_writes(
+        client: TestClient, auth_headers: Dict[str, str], plate: str
+) -> None:
+    subscription = event_bus.subscribe(["cars"])
+    try:
+        client.post(
+            "/carsdb/add_car/",
+            json={"license_plate": plate, "make": "Lada", "model": "Niva"},
+            headers=auth_headers,
+        )
+        event = client.portal.call(subscription.get, 1.0)
+        assert event["collection"] == "cars" and event["op"] == "insert"
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+def test_admin_routes_require_allow_list(
+        client: TestClient, auth_headers: Dict[str, str], monkeypatch
+) -> None:
+    assert client.get("/admin/cache", headers=auth_headers).status_code == 403
+    assert client.post("/analytics/recompute", headers=auth_headers).status_code == 403
+    monkeypatch.setattr(settings, "admin_users", "root@example.com, tester@example.com")
+    assert client.get("/admin/cache", headers=auth_headers).status_code == 200
+    assert client.post("/analytics/recompute", headers=auth_headers).status_code == 200
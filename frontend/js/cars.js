@@ -13,6 +13,8 @@ const licensePlateRegex = /^[A-Za-zА-ЯЁ]{1}\d{3}[A-Za-zА-ЯЁ]{2}\d{2,3}$/;
 
 
 const AUTH_TOKEN = localStorage.getItem("token");
+const carsByPlate = new Map();
+let liveEvents = null;
 
 if (!AUTH_TOKEN) {
     alert("Вы не авторизованы. Перейдите на страницу входа.");
@@ -44,151 +46,260 @@ async function authorizedFetch(url, options = {}) {
     return response;
 }
 
-async function loadCars() {
-    const response = await authorizedFetch(`${API_BASE}/get_cars/`);
+async function fetchCarsWithRegistrations() {
+    // Автомобили приходят вместе с регистрациями, постранично по номерному знаку
+    const cars = [];
+    let after = null;
 
-    if (!response || !response.ok) {
-        console.error("Ошибка загрузки автомобилей:", response?.statusText);
-        return;
-    }
+    do {
+        const params = new URLSearchParams({ limit: "1000" });
+        if (after) {
+            params.set("after", after);
+        }
+
+        const response = await authorizedFetch(`${API_BASE}/get_cars_with_registrations/?${params}`);
+        if (!response) {
+            return null;
+        }
+
+        const data = await response.json();
+        if (!data || !Array.isArray(data.cars)) {
+            console.error("Ответ сервера не содержит корректный список машин:", data);
+            return null;
+        }
+
+        cars.push(...data.cars);
+        after = data.next_after;
+    } while (after);
+
+    return cars;
+}
+
+function renderCar(car) {
+    const li = document.createElement("li");
+    li.setAttribute("data-make", car.make);
+    li.setAttribute("data-model", car.model);
+    li.setAttribute("data-license", car.license_plate);
+    li.innerHTML = `
+        <div class="car-info">
+            <strong>${car.make} ${car.model}</strong> 
+        </div>
+        <div class="button-row">
+            <button class="expand">Данные</button>
+            <button class="edit-car">Редактировать</button> <!-- Новая кнопка -->
+            <button class="find-reg">Найти регистрацию</button>
+            <button class="delete">Удалить</button>
+        </div>
+        <div class="car-details hidden">
+            <p>Марка: <strong>${car.make}</strong></p>
+            <p>Модель: <strong>${car.model}</strong></p>
+            <p>Номер: <strong>${car.license_plate}</strong></p>
+        </div>
+        <div class="reg-result hidden">
+            <p class="reg-info"></p>
+            <button class="add-reg hidden">Добавить регистрацию</button>
+            <button class="hide-reg hidden">Скрыть</button>
+        </div>
+    `;
+
+
+    li.querySelector(".expand").addEventListener("click", () => {
+        const details = li.querySelector(".car-details");
+        details.classList.toggle("hidden");
+    });
+
+    li.querySelector(".edit-car").addEventListener("click", () => showEditCarForm(car));
+
+    li.querySelector(".find-reg").addEventListener("click", async () => {
+        const licensePlate = car.license_plate;
+        const regResultDiv = li.querySelector(".reg-result");
+        const regInfoParagraph = regResultDiv.querySelector(".reg-info");
+        const addRegButton = regResultDiv.querySelector(".add-reg");
+        const hideRegButton = regResultDiv.querySelector(".hide-reg");
+
+
+        addRegButton.classList.add("hidden");
+        hideRegButton.classList.remove("hidden");
+
+        const registration = car.registration;
+        if (registration) {
+            regInfoParagraph.innerHTML = `
+                <strong>Регистрация найдена:</strong><br>
+                Номер: ${registration.license_plate}<br>
+                Владелец: ${registration.owner_name}<br>
+                Адрес владельца: ${registration.owner_address}<br>
+                Год выпуска: ${registration.year_of_manufacture}
+            `;
+        } else {
+            regInfoParagraph.textContent = "Регистрация не найдена.";
+            addRegButton.classList.remove("hidden");
+        }
 
-    const data = await response.json();
+        regResultDiv.classList.remove("hidden");
 
-    if (data && Array.isArray(data.cars)) {
-        const cars = data.cars;
 
+        addRegButton.addEventListener("click", () => {
+            const licensePlate = car.license_plate;
+            window.location.href = `/static/html/registration.html?license_plate=${licensePlate}`;
+        });
+
+        hideRegButton.addEventListener("click", () => {
+            regResultDiv.classList.add("hidden");
+        });
+    });
+
+    li.querySelector(".delete").addEventListener("click", async () => {
+        const licensePlate = car.license_plate;
+
+        if (confirm("Удалить автомобиль? Обратите внимание: регистрация автомобиля также будет удалена!")) {
+            // Если регистрация существует, удаляем ее
+            if (car.registration) {
+                const deleteRegResponse = await authorizedFetch(`${API_REGS}/delete_registration/${licensePlate}`, {
+                    method: "DELETE",
+                });
+
+                if (!deleteRegResponse || !deleteRegResponse.ok) {
+                    alert("Ошибка при удалении регистрации.");
+                    return;
+                }
+            }
+
+            // Удаление автомобиля
+            const deleteCarResponse = await authorizedFetch(`${API_BASE}/delete_car/${licensePlate}`, {
+                method: "DELETE",
+            });
+
+            if (deleteCarResponse && deleteCarResponse.ok) {
+                alert("Автомобиль успешно удален.");
+                refreshUnlessLive(); // Обновляем список автомобилей
+            } else {
+                alert("Ошибка при удалении автомобиля.");
+            }
+        }
+    });
+
+    return li;
+}
+
+async function loadCars() {
+    const cars = await fetchCarsWithRegistrations();
+
+    if (cars) {
+        carsByPlate.clear();
         if (cars.length === 0) {
             carsList.innerHTML = "<li>Нет доступных автомобилей</li>";
         } else {
             carsList.innerHTML = "";
             cars.forEach(car => {
-                const li = document.createElement("li");
-                li.setAttribute("data-make", car.make);
-                li.setAttribute("data-model", car.model);
-                li.setAttribute("data-license", car.license_plate);
-                li.innerHTML = `
-                    <div class="car-info">
-                        <strong>${car.make} ${car.model}</strong> 
-                    </div>
-                    <div class="button-row">
-                        <button class="expand">Данные</button>
-                        <button class="edit-car">Редактировать</button> <!-- Новая кнопка -->
-                        <button class="find-reg">Найти регистрацию</button>
-                        <button class="delete">Удалить</button>
-                    </div>
-                    <div class="car-details hidden">
-                        <p>Марка: <strong>${car.make}</strong></p>
-                        <p>Модель: <strong>${car.model}</strong></p>
-                        <p>Номер: <strong>${car.license_plate}</strong></p>
-                    </div>
-                    <div class="reg-result hidden">
-                        <p class="reg-info"></p>
-                        <button class="add-reg hidden">Добавить регистрацию</button>
-                        <button class="hide-reg hidden">Скрыть</button>
-                    </div>
-                `;
-                carsList.appendChild(li);
-
-
-                li.querySelector(".expand").addEventListener("click", () => {
-                    const details = li.querySelector(".car-details");
-                    details.classList.toggle("hidden");
-                });
-
-                li.querySelector(".edit-car").addEventListener("click", () => showEditCarForm(car));
-
-                li.querySelector(".find-reg").addEventListener("click", async () => {
-                    const licensePlate = car.license_plate;
-                    const regResultDiv = li.querySelector(".reg-result");
-                    const regInfoParagraph = regResultDiv.querySelector(".reg-info");
-                    const addRegButton = regResultDiv.querySelector(".add-reg");
-                    const hideRegButton = regResultDiv.querySelector(".hide-reg");
-
-
-                    regInfoParagraph.textContent = "Загрузка...";
-                    addRegButton.classList.add("hidden");
-                    hideRegButton.classList.remove("hidden");
-
-                    const regResponse = await authorizedFetch(`${API_REGS}/search_registrations/?query=${licensePlate}`);
-
-                    regInfoParagraph.textContent = "";
-
-                    if (regResponse) {
-                        const data = await regResponse.json();
-                        if (data && Array.isArray(data.registrations) && data.registrations.length > 0) {
-                            const registration = data.registrations[0];
-                            regInfoParagraph.innerHTML = `
-                                <strong>Регистрация найдена:</strong><br>
-                                Номер: ${registration.license_plate}<br>
-                                Владелец: ${registration.owner_name}<br>
-                                Адрес владельца: ${registration.owner_address}<br>
-                                Год выпуска: ${registration.year_of_manufacture}
-                            `;
-                        } else {
-                            regInfoParagraph.textContent = "Регистрация не найдена.";
-                            addRegButton.classList.remove("hidden");
-                        }
-                    } else {
-                        regInfoParagraph.textContent = "Ошибка при поиске регистрации.";
-                    }
-
-                    regResultDiv.classList.remove("hidden");
-
-
-                    addRegButton.addEventListener("click", () => {
-                        const licensePlate = car.license_plate;
-                        window.location.href = `/static/html/registration.html?license_plate=${licensePlate}`;
-                    });
-
-                    hideRegButton.addEventListener("click", () => {
-                        regResultDiv.classList.add("hidden");
-                    });
-                });
-
-                li.querySelector(".delete").addEventListener("click", async () => {
-                    const licensePlate = car.license_plate;
-
-                    if (confirm("Удалить автомобиль? Обратите внимание: регистрация автомобиля также будет удалена!")) {
-                        // Проверка наличия регистрации
-                        const regCheckResponse = await authorizedFetch(`${API_REGS}/search_registrations/?query=${licensePlate}`);
-                        if (regCheckResponse && regCheckResponse.ok) {
-                            const regData = await regCheckResponse.json();
-                            const registrations = regData.registrations;
-
-                            if (Array.isArray(registrations) && registrations.length > 0) {
-                                // Если регистрация существует, удаляем ее
-                                const deleteRegResponse = await authorizedFetch(`${API_REGS}/delete_registration/${licensePlate}`, {
-                                    method: "DELETE",
-                                });
-
-                                if (!deleteRegResponse || !deleteRegResponse.ok) {
-                                    alert("Ошибка при удалении регистрации.");
-                                    return;
-                                }
-                            }
-                        }
-
-                        // Удаление автомобиля
-                        const deleteCarResponse = await authorizedFetch(`${API_BASE}/delete_car/${licensePlate}`, {
-                            method: "DELETE",
-                        });
-
-                        if (deleteCarResponse && deleteCarResponse.ok) {
-                            alert("Автомобиль успешно удален.");
-                            loadCars(); // Обновляем список автомобилей
-                        } else {
-                            alert("Ошибка при удалении автомобиля.");
-                        }
-                    }
-                });
+                carsByPlate.set(car.license_plate, car);
+                carsList.appendChild(renderCar(car));
             });
         }
     } else {
-        console.error("Ответ сервера не содержит корректный список машин:", data);
         alert("Ошибка загрузки автомобилей.");
     }
 }
 
+function findCarItem(licensePlate) {
+    return Array.from(carsList.children).find(li => li.getAttribute("data-license") === licensePlate);
+}
+
+function showCar(car) {
+    // Элемент вставляется на своё место в порядке номерных знаков
+    carsByPlate.set(car.license_plate, car);
+    const li = renderCar(car);
+    const current = findCarItem(car.license_plate);
+    if (current) {
+        carsList.replaceChild(li, current);
+        return;
+    }
+    if (carsByPlate.size === 1) {
+        carsList.innerHTML = "";
+    }
+    const next = Array.from(carsList.children).find(item => {
+        const plate = item.getAttribute("data-license");
+        return plate && plate > car.license_plate;
+    });
+    carsList.insertBefore(li, next || null);
+}
+
+function removeCar(licensePlate) {
+    carsByPlate.delete(licensePlate);
+    const li = findCarItem(licensePlate);
+    if (li) {
+        li.remove();
+    }
+    if (carsByPlate.size === 0) {
+        carsList.innerHTML = "<li>Нет доступных автомобилей</li>";
+    }
+}
+
+function applyCarEvent(event) {
+    const car = carsByPlate.get(event.license_plate);
+
+    if (event.op === "resync") {
+        loadCars();
+    } else if (event.collection === "cars") {
+        if (event.op === "insert") {
+            showCar({ ...event.document, registration: car ? car.registration : null });
+        } else if (event.op === "update" && car) {
+            showCar({ ...car, ...event.fields });
+        } else if (event.op === "delete") {
+            removeCar(event.license_plate);
+        }
+    } else if (car) {
+        // События регистраций меняют только регистрацию у автомобиля
+        if (event.op === "insert") {
+            showCar({ ...car, registration: event.document });
+        } else if (event.op === "update") {
+            showCar({ ...car, registration: { ...car.registration, ...event.fields } });
+        } else if (event.op === "delete") {
+            showCar({ ...car, registration: null });
+        }
+    }
+}
+
+async function subscribeToChanges() {
+    // Изменения других пользователей приходят по SSE. Поток открывается по
+    // короткоживущему билету, чтобы токен доступа не попадал в адрес; если
+    // поток недоступен, список обновляется целиком после каждой записи
+    const response = await fetch("/events/ticket", {
+        method: "POST",
+        headers: { "Authorization": `Bearer ${AUTH_TOKEN}` },
+    });
+    if (!response.ok) {
+        return;
+    }
+    const { ticket } = await response.json();
+    const params = new URLSearchParams({ ticket, collections: "cars,registrations" });
+    const events = new EventSource(`/events/stream?${params}`);
+    let opened = false;
+    events.onopen = () => {
+        // После переподключения пропущенные изменения загружаются заново
+        if (opened) {
+            loadCars();
+        }
+        opened = true;
+    };
+    events.onmessage = (message) => applyCarEvent(JSON.parse(message.data));
+    events.onerror = () => {
+        // Обрыв браузер восстанавливает сам; если переподключение отклонено
+        // (истёк билет), поток открывается заново с новым билетом
+        if (events.readyState === EventSource.CLOSED) {
+            liveEvents = null;
+            setTimeout(subscribeToChanges, 3000);
+        }
+    };
+    liveEvents = events;
+}
+
+function refreshUnlessLive() {
+    // Без подключения к потоку событий список обновляется целиком
+    if (!liveEvents || liveEvents.readyState !== EventSource.OPEN) {
+        loadCars();
+    }
+}
+
 function setFieldValidationStyle(input, isValid) {
     if (isValid) {
         input.style.border = "2px solid green";
@@ -246,7 +357,7 @@ submitAddCar.addEventListener("click", async () => {
 
     if (response) {
         addCarForm.classList.add("hidden");
-        loadCars();
+        refreshUnlessLive();
     } else {
         alert("Ошибка добавления автомобиля.");
     }
@@ -355,10 +466,11 @@ document.getElementById("submitEditCar").addEventListener("click", async () => {
     if (response) {
         alert("Данные автомобиля успешно обновлены.");
         editCarForm.classList.add("hidden");
-        loadCars();
+        refreshUnlessLive();
     } else {
         alert("Ошибка при обновлении данных автомобиля.");
     }
 });
 
 loadCars();
+subscribeToChanges();
@@ -9,6 +9,8 @@ const API_BASE = "/regdb";
 
 
 const AUTH_TOKEN = localStorage.getItem("token");
+const regsByPlate = new Map();
+let liveEvents = null;
 
 
 if (!AUTH_TOKEN) {
@@ -67,97 +69,215 @@ async function authorizedFetch(url, options = {}) {
 }
 
 
+function renderReg(reg) {
+    const li = document.createElement("li");
+    li.setAttribute("data-license_plate", reg.license_plate);
+    li.setAttribute("data-owner_name", reg.owner_name);
+    li.setAttribute("data-owner_address", reg.owner_address);
+    li.setAttribute("data-year", reg.year_of_manufacture);
+    li.innerHTML = `
+        <strong>${reg.license_plate}</strong>
+        <div class="button-row">
+            <button class="expand">Данные</button>
+            <button class="edit-reg">Редактировать</button>
+            <button class="delete">Удалить</button>
+        </div>
+        <div class="reg-details hidden">
+            <p>Номер: <strong>${reg.license_plate}</strong></p>
+            <p>Владелец: <strong>${reg.owner_name}</strong></p>
+            <p>Адрес владельца: <strong>${reg.owner_address}</strong></p>
+            <p>Год выпуска: <strong>${reg.year_of_manufacture}</strong></p>
+        </div>
+        <div class="car-result hidden">
+            <p class="car-info"></p>
+            <button class="hide-car-result hidden">Скрыть</button>
+        </div>
+    `;
+
+    li.querySelector(".edit-reg").addEventListener("click", () => showEditRegForm(reg));
+
+
+    li.querySelector(".expand").addEventListener("click", async () => {
+        const details = li.querySelector(".reg-details");
+        details.classList.toggle("hidden");
+
+        if (!details.classList.contains("hidden")) {
+            const licensePlate = reg.license_plate;
+
+            const carResponse = await authorizedFetch(`/carsdb/search_cars/?query=${licensePlate}`);
+
+            if (carResponse) {
+                const data = await carResponse.json();
+                const car = data.cars.find(c => c.license_plate === licensePlate);
+
+                if (car) {
+                    details.innerHTML += `
+                    <p><strong>Данные автомобиля:</strong></p>
+                    <p>Марка: <strong>${car.make}</strong></p>
+                    <p>Модель: <strong>${car.model}</strong></p>
+                    <p>Номер: <strong>${car.license_plate}</strong></p>
+                    `;
+                } else {
+                    details.innerHTML += "<p>Информация об автомобиле не найдена.</p>";
+                }
+            } else {
+                details.innerHTML += "<p>Ошибка при попытке загрузить данные об автомобиле.</p>";
+            }
+        }
+    });
+
+
+    li.querySelector(".delete").addEventListener("click", async () => {
+        if (confirm("Удалить регистрацию?")) {
+            const deleteResponse = await authorizedFetch(`${API_BASE}/delete_registration/${reg.license_plate}`, {
+                method: "DELETE"
+            });
+            if (deleteResponse && deleteResponse.ok) {
+                refreshUnlessLive();
+            }
+        }
+    });
+
+    return li;
+}
+
+async function fetchRegs() {
+    // Регистрации загружаются постранично по номерному знаку: полный список
+    // одним запросом считается пакетной операцией и ограничен строже
+    const regs = [];
+    let after = null;
+
+    do {
+        const params = new URLSearchParams({ limit: "1000" });
+        if (after) {
+            params.set("after", after);
+        }
+
+        const response = await authorizedFetch(`${API_BASE}/get_registrations/?${params}`);
+        if (!response || !response.ok) {
+            console.error("Ошибка загрузки регистраций:", response?.statusText);
+            return null;
+        }
+
+        const data = await response.json();
+        if (!data || !Array.isArray(data.registrations)) {
+            console.error("Ответ сервера не содержит корректный список регистраций:", data);
+            alert("Ошибка загрузки регистраций.");
+            return null;
+        }
+
+        regs.push(...data.registrations);
+        after = data.next_after;
+    } while (after);
+
+    return regs;
+}
+
 async function loadRegs() {
-    const response = await authorizedFetch(`${API_BASE}/get_registrations/`);
+    const regs = await fetchRegs();
+    if (!regs) {
+        return;
+    }
+
+    regsByPlate.clear();
+
+    if (regs.length === 0) {
+        regList.innerHTML = "<li>Нет доступных регистраций</li>";
+    } else {
+        regList.innerHTML = "";
+        regs.forEach(reg => {
+            regsByPlate.set(reg.license_plate, reg);
+            regList.appendChild(renderReg(reg));
+        });
+    }
+}
+
+function findRegItem(licensePlate) {
+    return Array.from(regList.children).find(li => li.getAttribute("data-license_plate") === licensePlate);
+}
 
-    if (!response || !response.ok) {
-        console.error("Ошибка загрузки регистраций:", response?.statusText);
+function showReg(reg) {
+    // Элемент вставляется на своё место в порядке номерных знаков
+    regsByPlate.set(reg.license_plate, reg);
+    const li = renderReg(reg);
+    const current = findRegItem(reg.license_plate);
+    if (current) {
+        regList.replaceChild(li, current);
         return;
     }
+    if (regsByPlate.size === 1) {
+        regList.innerHTML = "";
+    }
+    const next = Array.from(regList.children).find(item => {
+        const plate = item.getAttribute("data-license_plate");
+        return plate && plate > reg.license_plate;
+    });
+    regList.insertBefore(li, next || null);
+}
 
-    const data = await response.json();
-
-    if (data && Array.isArray(data.registrations)) {
-        const regs = data.registrations;
-
-        if (regs.length === 0) {
-            regList.innerHTML = "<li>Нет доступных регистраций</li>";
-        } else {
-            regList.innerHTML = "";
-            regs.forEach(reg => {
-                const li = document.createElement("li");
-                li.setAttribute("data-license_plate", reg.license_plate);
-                li.setAttribute("data-owner_name", reg.owner_name);
-                li.setAttribute("data-owner_address", reg.owner_address);
-                li.setAttribute("data-year", reg.year_of_manufacture);
-                li.innerHTML = `
-                    <strong>${reg.license_plate}</strong>
-                    <div class="button-row">
-                        <button class="expand">Данные</button>
-                        <button class="edit-reg">Редактировать</button>
-                        <button class="delete">Удалить</button>
-                    </div>
-                    <div class="reg-details hidden">
-                        <p>Номер: <strong>${reg.license_plate}</strong></p>
-                        <p>Владелец: <strong>${reg.owner_name}</strong></p>
-                        <p>Адрес владельца: <strong>${reg.owner_address}</strong></p>
-                        <p>Год выпуска: <strong>${reg.year_of_manufacture}</strong></p>
-                    </div>
-                    <div class="car-result hidden">
-                        <p class="car-info"></p>
-                        <button class="hide-car-result hidden">Скрыть</button>
-                    </div>
-                `;
-                regList.appendChild(li);
-
-                li.querySelector(".edit-reg").addEventListener("click", () => showEditRegForm(reg));
-
-
-                li.querySelector(".expand").addEventListener("click", async () => {
-                    const details = li.querySelector(".reg-details");
-                    details.classList.toggle("hidden");
-
-                    if (!details.classList.contains("hidden")) {
-                        const licensePlate = reg.license_plate;
-
-                        const carResponse = await authorizedFetch(`/carsdb/search_cars/?query=${licensePlate}`);
-
-                        if (carResponse) {
-                            const data = await carResponse.json();
-                            const car = data.cars.find(c => c.license_plate === licensePlate);
-
-                            if (car) {
-                                details.innerHTML += `
-                                <p><strong>Данные автомобиля:</strong></p>
-                                <p>Марка: <strong>${car.make}</strong></p>
-                                <p>Модель: <strong>${car.model}</strong></p>
-                                <p>Номер: <strong>${car.license_plate}</strong></p>
-                                `;
-                            } else {
-                                details.innerHTML += "<p>Информация об автомобиле не найдена.</p>";
-                            }
-                        } else {
-                            details.innerHTML += "<p>Ошибка при попытке загрузить данные об автомобиле.</p>";
-                        }
-                    }
-                });
+function removeReg(licensePlate) {
+    regsByPlate.delete(licensePlate);
+    const li = findRegItem(licensePlate);
+    if (li) {
+        li.remove();
+    }
+    if (regsByPlate.size === 0) {
+        regList.innerHTML = "<li>Нет доступных регистраций</li>";
+    }
+}
 
+function applyRegEvent(event) {
+    const reg = regsByPlate.get(event.license_plate);
 
-                li.querySelector(".delete").addEventListener("click", async () => {
-                    if (confirm("Удалить регистрацию?")) {
-                        const deleteResponse = await authorizedFetch(`${API_BASE}/delete_registration/${reg.license_plate}`, {
-                            method: "DELETE"
-                        });
-                        if (deleteResponse && deleteResponse.ok) {
-                            loadRegs();
-                        }
-                    }
-                });
-            });
+    if (event.op === "resync") {
+        loadRegs();
+    } else if (event.op === "insert") {
+        showReg(event.document);
+    } else if (event.op === "update" && reg) {
+        showReg({ ...reg, ...event.fields });
+    } else if (event.op === "delete") {
+        removeReg(event.license_plate);
+    }
+}
+
+async function subscribeToChanges() {
+    // Изменения других пользователей приходят по SSE. Поток открывается по
+    // короткоживущему билету, чтобы токен доступа не попадал в адрес; если
+    // поток недоступен, список обновляется целиком после каждой записи
+    const response = await fetch("/events/ticket", {
+        method: "POST",
+        headers: { "Authorization": `Bearer ${AUTH_TOKEN}` },
+    });
+    if (!response.ok) {
+        return;
+    }
+    const { ticket } = await response.json();
+    const params = new URLSearchParams({ ticket, collections: "registrations" });
+    const events = new EventSource(`/events/stream?${params}`);
+    let opened = false;
+    events.onopen = () => {
+        // После переподключения пропущенные изменения загружаются заново
+        if (opened) {
+            loadRegs();
         }
-    } else {
-        console.error("Ответ сервера не содержит корректный список регистраций:", data);
-        alert("Ошибка загрузки регистраций.");
+        opened = true;
+    };
+    events.onmessage = (message) => applyRegEvent(JSON.parse(message.data));
+    events.onerror = () => {
+        // Обрыв браузер восстанавливает сам; если переподключение отклонено
+        // (истёк билет), поток открывается заново с новым билетом
+        if (events.readyState === EventSource.CLOSED) {
+            liveEvents = null;
+            setTimeout(subscribeToChanges, 3000);
+        }
+    };
+    liveEvents = events;
+}
+
+function refreshUnlessLive() {
+    // Без подключения к потоку событий список обновляется целиком
+    if (!liveEvents || liveEvents.readyState !== EventSource.OPEN) {
+        loadRegs();
     }
 }
 
@@ -369,10 +489,11 @@ document.getElementById("submitEditReg").addEventListener("click", async () => {
 
     if (response) {
         document.getElementById("editRegForm").classList.add("hidden");
-        loadRegs();
+        refreshUnlessLive();
     } else {
         alert("Ошибка редактирования регистрации.");
     }
 });
 
 loadRegs();
+subscribeToChanges();